@@ -1,17 +1,40 @@
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from app.core.dependencies import get_auth_service
 from app.services.auth_service import AuthService
-from app.schemas import KakaoLoginRequest, Token
+from app.schemas import KakaoLoginRequest, RefreshTokenRequest, Token
 
 router = APIRouter()
 
 @router.post("/login/kakao", response_model=Token)
-def login_kakao(
+async def login_kakao(
     login_data: KakaoLoginRequest, 
     service: AuthService = Depends(get_auth_service)
 ):
     """
     Exchanges Kakao user data for an App JWT.
     If the user doesn't exist, they are auto-registered as PENDING.
+    With `kakao_access_token`, Kakao confirms the kakao_id first.
     """
-    return service.authenticate_kakao(login_data)
\ No newline at end of file
+    await service.verify_kakao_identity(login_data)
+    # DB work is blocking: keep it off the event loop
+    return await run_in_threadpool(service.authenticate_kakao, login_data)
+
+@router.post("/refresh", response_model=Token)
+def refresh_tokens(
+    body: RefreshTokenRequest,
+    service: AuthService = Depends(get_auth_service)
+):
+    """
+    Trades a refresh token for a new access + refresh pair. Each refresh token
+    works ONCE: replaying a used one logs the whole session out.
+    """
+    return service.refresh(body.refresh_token)
+
+@router.post("/logout", status_code=204)
+def logout(
+    body: RefreshTokenRequest,
+    service: AuthService = Depends(get_auth_service)
+):
+    """Ends the session of this refresh token, including its live access tokens."""
+    service.logout(body.refresh_token)
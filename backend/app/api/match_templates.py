@@ -2,9 +2,10 @@
 from typing import List
 from fastapi import APIRouter, Depends
 from app.models import MatchTemplate
-from app.schemas import MatchTemplateCreate
+from app.schemas import MatchTemplateCreate, MatchTemplateUpdate, MatchOccurrence, TemplateSyncResult
 from app.services.match_template_service import MatchTemplateService
-from app.core.dependencies import get_match_template_service
+from app.services.match_service import MatchService
+from app.core.dependencies import get_match_template_service, get_match_service
 
 router = APIRouter()
 
@@ -30,4 +31,42 @@ def read_club_templates(
     """
     templates = service.get_templates_for_club(club_id)
 
-    return templates
\ No newline at end of file
+    return templates
+
+@router.get("/{template_id}/occurrences", response_model=List[MatchOccurrence])
+def preview_template_occurrences(
+    template_id: int,
+    season_id: int,
+    service: MatchService = Depends(get_match_service)
+):
+    """
+    Preview the dates (and deadlines) a template produces for a season.
+    URL: GET /match-templates/{template_id}/occurrences?season_id=
+    """
+    return service.preview_template_occurrences(template_id, season_id)
+
+@router.patch("/{template_id}", response_model=MatchTemplate)
+def update_match_template(
+    template_id: int,
+    update_data: MatchTemplateUpdate,
+    service: MatchTemplateService = Depends(get_match_template_service)
+):
+    """
+    Edit a template. Existing matches are NOT touched until you run the sync below.
+    URL: PATCH /match-templates/{template_id}
+    """
+    return service.update_template(template_id, update_data)
+
+@router.post("/{template_id}/sync", response_model=TemplateSyncResult)
+def sync_template_matches(
+    template_id: int,
+    dry_run: bool = True,
+    service: MatchService = Depends(get_match_service)
+):
+    """
+    Propagate the template to its future RECRUITING matches.
+    Default is a dry run (per-match diff only); pass ?dry_run=false to apply.
+    Fields edited by hand on a match are reported but never overwritten.
+    URL: POST /match-templates/{template_id}/sync
+    """
+    return service.sync_template_matches(template_id, dry_run)
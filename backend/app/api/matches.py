@@ -1,9 +1,26 @@
-from fastapi import APIRouter, Depends
-from app.models import Match
-from app.schemas import MatchRead, MatchCreateFromTemplate, MatchCreateManual, MatchUpdate
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.models import Match, MatchStatus
+from app.schemas import (
+    MatchRead,
+    MatchCreateFromTemplate,
+    MatchCreateManual,
+    MatchUpdate,
+    MatchListPage,
+    MatchCalendarItem,
+    MatchGenerateSeason,
+    MatchGenerateResult,
+    MatchBulkUpdate,
+    MatchBulkUpdateResult,
+    MatchConflictPair,
+)
 from app.services.match_service import MatchService
-from app.core.dependencies import get_match_service
-from typing import List
+from app.services.club_service import ClubService
+from app.core.dependencies import get_match_service, get_club_service
+from app.core.auth import Principal, get_current_active_principal
+from app.core.http_cache import apply_cache_headers, is_not_modified, not_modified
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -18,16 +35,120 @@ def generate_match(
     return service.create_match_from_template(data)
 
 
+@router.post("/generate/season", response_model=MatchGenerateResult)
+def generate_season_matches(
+    data: MatchGenerateSeason, service: MatchService = Depends(get_match_service)
+):
+    """
+    Create every match of a season from a recurring template in one go.
+    Re-running it only fills in missing dates.
+    """
+    return service.generate_season_matches(data)
+
+
 @router.get("/club/{club_id}", response_model=List[MatchRead])
 def read_upcoming_matches(
-    club_id: int, service: MatchService = Depends(get_match_service)
+    club_id: int,
+    request: Request,
+    response: Response,
+    service: MatchService = Depends(get_match_service),
 ):
     """
     Get all upcoming matches for a club.
+    Send the last `ETag` back as `If-None-Match` to get an empty 304 when nothing changed.
     """
+    etag, last_modified = service.get_club_listing_validators(club_id)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    apply_cache_headers(response, etag, last_modified)
     return service.get_upcoming_matches(club_id)
 
 
+@router.get("/club/{club_id}/calendar", response_model=List[MatchCalendarItem])
+def read_match_calendar(
+    club_id: int,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    status: Optional[List[MatchStatus]] = Query(None),
+    service: MatchService = Depends(get_match_service),
+):
+    """
+    Matches starting in [from, to), past ones included (month views, fixtures).
+    Defaults to the next 31 days. `status` may be repeated.
+    """
+    return service.get_calendar(club_id, start, end, status)
+
+
+@router.get("/club/{club_id}/calendar.ics")
+def read_match_calendar_feed(
+    club_id: int,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    service: MatchService = Depends(get_match_service),
+    club_service: ClubService = Depends(get_club_service),
+):
+    """
+    Subscribable iCalendar feed (Google / Apple / Outlook). Streamed, not buffered.
+    """
+    club = club_service.get_club(club_id)
+    lines = service.stream_calendar_ics(club_id, club.name, start, end)
+    return StreamingResponse(
+        lines,
+        media_type="text/calendar; charset=utf-8",
+        headers={"Content-Disposition": f'inline; filename="club-{club_id}.ics"'},
+    )
+
+
+@router.get("/club/{club_id}/conflicts", response_model=List[MatchConflictPair])
+def read_season_conflicts(
+    club_id: int,
+    season_id: int,
+    service: MatchService = Depends(get_match_service),
+):
+    """
+    Season-wide double-booking report: overlapping matches of the club, and
+    club matches whose venue is booked by another club at the same time.
+    """
+    return service.get_season_conflicts(club_id, season_id)
+
+
+@router.get("/club/{club_id}/summary", response_model=MatchListPage)
+def read_upcoming_match_summaries(
+    club_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_member: Principal = Depends(get_current_active_principal),
+    service: MatchService = Depends(get_match_service),
+):
+    """
+    Lightweight upcoming-match list: vote counts + my vote, no rosters.
+    Follow `next_cursor` for later matches. Full roster: GET /matches/{match_id}.
+    Supports `If-None-Match` / `If-Modified-Since` like the full listing.
+    """
+    # `my_status` differs per caller, so the member is part of the validator
+    etag, last_modified = service.get_club_listing_validators(
+        club_id, current_member.id, limit, cursor
+    )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    apply_cache_headers(response, etag, last_modified)
+    return service.list_upcoming_summaries(club_id, current_member.id, limit, cursor)
+
+
+@router.get("/{match_id}", response_model=MatchRead)
+def read_match_detail(
+    match_id: int, service: MatchService = Depends(get_match_service)
+):
+    """
+    One match with its full roster (every participation + member summary).
+    """
+    return service.get_match_detail(match_id)
+
+
 @router.post("/", response_model=Match)
 def create_manual_match(
     data: MatchCreateManual, service: MatchService = Depends(get_match_service)
@@ -47,10 +168,24 @@ def update_match(
 ):
     """
     Update any field of a match (Time, Location, Status, etc.)
+    Moving `start_time` re-derives the end time and deadlines, and retracts
+    not-yet-sent notifications for milestones that moved.
     """
     return service.update_match(match_id, match_update)
 
 
+@router.patch("/template/{template_id}/future", response_model=MatchBulkUpdateResult)
+def update_template_matches(
+    template_id: int,
+    data: MatchBulkUpdate,
+    service: MatchService = Depends(get_match_service),
+):
+    """
+    Edit every upcoming match generated from a template at once (all or nothing).
+    """
+    return service.update_template_matches(template_id, data)
+
+
 @router.delete("/{match_id}")
 def delete_match(match_id: int, service: MatchService = Depends(get_match_service)):
     service.delete_match(match_id)
@@ -1,17 +1,23 @@
-from fastapi import APIRouter, Depends
-from typing import List
-from app.models import Member
-from app.schemas import MemberUpdate, MemberMeRead
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
+from app.models import Member, MembershipType, MemberStatus, PlayerPosition, Role
+from app.schemas import (
+    MemberUpdate, MemberRead, MemberMeRead, MemberContactRead, MemberDirectoryPage, MemberImportResult
+)
 from app.services.member_service import MemberService
-from app.core.dependencies import get_member_service
-from app.core.auth import get_current_active_member
+from app.services.member_import_service import MemberImportService
+from app.core.dependencies import get_member_service, get_member_import_service
+from app.core.tabular import TabularError, iter_csv_rows, iter_xlsx_rows
+from app.core.auth import Principal, get_current_active_member, get_current_active_principal
 
 router = APIRouter()
 
-@router.get("/me", response_model=Member)
+@router.get("/me", response_model=MemberMeRead)
 def read_users_me(current_member: Member = Depends(get_current_active_member)):
     """
-    Get current logged-in member's full profile.
+    Get current logged-in member's full profile (the only place a phone is decrypted for one row).
     """
     return current_member
 
@@ -23,27 +29,103 @@ def update_myself(
 ):
     return service.update_my_profile(current_member, data)
 
-@router.post("/", response_model=Member)
+@router.post("/", response_model=MemberRead)
 def create_member(
     member: Member, 
     service: MemberService = Depends(get_member_service)
 ):
     return service.register_member(member)
 
-@router.get("/", response_model=List[Member])
+# Bulk import: raw request body, so no multipart dependency and no form buffering
+IMPORT_READERS = {
+    "text/csv": iter_csv_rows,
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": iter_xlsx_rows,
+}
+MAX_IMPORT_BYTES = 20 * 1024 * 1024
+SPOOL_IN_MEMORY_BYTES = 1024 * 1024  # Bigger uploads go to a temp file
+
+@router.post("/import", response_model=MemberImportResult)
+async def import_members(
+    request: Request,
+    club_id: int,
+    season_id: Optional[int] = None,
+    membership_type: Optional[MembershipType] = None,
+    service: MemberImportService = Depends(get_member_import_service),
+    current_member: Principal = Depends(get_current_active_principal),
+):
+    """
+    Registers many members from a CSV or XLSX body (Content-Type text/csv or the
+    .xlsx type). Headers: kakao_id, name, [email, phone, birth_year, back_number,
+    positions ("ST;CB"), membership_type]. With `season_id`, new members also get a
+    membership (row `membership_type`, else the query default). Existing kakao_ids
+    are skipped; bad rows are reported by row number, the rest are imported.
+    """
+    if not current_member.has_any_role(Role.ADMIN, Role.MANAGER):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    reader = IMPORT_READERS.get(content_type)
+    if reader is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or an .xlsx spreadsheet")
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_IN_MEMORY_BYTES) as upload:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > MAX_IMPORT_BYTES:
+                raise HTTPException(status_code=413, detail="File too large")
+            upload.write(chunk)
+        upload.seek(0)
+
+        try:
+            # Parsing + DB work are blocking: keep them off the event loop
+            return await run_in_threadpool(
+                service.import_members, reader(upload), club_id, season_id, membership_type
+            )
+        except TabularError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+@router.get("/", response_model=List[MemberRead])
 def read_members(
     service: MemberService = Depends(get_member_service)
 ):
     return service.list_members()
 
-@router.get("/{member_id}", response_model=Member)
+@router.get("/club/{club_id}/directory", response_model=MemberDirectoryPage)
+def read_club_directory(
+    club_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: Optional[MemberStatus] = None,
+    role: Optional[Role] = None,
+    position: Optional[PlayerPosition] = None,
+    age_group: Optional[int] = Query(None, ge=1, le=2),
+    q: Optional[str] = Query(None, max_length=50, description="Name prefix (case-insensitive)"),
+    service: MemberService = Depends(get_member_service),
+    current_member: Principal = Depends(get_current_active_principal),
+):
+    """
+    One club's members, alphabetical. Follow `next_cursor` for the next page.
+    age_group: 1 = under 50, 2 = 50 and over (members without a birth year match neither).
+    """
+    return service.list_directory(club_id, limit, cursor, status, role, position, age_group, q)
+
+@router.get("/club/{club_id}/contacts", response_model=List[MemberContactRead])
+def read_club_contacts(
+    club_id: int,
+    service: MemberService = Depends(get_member_service),
+    current_member: Principal = Depends(get_current_active_principal),
+):
+    return service.list_member_contacts(club_id, current_member)
+
+@router.get("/{member_id}", response_model=MemberRead)
 def read_member(
     member_id: int, 
     service: MemberService = Depends(get_member_service)
 ):
     return service.get_member(member_id)
 
-@router.patch("/{member_id}", response_model=Member)
+@router.patch("/{member_id}", response_model=MemberRead)
 def update_member(
     member_id: int, 
     member_update: MemberUpdate, 
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from typing import List
 from app.models import Membership
-from app.schemas import MembershipUpdate
+from app.schemas import MembershipUpdate, MembershipRenew, MembershipRenewResult
 from app.services.membership_service import MembershipService
 from app.core.dependencies import get_membership_service
 
@@ -11,6 +11,14 @@ router = APIRouter()
 def create_membership(membership: Membership, service: MembershipService = Depends(get_membership_service)):
     return service.create_membership(membership)
 
+@router.post("/renew", response_model=MembershipRenewResult)
+def renew_memberships(data: MembershipRenew, service: MembershipService = Depends(get_membership_service)):
+    """
+    Start of season: copy every ACTIVE membership of `source_season_id` into
+    `target_season_id` at once. Members already in the target season are skipped.
+    """
+    return service.renew_memberships(data)
+
 @router.get("/", response_model=List[Membership])
 def read_memberships(service: MembershipService = Depends(get_membership_service)):
     return service.list_memberships()
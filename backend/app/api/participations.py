@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from app.models import Participation, ParticipationStatus
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.models import Participation, ParticipationStatus, PlayerPosition, Role
 from app.services.participation_service import ParticipationService
 from app.core.dependencies import get_participation_service
-from app.core.auth import get_current_active_member  # We need to know WHO is voting
-from app.models import Member
-from app.schemas import ParticipationAdminUpdate, ParticipationRead
+from app.core.auth import Principal, get_current_active_principal  # We need to know WHO is voting
+from app.schemas import (
+    ParticipationAdminUpdate,
+    ParticipationRead,
+    ParticipationHistoryPage,
+    RosterEntry,
+    LineupEntry,
+)
 from sqlmodel import SQLModel
 from typing import Optional, List
+from datetime import datetime, timezone
 
 
 router = APIRouter()
@@ -21,7 +27,7 @@ class VoteRequest(SQLModel):
 def cast_vote(
     match_id: int,
     vote_data: VoteRequest,
-    current_member: Member = Depends(get_current_active_member),
+    current_member: Principal = Depends(get_current_active_principal),
     service: ParticipationService = Depends(get_participation_service),
 ):
     """
@@ -35,7 +41,7 @@ def cast_vote(
 @router.get("/matches/{match_id}/me", response_model=Optional[Participation])
 def get_my_vote(
     match_id: int,
-    current_member: Member = Depends(get_current_active_member),
+    current_member: Principal = Depends(get_current_active_principal),
     service: ParticipationService = Depends(get_participation_service),
 ):
     """
@@ -45,9 +51,35 @@ def get_my_vote(
     return service.get_my_vote(match_id, current_member.id)
 
 
+@router.get("/matches/{match_id}/roster", response_model=List[RosterEntry])
+def replay_match_roster(
+    match_id: int,
+    as_of: Optional[datetime] = None,
+    service: ParticipationService = Depends(get_participation_service),
+):
+    """
+    Replays the vote log: who was ATTENDING/ABSENT/PENDING at `as_of` (default: now).
+    e.g. "How did the roster look 1 hour before the hard deadline?"
+    """
+    return service.replay_roster(match_id, as_of or datetime.now(timezone.utc))
+
+
+@router.get("/matches/{match_id}/lineup", response_model=List[LineupEntry])
+def read_match_lineup(
+    match_id: int,
+    position: List[PlayerPosition] = Query([]),
+    service: ParticipationService = Depends(get_participation_service),
+):
+    """
+    ATTENDING members of a match. Repeat `position` to narrow it down,
+    e.g. ?position=GK or ?position=CB&position=LB&position=RB.
+    """
+    return service.get_lineup(match_id, position)
+
+
 @router.get("/me", response_model=List[Participation])
 def read_my_participations(
-    current_member: Member = Depends(get_current_active_member),
+    current_member: Principal = Depends(get_current_active_principal),
     service: ParticipationService = Depends(get_participation_service),
 ):
     """
@@ -57,18 +89,32 @@ def read_my_participations(
     return service.list_member_participations(current_member.id)
 
 
+@router.get("/me/history", response_model=ParticipationHistoryPage)
+def read_my_participation_history(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_member: Principal = Depends(get_current_active_principal),
+    service: ParticipationService = Depends(get_participation_service),
+):
+    """
+    Paginated history for the current user, newest match first.
+    Each row carries a slim match summary. Follow `next_cursor` for older pages.
+    """
+    return service.list_member_history(current_member.id, limit, cursor)
+
+
 @router.put("/admin/override", response_model=ParticipationRead)
 def admin_override_participation(
     data: ParticipationAdminUpdate,
     service: ParticipationService = Depends(
         get_participation_service
     ),  # 👈 Service has repo injected
-    current_member: Member = Depends(get_current_active_member),
+    current_member: Principal = Depends(get_current_active_principal),
 ):
     """
     Admin Override: Force update or create a vote for ANY member.
     """
-    if "ADMIN" not in current_member.roles and "MANAGER" not in current_member.roles:
+    if not current_member.has_any_role(Role.ADMIN, Role.MANAGER):
         raise HTTPException(status_code=403, detail="Not authorized")
 
     return service.admin_override_vote(data)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List
+from app.schemas import MemberSeasonStatsRead
+from app.services.member_stats_service import MemberStatsService
+from app.core.dependencies import get_member_stats_service
+
+router = APIRouter()
+
+
+@router.get("/seasons/{season_id}/leaderboard", response_model=List[MemberSeasonStatsRead])
+def read_season_leaderboard(
+    season_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    service: MemberStatsService = Depends(get_member_stats_service),
+):
+    """
+    Top attendees of a season. Reads pre-aggregated rows only.
+    """
+    return service.get_leaderboard(season_id, limit)
+
+
+@router.get("/seasons/{season_id}/members/{member_id}", response_model=MemberSeasonStatsRead)
+def read_member_season_stats(
+    season_id: int,
+    member_id: int,
+    service: MemberStatsService = Depends(get_member_stats_service),
+):
+    """
+    Attendance counters (and rate) of one member for one season.
+    """
+    return service.get_member_season_stats(member_id, season_id)
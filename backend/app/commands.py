@@ -0,0 +1,145 @@
+"""
+Maintenance Commands 🧰
+
+One-off / operator jobs that run outside the HTTP context.
+
+Usage (from backend/):
+    uv run python -m app.commands rebuild-stats [--season-id 3]
+    uv run python -m app.commands compact-vote-events [--older-than-days 30]
+    uv run python -m app.commands recount-attending
+    uv run python -m app.commands close-season --season-id 3
+    uv run python -m app.commands rotate-encryption [--batch-size 500] [--pause-ms 50]
+    uv run python -m app.commands backfill-member-masks [--batch-size 1000]
+    uv run python -m app.commands backfill-match-start-times [--batch-size 1000]
+"""
+import argparse
+from sqlmodel import Session
+
+from app.db import engine
+
+# Repositories
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.encryption_rotation_repository import EncryptionRotationRepository
+from app.repositories.match_repository import MatchRepository
+from app.repositories.member_repository import MemberRepository
+from app.repositories.member_season_stats_repository import MemberSeasonStatsRepository
+from app.repositories.participation_event_repository import ParticipationEventRepository
+from app.repositories.participation_repository import ParticipationRepository
+from app.repositories.season_repository import SeasonRepository
+
+# Services
+from app.services.key_rotation_service import KeyRotationService
+from app.services.member_stats_service import MemberStatsService
+from app.services.participation_service import ParticipationService
+from app.services.season_service import SeasonService
+
+
+def rebuild_stats(season_id: int | None = None):
+    """Recomputes MemberSeasonStats from scratch (bulk INSERT ... SELECT)."""
+    with Session(engine) as session:
+        service = MemberStatsService(MemberSeasonStatsRepository(session))
+        rows = service.rebuild(season_id)
+    scope = f"season {season_id}" if season_id else "all seasons"
+    print(f"📊 [Stats] Rebuilt {rows} member/season rows ({scope}).")
+
+
+def compact_vote_events(older_than_days: int = 30):
+    """Folds the vote log of long-finished matches into summary rows."""
+    with Session(engine) as session:
+        service = ParticipationService(None, None, None, None, ParticipationEventRepository(session))
+        compacted = service.compact_vote_events(older_than_days)
+    print(f"🗜️ [Events] Compacted vote log of {compacted} finished matches.")
+
+
+def recount_attending():
+    """Resets Match.attending_count from ATTENDING rows (first deploy / repair)."""
+    with Session(engine) as session:
+        matches = MatchRepository(session).recount_attending()
+    print(f"🎟️ [Capacity] Recounted attending seats of {matches} matches.")
+
+
+def close_season(season_id: int):
+    """Closes a season and moves its finished matches to the archive tables."""
+    with Session(engine) as session:
+        service = SeasonService(
+            SeasonRepository(session), ArchiveRepository(session), ParticipationEventRepository(session)
+        )
+        result = service.close_season(season_id)
+    print(f"🗄️ [Archive] Season {result.season_id} closed, {result.archived_matches} matches archived.")
+
+
+def rotate_encryption(batch_size: int = 500, pause_ms: int = 0):
+    """Re-encrypts every phone number under the first key of ENCRYPTION_KEYS (resumable)."""
+    def report(progress):
+        print(f"🔑 [Keys] {progress.rotated} rotated, {progress.remaining} to go...")
+
+    with Session(engine) as session:
+        service = KeyRotationService(MemberRepository(session), EncryptionRotationRepository(session))
+        result = service.rotate_phones(batch_size, pause_ms / 1000, on_progress=report)
+    print(
+        f"🔑 [Keys] Rotation to key {result.key_id}: {result.rotated} rotated, "
+        f"{result.failed} unreadable, {'done' if result.completed else 'incomplete'}."
+    )
+
+
+def backfill_member_masks(batch_size: int = 1000):
+    """Fills Member.name_search / role_mask / position_mask from the JSON columns (first deploy)."""
+    with Session(engine) as session:
+        changed = MemberRepository(session).backfill_masks(batch_size)
+    print(f"🧮 [Members] Backfilled search columns of {changed} members.")
+
+
+def backfill_match_start_times(batch_size: int = 1000):
+    """Fills Participation.match_start_time from the match, then enforces NOT NULL (first deploy)."""
+    with Session(engine) as session:
+        changed = ParticipationRepository(session).backfill_match_start_times(batch_size)
+    print(f"🗓️ [History] Backfilled match start times of {changed} participations.")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-stats", help="Recompute member season stats")
+    rebuild.add_argument("--season-id", type=int, default=None)
+
+    compact = commands.add_parser("compact-vote-events", help="Fold old vote events into summaries")
+    compact.add_argument("--older-than-days", type=int, default=30)
+
+    commands.add_parser("recount-attending", help="Recompute Match.attending_count")
+
+    close = commands.add_parser("close-season", help="Close a season and archive its finished matches")
+    close.add_argument("--season-id", type=int, required=True)
+
+    rotate = commands.add_parser("rotate-encryption", help="Re-encrypt phones under the newest key")
+    rotate.add_argument("--batch-size", type=int, default=500)
+    rotate.add_argument("--pause-ms", type=int, default=0)
+
+    backfill = commands.add_parser("backfill-member-masks", help="Fill member role / position bitmasks")
+    backfill.add_argument("--batch-size", type=int, default=1000)
+
+    starts = commands.add_parser(
+        "backfill-match-start-times", help="Fill Participation.match_start_time for history paging"
+    )
+    starts.add_argument("--batch-size", type=int, default=1000)
+
+    args = parser.parse_args()
+
+    if args.command == "rebuild-stats":
+        rebuild_stats(args.season_id)
+    elif args.command == "compact-vote-events":
+        compact_vote_events(args.older_than_days)
+    elif args.command == "recount-attending":
+        recount_attending()
+    elif args.command == "close-season":
+        close_season(args.season_id)
+    elif args.command == "rotate-encryption":
+        rotate_encryption(args.batch_size, args.pause_ms)
+    elif args.command == "backfill-member-masks":
+        backfill_member_masks(args.batch_size)
+    elif args.command == "backfill-match-start-times":
+        backfill_match_start_times(args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
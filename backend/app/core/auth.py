@@ -1,45 +1,196 @@
+"""
+Authentication 🔑
+
+Tokens carry the claims most endpoints need (member id, club, roles, status) plus
+the member's `token_version`. `get_current_principal` trusts those claims and only
+checks the version against a small TTL cache, so an authenticated request usually
+costs no query at all. Changing a member's roles / status / club bumps the
+version (see models.py), which revokes every token issued before the change:
+immediately in this process, within `TOKEN_VERSION_TTL_SECONDS` elsewhere.
+
+Tokens from a login session also carry `sid`; logging out revokes the session,
+checked through a Bloom filter (see revocation.py), again with no query unless
+the filter hits.
+
+Endpoints that need the whole row depend on `get_current_member` instead.
+Legacy tokens (only `sub`) still work: they fall back to loading the member.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlmodel import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
 from app.db import get_session
-from app.models import Member
+from app.models import Member, MemberStatus, Role
+from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.core.config import settings
+from app.core.revocation import RevocationFilter
 
 
 # This tells FastAPI where to look for the token (the URL is just for documentation)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_member(
-    token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session)
-) -> Member:
-    """
-    Decodes the JWT token and fetches the current member from the DB.
-    """
-    credentials_exception = HTTPException(
+
+@dataclass(frozen=True)
+class Principal:
+    """Who is calling, as stated by the signed token."""
+    id: int
+    club_id: Optional[int]
+    roles: FrozenSet[str]
+    status: MemberStatus
+    token_version: int
+
+    def has_any_role(self, *roles: Role) -> bool:
+        return any(role.value in self.roles for role in roles)
+
+    @classmethod
+    def from_member(cls, member: Member) -> "Principal":
+        return cls(
+            id=member.id,
+            club_id=member.club_id,
+            roles=frozenset(str(role) for role in member.roles or []),
+            status=member.status,
+            token_version=member.token_version,
+        )
+
+
+def member_claims(member: Member) -> dict:
+    """JWT claims for a member (see Principal)."""
+    return {
+        "sub": str(member.id),
+        "club": member.club_id,
+        "roles": sorted(str(role) for role in member.roles or []),
+        "status": MemberStatus(member.status).value,
+        "tv": member.token_version,
+    }
+
+
+class TokenVersionCache:
+    """member id -> current token_version, each entry trusted for `ttl` seconds."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl = ttl_seconds
+        self._versions: Dict[int, Tuple[float, Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, member_id: int, loader: Callable[[], Optional[int]]) -> Optional[int]:
+        cached = self._versions.get(member_id)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        version = loader()  # None: the member no longer exists
+        with self._lock:
+            self._versions[member_id] = (time.monotonic(), version)
+        return version
+
+    def invalidate(self, member_id: Optional[int] = None):
+        with self._lock:
+            if member_id is None:
+                self._versions.clear()
+            else:
+                self._versions.pop(member_id, None)
+
+
+token_versions = TokenVersionCache(settings.TOKEN_VERSION_TTL_SECONDS)
+revoked_sessions = RevocationFilter(settings.TOKEN_VERSION_TTL_SECONDS)
+
+
+def _recently_revoked_sessions(tokens: RefreshTokenRepository):
+    # Older revocations cannot have a live access token left
+    since = datetime.now(UTC) - timedelta(
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES, seconds=revoked_sessions.ttl
+    )
+    return tokens.get_revoked_family_ids(since)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    session: Session = Depends(get_session),
+) -> Principal:
+    """
+    Decodes the JWT into a Principal. No DB access unless the version cache is
+    cold (one tiny indexed lookup) or the token predates versioned claims.
+    """
     try:
         # 1. Decode Token
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        member_id: str = payload.get("sub") # 'sub' usually holds the ID (as string)
-        
-        if member_id is None:
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
-        
-    # 2. Fetch Member from DB
-    member = session.get(Member, int(member_id))
-    
+        member_id = int(payload["sub"])  # 'sub' usually holds the ID (as string)
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise _credentials_exception()
+
+    # 2. Logged out? O(1) filter probe; only a hit (or a false positive) asks the DB
+    sid = payload.get("sid")
+    if sid:
+        tokens = RefreshTokenRepository(session)
+        if revoked_sessions.might_be_revoked(
+            sid, lambda: _recently_revoked_sessions(tokens)
+        ) and tokens.is_family_revoked(sid):
+            raise _credentials_exception()
+
+    # 3. Legacy token (sub only): the claims live in the DB
+    if "tv" not in payload:
+        member = session.get(Member, member_id)
+        if member is None:
+            raise _credentials_exception()
+        return Principal.from_member(member)
+
+    # 4. Revoked? (roles / status / club changed since the token was issued)
+    current_version = token_versions.get(
+        member_id,
+        lambda: session.exec(select(Member.token_version).where(Member.id == member_id)).first(),
+    )
+    if current_version is None or payload["tv"] != current_version:
+        raise _credentials_exception()
+
+    try:
+        return Principal(
+            id=member_id,
+            club_id=payload.get("club"),
+            roles=frozenset(payload.get("roles") or []),
+            status=MemberStatus(payload["status"]),
+            token_version=payload["tv"],
+        )
+    except (KeyError, ValueError):
+        raise _credentials_exception()
+
+
+def get_current_active_principal(
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    """
+    Ensures the user is not only authenticated but also 'active' (not banned/deleted).
+    """
+    # If you have an 'is_active' field, check it here.
+    # if principal.status == MemberStatus.REJECTED:
+    #     raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+
+def get_current_member(
+    principal: Principal = Depends(get_current_principal),
+    session: Session = Depends(get_session)
+) -> Member:
+    """
+    The full Member row of the caller (profile pages). Prefer the principal.
+    """
+    member = session.get(Member, principal.id)
     if member is None:
-        raise credentials_exception
-        
+        raise _credentials_exception()
     return member
 
 def get_current_active_member(
@@ -51,4 +202,24 @@ def get_current_active_member(
     # If you have an 'is_active' field, check it here.
     # if not current_member.is_active:
     #     raise HTTPException(status_code=400, detail="Inactive user")
-    return current_member
\ No newline at end of file
+    return current_member
+
+
+# --- Revocation: a committed version bump drops the cached entry right away ---
+_PENDING_KEY = "token_version_members"
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _member_version_flushed(session: OrmSession, _flush_context):
+    members = {
+        obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, Member)
+    }
+    if members:
+        session.info.setdefault(_PENDING_KEY, set()).update(members)
+
+
+@event.listens_for(OrmSession, "after_commit")
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _member_version_transaction_ended(session: OrmSession, *_):
+    for member_id in session.info.pop(_PENDING_KEY, ()):
+        token_versions.invalidate(member_id)
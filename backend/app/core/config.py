@@ -7,6 +7,9 @@ class Settings(BaseSettings):
     APP_NAME: str = "Football Club Manager"
     API_V1_STR: str = "/api/v1"
 
+    # Local development / tests only: unlocks the insecure escape hatches below
+    DEV_MODE: bool = False
+
     # 🌍 Centralized Timezone Control
     TIMEZONE: str = "Asia/Seoul"
 
@@ -17,8 +20,26 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # How long another process may keep trusting a revoked token
+    # (version cache in core/auth.py, session filter in core/revocation.py)
+    TOKEN_VERSION_TTL_SECONDS: int = 30
+
+    # Voting (Group Commit coalesces burst votes into one transaction)
+    VOTE_GROUP_COMMIT: bool = False
+    VOTE_GROUP_COMMIT_WINDOW_MS: int = 5
+    VOTE_GROUP_COMMIT_MAX_BATCH: int = 100
+
+    # Kakao (server-side access token checks, see services/kakao_service.py)
+    KAKAO_APP_ID: Optional[int] = None  # Reject tokens issued to other apps
+    KAKAO_REQUIRE_ACCESS_TOKEN: bool = True  # Refuse logins that send no Kakao token (False needs DEV_MODE)
+    KAKAO_TOKEN_CACHE_SIZE: int = 10_000
+    KAKAO_TOKEN_NEGATIVE_TTL_SECONDS: int = 60
+
+    # Phone encryption (see core/security_fields.py): "new_key,old_key", first one encrypts
+    ENCRYPTION_KEYS: Optional[str] = None
+    ENCRYPTION_KEY: Optional[str] = None  # Legacy single key, used if ENCRYPTION_KEYS is unset
 
-    encryption_key: Optional[str] = None
     cron_secret: Optional[str] = None
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
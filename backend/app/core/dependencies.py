@@ -1,6 +1,9 @@
+from typing import Optional
 from fastapi import Depends
 from sqlmodel import Session
-from app.db import get_session
+from app.db import get_session, engine
+from app.core.config import settings
+from app.core.group_commit import GroupCommitter
 
 # Repositories
 from app.repositories.member_repository import MemberRepository
@@ -11,18 +14,24 @@ from app.repositories.match_repository import MatchRepository
 from app.repositories.participation_repository import ParticipationRepository
 from app.repositories.notification_repository import NotificationRepository
 from app.repositories.season_repository import SeasonRepository
+from app.repositories.member_season_stats_repository import MemberSeasonStatsRepository
+from app.repositories.participation_event_repository import ParticipationEventRepository
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
 
 # Services
 from app.services.member_service import MemberService
+from app.services.member_import_service import MemberImportService
 from app.services.club_service import ClubService
 from app.services.membership_service import MembershipService
 from app.services.match_template_service import MatchTemplateService
 from app.services.match_service import MatchService
 from app.services.participation_service import ParticipationService
 from app.services.notification_service import NotificationService
-from app.services.kakao_service import KakaoService
+from app.services.kakao_service import KakaoService, KakaoTokenVerifier, kakao_token_verifier
 from app.services.auth_service import AuthService
 from app.services.season_service import SeasonService
+from app.services.member_stats_service import MemberStatsService
 
 
 # --- Members ---
@@ -30,17 +39,23 @@ def get_member_repository(session: Session = Depends(get_session)) -> MemberRepo
     return MemberRepository(session)
 
 
-def get_member_service(
-    repo: MemberRepository = Depends(get_member_repository),
-) -> MemberService:
-    return MemberService(repo)
+# --- Auth ---
+def get_kakao_token_verifier() -> KakaoTokenVerifier:
+    return kakao_token_verifier
+
+
+def get_refresh_token_repository(
+    session: Session = Depends(get_session),
+) -> RefreshTokenRepository:
+    return RefreshTokenRepository(session)
 
 
-# --- Auth ---
 def get_auth_service(
     member_repository: MemberRepository = Depends(get_member_repository),
+    kakao_verifier: KakaoTokenVerifier = Depends(get_kakao_token_verifier),
+    refresh_token_repository: RefreshTokenRepository = Depends(get_refresh_token_repository),
 ) -> AuthService:
-    return AuthService(member_repository)
+    return AuthService(member_repository, kakao_verifier, refresh_token_repository)
 
 
 # --- Clubs ---
@@ -53,14 +68,26 @@ def get_club_service(
 ) -> ClubService:
     return ClubService(repo)
 
+# --- Vote Events ---
+def get_participation_event_repository(
+    session: Session = Depends(get_session),
+) -> ParticipationEventRepository:
+    return ParticipationEventRepository(session)
+
+
 # --- Seasons ---
 def get_season_repository(session: Session = Depends(get_session)) -> SeasonRepository:
     return SeasonRepository(session)
 
+def get_archive_repository(session: Session = Depends(get_session)) -> ArchiveRepository:
+    return ArchiveRepository(session)
+
 def get_season_service(
     repo: SeasonRepository = Depends(get_season_repository),
+    archive_repo: ArchiveRepository = Depends(get_archive_repository),
+    event_repo: ParticipationEventRepository = Depends(get_participation_event_repository),
 ) -> SeasonService:
-    return SeasonService(repo)
+    return SeasonService(repo, archive_repo, event_repo)
 
 # --- Memberships ---
 def get_membership_repository(
@@ -76,6 +103,14 @@ def get_membership_service(
     return MembershipService(repo, season_repository)
 
 
+def get_member_import_service(
+    repo: MemberRepository = Depends(get_member_repository),
+    season_repository: SeasonRepository = Depends(get_season_repository),
+    membership_repository: MembershipRepository = Depends(get_membership_repository),
+) -> MemberImportService:
+    return MemberImportService(repo, season_repository, membership_repository)
+
+
 # --- Match Templates ---
 def get_match_template_repository(
     session: Session = Depends(get_session),
@@ -89,22 +124,48 @@ def get_match_template_service(
     return MatchTemplateService(repository)
 
 
+# --- Member Season Stats ---
+def get_member_season_stats_repository(
+    session: Session = Depends(get_session),
+) -> MemberSeasonStatsRepository:
+    return MemberSeasonStatsRepository(session)
+
+
+def get_member_stats_service(
+    repository: MemberSeasonStatsRepository = Depends(get_member_season_stats_repository),
+) -> MemberStatsService:
+    return MemberStatsService(repository)
+
+
+# --- Notification Repository ---
+def get_notification_repository(
+    session: Session = Depends(get_session),
+) -> NotificationRepository:
+    return NotificationRepository(session)
+
+
 # --- Matches ---
 def get_match_repository(session: Session = Depends(get_session)) -> MatchRepository:
     return MatchRepository(session)
 
 
-def get_match_service(
-    repository: MatchRepository = Depends(get_match_repository),
-    template_repository: MatchTemplateRepository = Depends(
-        get_match_template_repository
-    ),
-    season_repository: SeasonRepository = Depends(get_season_repository),
-) -> MatchService:
-    return MatchService(repository, template_repository, season_repository)
+# --- Participations ---
+# One process-wide committer (it owns a worker thread), only if enabled
+_vote_committer = (
+    GroupCommitter(
+        engine,
+        window_ms=settings.VOTE_GROUP_COMMIT_WINDOW_MS,
+        max_batch=settings.VOTE_GROUP_COMMIT_MAX_BATCH,
+    )
+    if settings.VOTE_GROUP_COMMIT
+    else None
+)
+
+
+def get_vote_committer() -> Optional[GroupCommitter]:
+    return _vote_committer
 
 
-# --- Participations ---
 def get_participation_repository(
     session: Session = Depends(get_session),
 ) -> ParticipationRepository:
@@ -117,22 +178,63 @@ def get_participation_service(
     ),
     match_repository: MatchRepository = Depends(get_match_repository),
     membership_repository: MembershipRepository = Depends(get_membership_repository),
+    stats_repository: MemberSeasonStatsRepository = Depends(
+        get_member_season_stats_repository
+    ),
+    event_repository: ParticipationEventRepository = Depends(
+        get_participation_event_repository
+    ),
+    vote_committer: Optional[GroupCommitter] = Depends(get_vote_committer),
 ) -> ParticipationService:
-    return ParticipationService(participation_repository, match_repository, membership_repository)
+    return ParticipationService(
+        participation_repository,
+        match_repository,
+        membership_repository,
+        stats_repository,
+        event_repository,
+        vote_committer,
+    )
 
 
-# --- Kakao ---
-def get_kakao_service() -> KakaoService:
-    return KakaoService()
+# Members hand their freed seats to the waitlist when deleted
+def get_member_service(
+    repo: MemberRepository = Depends(get_member_repository),
+    participation_service: ParticipationService = Depends(get_participation_service),
+) -> MemberService:
+    return MemberService(repo, participation_service)
 
 
-# --- Notifications ---
-def get_notification_repository(
-    session: Session = Depends(get_session),
-) -> NotificationRepository:
-    return NotificationRepository(session)
+# Matches promote waitlisted votes when capacity grows
+def get_match_service(
+    repository: MatchRepository = Depends(get_match_repository),
+    template_repository: MatchTemplateRepository = Depends(
+        get_match_template_repository
+    ),
+    season_repository: SeasonRepository = Depends(get_season_repository),
+    stats_repository: MemberSeasonStatsRepository = Depends(
+        get_member_season_stats_repository
+    ),
+    notification_repository: NotificationRepository = Depends(get_notification_repository),
+    participation_service: ParticipationService = Depends(get_participation_service),
+) -> MatchService:
+    return MatchService(
+        repository,
+        template_repository,
+        season_repository,
+        stats_repository,
+        notification_repository,
+        participation_service,
+    )
 
 
+# --- Kakao ---
+def get_kakao_service(
+    kakao_verifier: KakaoTokenVerifier = Depends(get_kakao_token_verifier),
+) -> KakaoService:
+    return KakaoService(kakao_verifier)
+
+
+# --- Notifications ---
 # We reuse existing repo getters if you have them, otherwise create new instances
 def get_notification_service(
     notification_repository: NotificationRepository = Depends(
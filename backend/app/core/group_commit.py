@@ -0,0 +1,94 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+# A unit of work receives the batch Session, stages its writes (no commit!)
+# and returns whatever the caller should get back.
+Work = Callable[[Session], Any]
+
+
+class GroupCommitter:
+    """
+    Coalesces small write transactions into a single commit.
+
+    Callers `submit()` a unit of work and block until it is durable.
+    A background worker collects everything that arrives within `window_ms`
+    (up to `max_batch` items) and runs it in ONE transaction.
+
+    Per-request guarantee: if the shared commit fails, every unit of work
+    in that batch is retried in its own transaction, so one bad write never
+    fails (or silently drops) its neighbours.
+    """
+
+    def __init__(self, engine: Engine, window_ms: int = 5, max_batch: int = 100):
+        self.engine = engine
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Tuple[Work, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, work: Work) -> Any:
+        """Runs `work` inside a (possibly shared) transaction and waits for the commit."""
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((work, future))
+        return future.result()
+
+    def _ensure_worker(self):
+        if self._worker and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="vote-group-commit", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+
+            # Keep collecting until the window closes or the batch is full
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[Work, Future]]):
+        try:
+            with Session(self.engine, expire_on_commit=False) as session:
+                results = [work(session) for work, _ in batch]
+                session.commit()
+        except Exception:
+            # Fallback: isolate each unit so only the failing one reports an error
+            for item in batch:
+                self._flush_single(item)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _flush_single(self, item: Tuple[Work, Future]):
+        work, future = item
+        try:
+            with Session(self.engine, expire_on_commit=False) as session:
+                result = work(session)
+                session.commit()
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
@@ -0,0 +1,54 @@
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core.utils import ensure_utc
+
+# Clients may keep the body, but must revalidate (cheap 304) before reusing it
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from any change marker (counts, timestamps, caller scope...)."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    RFC 9110 conditional GET: If-None-Match wins; If-Modified-Since is only
+    consulted when the client sent no ETag.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        opaque = etag.removeprefix("W/")
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or opaque in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have second precision
+        return ensure_utc(last_modified).replace(microsecond=0) <= ensure_utc(since)
+
+    return False
+
+
+def apply_cache_headers(response: Response, etag: str, last_modified: Optional[datetime]):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified:
+        response.headers["Last-Modified"] = format_datetime(ensure_utc(last_modified), usegmt=True)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Empty 304 carrying the same validators as a full response."""
+    response = Response(status_code=304)
+    apply_cache_headers(response, etag, last_modified)
+    return response
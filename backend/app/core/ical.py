@@ -0,0 +1,81 @@
+"""
+Minimal iCalendar (RFC 5545) writer 📅
+
+Yields the feed line by line so large calendars are streamed, never built in memory.
+"""
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from app.core.utils import ensure_utc
+
+CRLF = "\r\n"
+PRODID = "-//Football Club//Match Calendar//KO"
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def format_utc(dt: datetime) -> str:
+    return ensure_utc(dt).strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold(line: str) -> str:
+    """Content lines are limited to 75 octets; continuations start with a space."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + CRLF
+
+    chunks, current, size, limit = [], [], 0, 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            chunks.append("".join(current))
+            current, size, limit = [], 0, 74  # the leading space counts
+        current.append(char)
+        size += width
+    chunks.append("".join(current))
+    return CRLF.join([chunks[0]] + [" " + chunk for chunk in chunks[1:]]) + CRLF
+
+
+def event_lines(
+    uid: str,
+    summary: str,
+    start: datetime,
+    end: datetime,
+    stamp: datetime,
+    location: Optional[str] = None,
+    description: Optional[str] = None,
+    cancelled: bool = False,
+) -> Iterator[str]:
+    yield fold("BEGIN:VEVENT")
+    yield fold(f"UID:{uid}")
+    yield fold(f"DTSTAMP:{format_utc(stamp)}")
+    yield fold(f"DTSTART:{format_utc(start)}")
+    yield fold(f"DTEND:{format_utc(end)}")
+    yield fold(f"SUMMARY:{escape_text(summary)}")
+    if location:
+        yield fold(f"LOCATION:{escape_text(location)}")
+    if description:
+        yield fold(f"DESCRIPTION:{escape_text(description)}")
+    yield fold(f"STATUS:{'CANCELLED' if cancelled else 'CONFIRMED'}")
+    yield fold("END:VEVENT")
+
+
+def calendar_lines(name: str, events: Iterable[Iterable[str]]) -> Iterator[str]:
+    """Wraps already-rendered VEVENT blocks in a VCALENDAR."""
+    yield fold("BEGIN:VCALENDAR")
+    yield fold("VERSION:2.0")
+    yield fold(f"PRODID:{PRODID}")
+    yield fold("CALSCALE:GREGORIAN")
+    yield fold("METHOD:PUBLISH")
+    yield fold(f"X-WR-CALNAME:{escape_text(name)}")
+    for event in events:
+        yield from event
+    yield fold("END:VCALENDAR")
@@ -0,0 +1,57 @@
+"""
+Interval Tree 🌳
+
+Static augmented interval tree: intervals sorted by start form an implicit
+balanced BST (the middle element is the root of each range), and every node
+stores the largest `end` in its subtree. A query skips whole subtrees that end
+before it starts, so finding all k overlaps costs O(log n + k).
+
+Intervals are half-open [start, end): back-to-back bookings do not overlap.
+"""
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalTree(Generic[T]):
+    def __init__(self, intervals: Iterable[Tuple[object, object, T]]):
+        self._items = sorted(intervals, key=lambda item: (item[0], item[1]))
+        self._max_end: List[Optional[object]] = [None] * len(self._items)
+        self._build(0, len(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def overlapping(self, start, end) -> List[T]:
+        """Payloads of every interval overlapping [start, end)."""
+        found: List[T] = []
+        self._search(0, len(self._items), start, end, found)
+        return found
+
+    def _build(self, lo: int, hi: int):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        max_end = self._items[mid][1]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > max_end:
+                max_end = child
+        self._max_end[mid] = max_end
+        return max_end
+
+    def _search(self, lo: int, hi: int, start, end, found: List[T]):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_end[mid] <= start:
+            return  # Everything in this subtree ends before the query starts
+
+        self._search(lo, mid, start, end, found)
+
+        item_start, item_end, payload = self._items[mid]
+        if item_start >= end:
+            return  # This node and its whole right side start too late
+        if item_end > start:
+            found.append(payload)
+
+        self._search(mid + 1, hi, start, end, found)
@@ -0,0 +1,173 @@
+"""
+Recurrence Engine 🔁
+
+Expands a template's RRULE-style rule into concrete match instants:
+- every N weeks on a weekday (weekly, biweekly, ...)
+- the nth (or last) weekday of every month
+- minus exclusion dates, clipped to a window (usually the season)
+
+Expansion is arithmetic, not a day-by-day walk: weekly rules are a single
+`range()` over date ordinals, monthly rules compute each month's day directly.
+Every deadline is a fixed offset from the start, so it is added in the same pass.
+"""
+import calendar
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, UTC
+from typing import FrozenSet, List, NamedTuple, Optional
+
+from app.core.utils import ensure_utc
+
+
+class Occurrence(NamedTuple):
+    start_time: datetime
+    end_time: datetime
+    polling_start_at: datetime
+    soft_deadline_at: Optional[datetime]
+    hard_deadline_at: datetime
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    weekday: int  # 0=Mon ... 6=Sun (same as MatchTemplate.day_of_week)
+    start_time: time  # UTC wall time
+    duration_minutes: int = 120
+    interval_weeks: int = 1
+    week_of_month: Optional[int] = None  # 1..5, or -1 for "last"
+    anchor: Optional[date] = None  # A date the biweekly cycle runs through
+    exclusions: FrozenSet[date] = field(default_factory=frozenset)
+
+    polling_start_hours_before: int = 144
+    soft_deadline_hours_before: Optional[int] = None
+    hard_deadline_hours_before: int = 24
+
+    def __post_init__(self):
+        if not 0 <= self.weekday <= 6:
+            raise ValueError("weekday must be 0 (Mon) .. 6 (Sun)")
+        if self.interval_weeks < 1:
+            raise ValueError("interval_weeks must be >= 1")
+        if self.week_of_month is not None and self.week_of_month not in (-1, 1, 2, 3, 4, 5):
+            raise ValueError("week_of_month must be 1..5 or -1 (last)")
+
+    @classmethod
+    def from_template(cls, template) -> "RecurrenceRule":
+        """Builds the rule from a MatchTemplate (or anything shaped like one)."""
+        if template.day_of_week is None:
+            raise ValueError("Template has no day_of_week; it cannot recur")
+        return cls(
+            weekday=template.day_of_week,
+            start_time=template.start_time,
+            duration_minutes=template.duration_minutes,
+            interval_weeks=template.recurrence_interval_weeks or 1,
+            week_of_month=template.recurrence_week_of_month,
+            anchor=template.recurrence_anchor_date,
+            exclusions=frozenset(date.fromisoformat(d) for d in template.excluded_dates or []),
+            polling_start_hours_before=template.polling_start_hours_before,
+            soft_deadline_hours_before=template.soft_deadline_hours_before,
+            hard_deadline_hours_before=template.hard_deadline_hours_before,
+        )
+
+
+def occurrence_on(rule: RecurrenceRule, day: date) -> Occurrence:
+    """Start + end + every deadline for one date (no recurrence check)."""
+    return _build(rule, [day])[0]
+
+
+def occurrence_at(rule: RecurrenceRule, start: datetime) -> Occurrence:
+    """End + every deadline for an arbitrary start instant (e.g. a moved match)."""
+    return _offsets(rule, ensure_utc(start))
+
+
+def expand(rule: RecurrenceRule, window_start: datetime, window_end: datetime) -> List[Occurrence]:
+    """
+    All occurrences whose start falls in [window_start, window_end], in order.
+    Pass the season's started_at / ended_at to get a whole season at once.
+    """
+    window_start, window_end = ensure_utc(window_start), ensure_utc(window_end)
+    if window_end < window_start:
+        return []
+
+    if rule.week_of_month is None:
+        days = _weekly_days(rule, window_start.date(), window_end.date())
+    else:
+        days = _monthly_days(rule, window_start.date(), window_end.date())
+
+    if rule.exclusions:
+        days = [d for d in days if d not in rule.exclusions]
+
+    occurrences = _build(rule, days)
+
+    # The first / last day may fall outside the window by time of day
+    if occurrences and occurrences[0].start_time < window_start:
+        occurrences = occurrences[1:]
+    if occurrences and occurrences[-1].start_time > window_end:
+        occurrences = occurrences[:-1]
+    return occurrences
+
+
+def _weekly_days(rule: RecurrenceRule, first: date, last: date) -> List[date]:
+    step = 7 * rule.interval_weeks
+    start = first.toordinal() + (rule.weekday - first.weekday()) % 7
+
+    # Align to the anchor's cycle (biweekly: "this week on, next week off")
+    if rule.interval_weeks > 1 and rule.anchor:
+        anchor = rule.anchor.toordinal() + (rule.weekday - rule.anchor.weekday()) % 7
+        start += (anchor - start) % step
+
+    return [date.fromordinal(o) for o in range(start, last.toordinal() + 1, step)]
+
+
+def _monthly_days(rule: RecurrenceRule, first: date, last: date) -> List[date]:
+    days = []
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        first_weekday, month_length = calendar.monthrange(year, month)
+        if rule.week_of_month == -1:
+            last_weekday = (first_weekday + month_length - 1) % 7
+            day = month_length - (last_weekday - rule.weekday) % 7
+        else:
+            day = 1 + (rule.weekday - first_weekday) % 7 + 7 * (rule.week_of_month - 1)
+
+        if day <= month_length:
+            candidate = date(year, month, day)
+            if first <= candidate <= last:
+                days.append(candidate)
+
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return days
+
+
+def _build(rule: RecurrenceRule, days: List[date]) -> List[Occurrence]:
+    duration = timedelta(minutes=rule.duration_minutes)
+    polling = timedelta(hours=rule.polling_start_hours_before)
+    hard = timedelta(hours=rule.hard_deadline_hours_before)
+    soft = (
+        timedelta(hours=rule.soft_deadline_hours_before)
+        if rule.soft_deadline_hours_before is not None
+        else None
+    )
+    at = rule.start_time.replace(tzinfo=UTC)
+
+    occurrences = []
+    for day in days:
+        start = datetime.combine(day, at)
+        occurrences.append(
+            Occurrence(
+                start,
+                start + duration,
+                start - polling,
+                start - soft if soft is not None else None,
+                start - hard,
+            )
+        )
+    return occurrences
+
+
+def _offsets(rule: RecurrenceRule, start: datetime) -> Occurrence:
+    soft = rule.soft_deadline_hours_before
+    return Occurrence(
+        start,
+        start + timedelta(minutes=rule.duration_minutes),
+        start - timedelta(hours=rule.polling_start_hours_before),
+        start - timedelta(hours=soft) if soft is not None else None,
+        start - timedelta(hours=rule.hard_deadline_hours_before),
+    )
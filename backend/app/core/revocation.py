@@ -0,0 +1,82 @@
+"""
+Session Revocation Filter 🚫
+
+Access tokens carry `sid`, the id of the refresh-token family (login session)
+they were minted for. Logging out revokes the family. Checking every request
+against the DB would put a query back on the hot path, so revoked sids are
+mirrored into a Bloom filter: a miss (nearly every request) is a few hash
+probes, and only a hit is confirmed against the DB (false positives exist,
+false negatives do not).
+
+Only families revoked within the access-token lifetime can have live access
+tokens, so that is all the filter holds. It is rebuilt from the DB every
+`ttl` seconds (revocations from other processes) and updated immediately for
+revocations made in this one.
+"""
+import hashlib
+import math
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+
+class RevocationFilter:
+    def __init__(self, ttl_seconds: float, min_capacity: int = 10_000, error_rate: float = 0.001):
+        self.ttl = ttl_seconds
+        self.min_capacity = min_capacity
+        self.error_rate = error_rate
+        self._filter = BloomFilter(min_capacity, error_rate)
+        self._loaded_at: Optional[float] = None  # None: load on the next check
+        self._lock = threading.Lock()
+
+    def might_be_revoked(self, sid: str, loader: Callable[[], Iterable[str]]) -> bool:
+        """False means definitely not revoked. True means "ask the DB"."""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl:
+            self.rebuild(loader())
+        return sid in self._filter
+
+    def rebuild(self, sids: Iterable[str]):
+        sids = list(sids)
+        fresh = BloomFilter(max(self.min_capacity, 2 * len(sids)), self.error_rate)
+        for sid in sids:
+            fresh.add(sid)
+        with self._lock:
+            self._filter = fresh  # Readers see the old or the new filter, never half of one
+            self._loaded_at = time.monotonic()
+
+    def add(self, sid: str):
+        with self._lock:
+            self._filter.add(sid)
+            if self._filter.count > self._filter.capacity:
+                self._loaded_at = None  # Over capacity: rebuild bigger on the next check
+
+    def invalidate(self):
+        with self._lock:
+            self._filter = BloomFilter(self.min_capacity, self.error_rate)
+            self._loaded_at = None
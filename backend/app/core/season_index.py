@@ -0,0 +1,132 @@
+"""
+Season Interval Index 🗓️
+
+Per-club, in-memory sorted list of season intervals. Resolving "which season
+contains this date?" is a bisect, not a query, and a batch of dates costs one
+bisect each. The same sweep flags overlapping seasons.
+
+Invalidation: any flushed insert / update / delete of a Season drops that
+club's index (again after commit / rollback, so a rebuild never keeps
+uncommitted rows). Writes from other processes are picked up after `ttl`.
+Bulk Core UPDATEs on `season` bypass the ORM and must call `invalidate()`.
+"""
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.utils import ensure_utc
+from app.models import Season
+
+
+@dataclass(frozen=True)
+class SeasonSpan:
+    season_id: int
+    started_at: datetime
+    ended_at: datetime
+
+
+class ClubSeasonIndex:
+    def __init__(self, spans: Iterable[SeasonSpan]):
+        self.spans = sorted(
+            (
+                SeasonSpan(s.season_id, ensure_utc(s.started_at), ensure_utc(s.ended_at))
+                for s in spans
+            ),
+            key=lambda s: (s.started_at, s.season_id),
+        )
+        self._starts = [s.started_at for s in self.spans]
+
+        # Running max of ended_at lets an overlapping lookup stop early
+        self._max_end: List[datetime] = []
+        for span in self.spans:
+            previous = self._max_end[-1] if self._max_end else span.ended_at
+            self._max_end.append(max(previous, span.ended_at))
+
+    def find(self, at: datetime) -> Optional[int]:
+        """
+        Season containing `at` (bounds inclusive). If seasons overlap, the one that
+        started last wins, so the answer is deterministic.
+        """
+        at = ensure_utc(at)
+        i = bisect_right(self._starts, at) - 1
+        while i >= 0 and self._max_end[i] >= at:
+            if self.spans[i].ended_at >= at:
+                return self.spans[i].season_id
+            i -= 1
+        return None
+
+    def find_many(self, dates: Iterable[datetime]) -> List[Optional[int]]:
+        return [self.find(at) for at in dates]
+
+    def overlaps(self) -> List[Tuple[int, int]]:
+        """(earlier season id, later season id) for every overlapping pair."""
+        pairs = []
+        for i, span in enumerate(self.spans):
+            j = i + 1
+            while j < len(self.spans) and self.spans[j].started_at <= span.ended_at:
+                pairs.append((span.season_id, self.spans[j].season_id))
+                j += 1
+        return pairs
+
+    def overlapping(self, started_at: datetime, ended_at: datetime) -> List[int]:
+        """Existing seasons a new [started_at, ended_at] interval would overlap."""
+        started_at, ended_at = ensure_utc(started_at), ensure_utc(ended_at)
+        end = bisect_right(self._starts, ended_at)
+        return [s.season_id for s in self.spans[:end] if s.ended_at >= started_at]
+
+
+class SeasonIndexCache:
+    def __init__(self, ttl_seconds: float = 300):
+        self.ttl = ttl_seconds
+        self._indexes: Dict[int, Tuple[float, ClubSeasonIndex]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, club_id: int, loader: Callable[[], Iterable[SeasonSpan]]) -> ClubSeasonIndex:
+        cached = self._indexes.get(club_id)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        index = ClubSeasonIndex(loader())
+        with self._lock:
+            self._indexes[club_id] = (time.monotonic(), index)
+        return index
+
+    def invalidate(self, club_id: Optional[int] = None):
+        with self._lock:
+            if club_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(club_id, None)
+
+
+season_index = SeasonIndexCache()
+
+
+# --- Invalidation hooks (every Session, including SQLModel's subclass) ---
+_PENDING_KEY = "season_index_clubs"
+
+
+@event.listens_for(Session, "after_flush")
+def _season_flushed(session: Session, _flush_context):
+    clubs = {
+        obj.club_id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, Season)
+    }
+    if clubs:
+        session.info.setdefault(_PENDING_KEY, set()).update(clubs)
+        for club_id in clubs:
+            season_index.invalidate(club_id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _season_transaction_ended(session: Session, *_):
+    for club_id in session.info.pop(_PENDING_KEY, ()):
+        season_index.invalidate(club_id)
@@ -1,11 +1,47 @@
-import os
-from cryptography.fernet import Fernet
+import hashlib
+import warnings
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
+from cryptography.fernet import Fernet, MultiFernet
+from app.core.config import settings
 
-# 🔐 Load Key from Environment or Generate a fallback (for dev)
-# In Production (Railway), you MUST run `python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"`
-# and paste that value into your RAILWAY VARIABLES as 'ENCRYPTION_KEY'
-KEY = os.getenv("ENCRYPTION_KEY", Fernet.generate_key().decode())
-cipher_suite = Fernet(KEY.encode())
+# 🔐 Keys come from settings (environment or .env). In Production (Railway), generate one with
+# `python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"`
+# and paste it into your RAILWAY VARIABLES as 'ENCRYPTION_KEYS'.
+#
+# Rotation: ENCRYPTION_KEYS="new_key,old_key". The FIRST key encrypts, every key
+# decrypts. Run `python -m app.commands rotate-encryption`, then drop the old key.
+# (A single legacy ENCRYPTION_KEY is still accepted.)
+
+def load_keys() -> List[str]:
+    """Refuses to start without a key; only DEV_MODE falls back to a throwaway one."""
+    raw = settings.ENCRYPTION_KEYS or settings.ENCRYPTION_KEY
+    keys = [key.strip() for key in (raw or "").split(",") if key.strip()]
+    if not keys:
+        if not settings.DEV_MODE:
+            raise RuntimeError(
+                "ENCRYPTION_KEYS is not set. Phone numbers would be encrypted with a key "
+                "lost on restart; set ENCRYPTION_KEYS (or DEV_MODE=true for local runs)."
+            )
+        warnings.warn(
+            "🚨 ENCRYPTION_KEYS is not set: using a random throwaway key. Phone numbers "
+            "written now will be UNREADABLE after a restart. Never run production like this.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        keys = [Fernet.generate_key().decode()]
+    return keys
+
+def use_keys(keys: Sequence[str]):
+    """(Re)builds the cipher; the first key is the primary (encrypting) one."""
+    global KEYS, cipher_suite
+    KEYS = list(keys)
+    cipher_suite = MultiFernet([Fernet(key.encode()) for key in KEYS])
+    _decrypt_cached.cache_clear()
+
+def primary_key_id() -> str:
+    """Short, non-secret fingerprint of the encrypting key (names rotation checkpoints)."""
+    return hashlib.sha256(KEYS[0].encode()).hexdigest()[:16]
 
 def encrypt_text(text: str) -> str:
     if not text:
@@ -16,6 +52,24 @@ def decrypt_text(text: str) -> str:
     if not text:
         return None
     try:
-        return cipher_suite.decrypt(text.encode()).decode()
+        return _decrypt_cached(text)
     except Exception:
-        return "Decryption Failed"
\ No newline at end of file
+        return "Decryption Failed"
+
+def rotate_text(text: str) -> str:
+    """Re-encrypts a token under the primary key (raises if no key can read it)."""
+    return cipher_suite.rotate(text.encode()).decode()
+
+def decrypt_many(texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """Decrypts a whole column at once: each distinct token is verified only once."""
+    texts = list(texts)
+    plain = {text: decrypt_text(text) for text in set(texts) if text}
+    return [plain.get(text) for text in texts]
+
+# Fernet tokens carry a random IV, so a ciphertext maps to exactly one plaintext.
+# Bounded, so a huge directory can't pin every phone number in memory.
+@lru_cache(maxsize=1024)
+def _decrypt_cached(text: str) -> str:
+    return cipher_suite.decrypt(text.encode()).decode()
+
+use_keys(load_keys())
@@ -0,0 +1,147 @@
+"""
+Streaming spreadsheet readers 📑
+
+CSV and XLSX rows as (row number, {header: value}) pairs, one at a time, so an
+import never holds the whole sheet in memory. XLSX is read with the stdlib only:
+a zip of XML parts, walked with `iterparse` and cleared as it goes. (Only the
+shared-strings table is kept, because cells refer to it by index.)
+"""
+import csv
+import io
+import re
+import zipfile
+import posixpath
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+Row = Tuple[int, Dict[str, str]]
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+class TabularError(ValueError):
+    """The file itself is unreadable (not a single bad row)."""
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[Row]:
+    """UTF-8 CSV (an Excel BOM is fine); the first line is the header."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = _header(next(reader, None))
+        for line_number, values in enumerate(reader, start=2):
+            if any(value.strip() for value in values):
+                yield line_number, _as_dict(header, values)
+    except UnicodeDecodeError:
+        raise TabularError("CSV must be UTF-8 encoded")
+    finally:
+        text.detach()  # Leave the underlying file open for the caller
+
+
+def iter_xlsx_rows(file: BinaryIO) -> Iterator[Row]:
+    """First worksheet of an .xlsx workbook; the first row is the header."""
+    try:
+        workbook = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        raise TabularError("Not a valid .xlsx file")
+
+    with workbook:
+        shared = _shared_strings(workbook)
+        header: Optional[List[str]] = None
+        for row_number, values in _sheet_rows(workbook, _first_sheet_path(workbook), shared):
+            if header is None:
+                header = _header(values)
+            elif any(value.strip() for value in values):
+                yield row_number, _as_dict(header, values)
+        if header is None:
+            raise TabularError("The file is empty")
+
+
+def _header(values: Optional[List[str]]) -> List[str]:
+    if not values or not any(v.strip() for v in values):
+        raise TabularError("The file is empty")
+    return [value.strip().lower() for value in values]
+
+
+def _as_dict(header: List[str], values: List[str]) -> Dict[str, str]:
+    return {name: value.strip() for name, value in zip(header, values) if name}
+
+
+def _first_sheet_path(workbook: zipfile.ZipFile) -> str:
+    try:
+        with workbook.open("xl/workbook.xml") as xml:
+            sheet = next(
+                elem for _, elem in iterparse(xml) if elem.tag == f"{_MAIN_NS}sheet"
+            )
+        rel_id = sheet.get(f"{_DOC_REL_NS}id")
+        with workbook.open("xl/_rels/workbook.xml.rels") as xml:
+            for _, elem in iterparse(xml):
+                if elem.tag == f"{_REL_NS}Relationship" and elem.get("Id") == rel_id:
+                    target = elem.get("Target")
+                    return target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+    except (KeyError, StopIteration):
+        pass
+    return "xl/worksheets/sheet1.xml"
+
+
+def _shared_strings(workbook: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in workbook.namelist():
+        return []
+    strings = []
+    with workbook.open("xl/sharedStrings.xml") as xml:
+        for _, elem in iterparse(xml):
+            if elem.tag == f"{_MAIN_NS}si":
+                # Rich text splits one string into several runs
+                strings.append("".join(t.text or "" for t in elem.iter(f"{_MAIN_NS}t")))
+                elem.clear()
+    return strings
+
+
+def _sheet_rows(workbook: zipfile.ZipFile, path: str, shared: List[str]) -> Iterator[Tuple[int, List[str]]]:
+    try:
+        xml = workbook.open(path)
+    except KeyError:
+        raise TabularError("The workbook has no worksheet")
+
+    with xml:
+        sheet_data = None
+        for event, elem in iterparse(xml, events=("start", "end")):
+            if event == "start":
+                if elem.tag == f"{_MAIN_NS}sheetData":
+                    sheet_data = elem
+                continue
+            if elem.tag != f"{_MAIN_NS}row":
+                continue
+            values: List[str] = []
+            for cell in elem.iter(f"{_MAIN_NS}c"):
+                column = _column_index(cell.get("r"), len(values))
+                values.extend([""] * (column - len(values)))  # Empty cells are omitted
+                values.append(_cell_value(cell, shared))
+            yield int(elem.get("r") or 0), values
+            if sheet_data is not None:
+                sheet_data.clear()  # Drop finished rows: memory stays flat
+
+
+def _column_index(ref: Optional[str], default: int) -> int:
+    match = _CELL_REF.match(ref or "")
+    if not match:
+        return default
+    index = 0
+    for letter in match.group(1):
+        index = index * 26 + (ord(letter) - ord("A") + 1)
+    return index - 1
+
+
+def _cell_value(cell, shared: List[str]) -> str:
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{_MAIN_NS}t"))
+    value = cell.findtext(f"{_MAIN_NS}v") or ""
+    if kind == "s":
+        return shared[int(value)] if value.isdigit() and int(value) < len(shared) else ""
+    if kind is None and value.endswith(".0"):
+        return value[:-2]  # Whole numbers (back numbers, years) come back as floats
+    return value
@@ -1,3 +1,5 @@
+import base64
+import json
 from datetime import datetime, UTC
 
 # Korean Day of Week Map
@@ -10,4 +12,24 @@ def ensure_utc(dt: datetime | None) -> datetime | None:
     if dt.tzinfo is None:
         return dt.replace(tzinfo=UTC)
     
-    return dt.astimezone(UTC)
\ No newline at end of file
+    return dt.astimezone(UTC)
+
+
+def encode_cursor(*parts) -> str:
+    """
+    Packs keyset values (e.g. start_time, id) into an opaque URL-safe token.
+    Datetimes are stored as ISO strings; decode_cursor() returns them as-is.
+    """
+    raw = json.dumps([p.isoformat() if isinstance(p, datetime) else p for p in parts])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    """Inverse of encode_cursor(). Raises ValueError on tampered/garbage input."""
+    try:
+        parts = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(parts, list):
+        raise ValueError("Invalid cursor")
+    return parts
@@ -1,5 +1,8 @@
 from sqlmodel import create_engine, SQLModel, Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 import os
+import sqlite3
 from dotenv import load_dotenv
 
 load_dotenv() # Load env vars from .env
@@ -11,6 +14,14 @@ if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
 
 engine = create_engine(DATABASE_URL, echo=True, pool_pre_ping=True)
 
+@event.listens_for(Engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_connection, _connection_record):
+    """SQLite ignores foreign keys (and so ON DELETE CASCADE) unless asked, per connection"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 def init_db():
     """Creates tables if they don't exist"""
     SQLModel.metadata.create_all(engine)
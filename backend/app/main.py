@@ -15,6 +15,7 @@ from app.api import (
     participations,
     auth,
     notifications,
+    stats,
 )
 from app.scheduler import start_scheduler, shutdown_scheduler
 
@@ -88,3 +89,4 @@ app.include_router(match_templates.router, prefix="/match-templates", tags=["mat
 app.include_router(matches.router, prefix="/matches", tags=["matches"])
 app.include_router(participations.router, prefix="/participations", tags=["participations"])
 app.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
+app.include_router(stats.router, prefix="/stats", tags=["stats"])
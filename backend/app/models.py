@@ -1,5 +1,5 @@
 from typing import Optional, List
-from datetime import datetime, time, timezone, UTC
+from datetime import date, datetime, time, timezone, UTC
 from sqlmodel import SQLModel, Field, Relationship
 from enum import Enum
 import sqlalchemy as sa
@@ -33,11 +33,23 @@ class Role(str, Enum):
     EDITOR = "EDITOR"
     ADMIN = "ADMIN"
     ANNOUNCER = "ANNOUNCER"
+    MANAGER = "MANAGER"
 
 class ParticipationStatus(str, Enum):
     ATTENDING = "ATTENDING"
     ABSENT = "ABSENT"
     PENDING = "PENDING"
+    WAITLISTED = "WAITLISTED" # Wanted to attend, match was full (set by the system)
+
+# Compact codes for the append-only vote log (ParticipationEvent).
+# ⚠️ Stored in the DB: only ever ADD codes, never renumber.
+PARTICIPATION_STATUS_CODES = {
+    ParticipationStatus.ATTENDING: 1,
+    ParticipationStatus.ABSENT: 2,
+    ParticipationStatus.PENDING: 3,
+    ParticipationStatus.WAITLISTED: 4,
+}
+PARTICIPATION_STATUS_BY_CODE = {code: status for status, code in PARTICIPATION_STATUS_CODES.items()}
 
 class MemberStatus(str, Enum):
     PENDING = "PENDING"
@@ -82,6 +94,29 @@ class PlayerPosition(str, Enum):
     # Goalkeeper
     GK = "GK"
 
+# Bit per role / position for Member.role_mask / Member.position_mask.
+# ⚠️ Stored in the DB: only ever ADD bits, never renumber.
+ROLE_BITS = {
+    Role.VIEWER: 1 << 0,
+    Role.EDITOR: 1 << 1,
+    Role.ADMIN: 1 << 2,
+    Role.ANNOUNCER: 1 << 3,
+    Role.MANAGER: 1 << 4,
+}
+POSITION_BITS = {position: 1 << i for i, position in enumerate([
+    PlayerPosition.ST, PlayerPosition.SS, PlayerPosition.FS, PlayerPosition.RW, PlayerPosition.LW,
+    PlayerPosition.CAM, PlayerPosition.CM, PlayerPosition.CDM, PlayerPosition.RM, PlayerPosition.LM,
+    PlayerPosition.CB, PlayerPosition.RB, PlayerPosition.LB, PlayerPosition.LWB, PlayerPosition.RWB,
+    PlayerPosition.GK,
+])}
+
+def to_mask(values, bits: dict) -> int:
+    """["GK", "CB"] -> bit OR. Unknown values are ignored (JSON lists are free-form)."""
+    mask = 0
+    for value in values or []:
+        mask |= bits.get(value, 0)
+    return mask
+
 class NotificationType(str, Enum):
     POLLING_START = "POLLING_START" # 🆕 "Voting is OPEN!"
     SOFT_DEADLINE = "SOFT_DEADLINE" # "Please vote!"
@@ -104,12 +139,12 @@ class ClubBase(SQLModel):
 class Club(ClubBase, TimestampMixin, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     
-    # Relationships
-    members: List["Member"] = Relationship(back_populates="club")
-    seasons: List["Season"] = Relationship(back_populates="club")
-    memberships: List["Membership"] = Relationship(back_populates="club")
-    match_templates: List["MatchTemplate"] = Relationship(back_populates="club")
-    matches: List["Match"] = Relationship(back_populates="club")
+    # Relationships (children go with the club via ON DELETE, never loaded to be deleted)
+    members: List["Member"] = Relationship(back_populates="club", passive_deletes="all")
+    seasons: List["Season"] = Relationship(back_populates="club", passive_deletes="all")
+    memberships: List["Membership"] = Relationship(back_populates="club", passive_deletes="all")
+    match_templates: List["MatchTemplate"] = Relationship(back_populates="club", passive_deletes="all")
+    matches: List["Match"] = Relationship(back_populates="club", passive_deletes="all")
 
 # -----------------------------------------------------------------------------
 # 👤 MEMBER
@@ -130,21 +165,44 @@ class MemberBase(SQLModel):
     #Roles
     roles: List[str] = Field(default=["VIEWER"], sa_column=Column(JSON))
 
+# Members aged under this are group 1, the rest group 2 (see Member.age_group)
+AGE_GROUP_SPLIT_AGE = 50
+
 class Member(MemberBase, TimestampMixin, table=True):
+    __table_args__ = (
+        # Directory: club + status filter, then name order / prefix search
+        sa.Index("ix_member_club_status", "club_id", "status"),
+        # "GKs / ANNOUNCERs of a club": bit tests answered from the index alone
+        sa.Index("ix_member_club_masks", "club_id", "position_mask", "role_mask"),
+        sa.Index(
+            "ix_member_club_name_search", "club_id", "name_search", "id",
+            postgresql_ops={"name_search": "text_pattern_ops"}, # LIKE 'abc%' in any collation
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     kakao_id: str = Field(index=True, unique=True) # Auth ID (Internal)
-    club_id: Optional[int] = Field(default=None, foreign_key="club.id")
+    club_id: Optional[int] = Field(default=None, foreign_key="club.id", ondelete="SET NULL")
+
+    # 🔎 Search columns, kept in sync by the mapper events below
+    name_search: str = Field(default="") # Lowercased name (directory prefix search)
+    role_mask: int = Field(default=0) # ROLE_BITS of `roles`
+    position_mask: int = Field(default=0) # POSITION_BITS of `positions`
 
     # 🔐 Encrypted Phone Number (Stored as random-looking string)
     encrypted_phone: Optional[str] = Field(default=None)
 
+    # 🎟️ Bumped whenever a claim baked into tokens changes: older tokens stop working
+    token_version: int = Field(default=1)
+
     # Relationships
     club: Optional[Club] = Relationship(back_populates="members")
-    memberships: List["Membership"] = Relationship(back_populates="member")
-    participations: List["Participation"] = Relationship(back_populates="member")
+    memberships: List["Membership"] = Relationship(back_populates="member", passive_deletes="all")
+    participations: List["Participation"] = Relationship(back_populates="member", passive_deletes="all")
 
     # 1. Phone Getter/Setter (Handles Encryption Automatically)
-    @computed_field
+    # NOT a computed field: serializing a Member never decrypts. Only schemas that
+    # declare `phone` (MemberMeRead, MemberContactRead) pay for it.
     @property
     def phone(self) -> Optional[str]:
         from app.core.security_fields import decrypt_text
@@ -160,6 +218,9 @@ class Member(MemberBase, TimestampMixin, table=True):
         else:
             self.encrypted_phone = None
 
+    def has_any_role(self, *roles: Role) -> bool:
+        return bool(self.role_mask & to_mask(roles, ROLE_BITS))
+
     # 2. Age Group Calculator
     @computed_field
     @property
@@ -169,11 +230,27 @@ class Member(MemberBase, TimestampMixin, table=True):
         
         age = datetime.now().year - self.birth_year
         
-        if age < 50:
+        if age < AGE_GROUP_SPLIT_AGE:
             return "1 그룹 (20대~40대)"
         else:
             return "2 그룹 (50대+)"
 
+@sa.event.listens_for(Member, "before_insert")
+@sa.event.listens_for(Member, "before_update")
+def _sync_member_search_columns(_mapper, _connection, member: Member):
+    member.name_search = (member.name or "").lower()
+    member.role_mask = to_mask(member.roles, ROLE_BITS)
+    member.position_mask = to_mask(member.positions, POSITION_BITS)
+
+# Fields copied into JWT claims (see app/core/auth.py)
+TOKEN_CLAIM_FIELDS = ("roles", "status", "club_id")
+
+@sa.event.listens_for(Member, "before_update")
+def _bump_member_token_version(_mapper, _connection, member: Member):
+    state = sa.inspect(member)
+    if any(state.attrs[name].history.has_changes() for name in TOKEN_CLAIM_FIELDS):
+        member.token_version = (member.token_version or 0) + 1
+
 # -----------------------------------------------------------------------------
 # 🍂 SEASON
 # -----------------------------------------------------------------------------
@@ -186,13 +263,20 @@ class SeasonBase(SQLModel):
     is_active: bool = Field(default=True)
 
 class Season(SeasonBase, TimestampMixin, table=True):
+    __table_args__ = (
+        # Loading a club's season intervals (see app/core/season_index.py)
+        sa.Index("ix_season_club_range", "club_id", "started_at", "ended_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    club_id: int = Field(foreign_key="club.id")
+    club_id: int = Field(foreign_key="club.id", ondelete="CASCADE")
+    # Set when the season was closed and its finished matches moved to *_archive
+    archived_at: Optional[datetime] = Field(default=None, sa_type=sa.DateTime(timezone=True))
     
     # Relationships
     club: "Club" = Relationship(back_populates="seasons")
-    matches: List["Match"] = Relationship(back_populates="season")
-    memberships: List["Membership"] = Relationship(back_populates="season")
+    matches: List["Match"] = Relationship(back_populates="season", passive_deletes="all")
+    memberships: List["Membership"] = Relationship(back_populates="season", passive_deletes="all")
 
 # -----------------------------------------------------------------------------
 # 🎫 MEMBERSHIP
@@ -205,10 +289,17 @@ class MembershipBase(SQLModel):
     expires_at: Optional[datetime] = Field(default=None)
 
 class Membership(MembershipBase, TimestampMixin, table=True):
+    __table_args__ = (
+        # Gatekeeper: "may this member vote in this season right now?" (index-only)
+        sa.Index("ix_membership_gatekeeper", "season_id", "member_id", "status", "expires_at"),
+        # Expiry sweeper: ACTIVE rows past expires_at
+        sa.Index("ix_membership_status_expires", "status", "expires_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    member_id: int = Field(foreign_key="member.id")
-    club_id: int = Field(foreign_key="club.id")
-    season_id: int = Field(foreign_key="season.id")
+    member_id: int = Field(foreign_key="member.id", ondelete="CASCADE")
+    club_id: int = Field(foreign_key="club.id", ondelete="CASCADE")
+    season_id: int = Field(foreign_key="season.id", ondelete="CASCADE")
 
     # Relationships
     club: Club = Relationship(back_populates="memberships")
@@ -233,9 +324,16 @@ class MatchTemplateBase(SQLModel):
     soft_deadline_hours_before: int = Field(default=None)
     hard_deadline_hours_before: int = Field(default=24)
 
+    # Recurrence (expanded by app/core/recurrence.py)
+    recurrence_interval_weeks: int = Field(default=1)  # 2 = biweekly
+    recurrence_week_of_month: Optional[int] = None  # 1..5 or -1 (last) -> monthly rule
+    recurrence_anchor_date: Optional[date] = None  # A date the biweekly cycle runs through
+    # Skipped dates as ISO strings (e.g. ["2025-09-06"])
+    excluded_dates: List[str] = Field(default=[], sa_column=Column(JSON))
+
 class MatchTemplate(MatchTemplateBase, TimestampMixin, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    club_id: int = Field(foreign_key="club.id")
+    club_id: int = Field(foreign_key="club.id", ondelete="CASCADE")
 
     # Relationships
     club: Optional[Club] = Relationship(back_populates="match_templates")
@@ -261,15 +359,31 @@ class MatchBase(SQLModel):
     status: MatchStatus = Field(default=MatchStatus.RECRUITING)
 
 class Match(MatchBase, TimestampMixin, table=True):
+    __table_args__ = (
+        # Calendar / upcoming reads (and the conditional GET probe) are range scans on (club_id, start_time)
+        sa.Index("ix_match_club_start", "club_id", "start_time"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    club_id: int = Field(foreign_key="club.id")
-    season_id: int = Field(foreign_key="season.id")
+    club_id: int = Field(foreign_key="club.id", ondelete="CASCADE")
+    season_id: int = Field(foreign_key="season.id", ondelete="CASCADE")
+    # Originating template (None for manual matches): its offsets drive deadline recomputation
+    template_id: Optional[int] = Field(
+        default=None, foreign_key="matchtemplate.id", ondelete="SET NULL", index=True
+    )
+    # Fields edited by hand on this match: template syncs leave them alone
+    overridden_fields: List[str] = Field(default=[], sa_column=Column(JSON))
+
+    # Seats taken. Only ever changed by conditional UPDATEs (see MatchRepository)
+    attending_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Ghosts / last attended were counted into season stats (undone if it leaves FINISHED)
+    stats_finalized: bool = Field(default=False, sa_column_kwargs={"server_default": sa.false()})
 
     # Relationships
     club: Optional["Club"] = Relationship(back_populates="matches")
     season: Season = Relationship(back_populates="matches")
-    participations: List["Participation"] = Relationship(back_populates="match")
-    notifications: List["Notification"] = Relationship(back_populates="match")
+    participations: List["Participation"] = Relationship(back_populates="match", passive_deletes="all")
+    notifications: List["Notification"] = Relationship(back_populates="match", passive_deletes="all")
 
 # -----------------------------------------------------------------------------
 # 🙋 PARTICIPATION
@@ -279,14 +393,101 @@ class ParticipationBase(SQLModel):
     comment: Optional[str] = None
 
 class Participation(ParticipationBase, TimestampMixin, table=True):
+    __table_args__ = (
+        # One vote per member per match (also makes concurrent double-taps safe)
+        sa.UniqueConstraint("match_id", "member_id", name="uq_participation_match_member"),
+        # Member history is paged by (member_id, match_start_time DESC, id DESC)
+        sa.Index("ix_participation_member_history", "member_id", "match_start_time", "id"),
+        # Waitlist is served FIFO per match
+        sa.Index("ix_participation_waitlist", "match_id", "status", "waitlisted_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    match_id: int = Field(foreign_key="match.id", index=True)
-    member_id: int = Field(foreign_key="member.id", index=True)
+    match_id: int = Field(foreign_key="match.id", ondelete="CASCADE", index=True)
+    member_id: int = Field(foreign_key="member.id", ondelete="CASCADE", index=True)
+
+    # Denormalized copy of Match.start_time (kept in sync by MatchService)
+    # so history pages are served straight from the index above.
+    # NOT NULL: a NULL would fall outside the keyset order (see backfill-match-start-times).
+    match_start_time: datetime = Field(
+        sa_type=sa.DateTime(timezone=True), nullable=False
+    )
+
+    # Queue position while WAITLISTED (oldest gets the next free seat)
+    waitlisted_at: Optional[datetime] = Field(
+        default=None, sa_type=sa.DateTime(timezone=True)
+    )
 
     # Relationships
     member: "Member" = Relationship(back_populates="participations")
     match: "Match" = Relationship(back_populates="participations")
 
+# -----------------------------------------------------------------------------
+# 📜 PARTICIPATION EVENT LOG (Append-only: every status change ever made)
+# -----------------------------------------------------------------------------
+class ParticipationEvent(SQLModel, table=True):
+    """
+    One row per vote status change. Deliberately tiny: ids, a SMALLINT status
+    code (see PARTICIPATION_STATUS_CODES) and a timestamp. No comments, no text.
+    """
+    __tablename__ = "participation_event"
+    __table_args__ = (
+        sa.Index("ix_participation_event_replay", "match_id", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    match_id: int = Field(foreign_key="match.id", ondelete="CASCADE")
+    member_id: int = Field(foreign_key="member.id", ondelete="CASCADE")
+    status_code: int = Field(sa_type=sa.SmallInteger)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=sa.DateTime(timezone=True),
+        nullable=False,
+    )
+
+class ParticipationEventSummary(SQLModel, table=True):
+    """
+    Compacted history of one member on one FINISHED match: replaces its raw events.
+    match_id has no FK on purpose, so summaries survive match archival.
+    """
+    __tablename__ = "participation_event_summary"
+    __table_args__ = (
+        sa.UniqueConstraint("match_id", "member_id", name="uq_participation_event_summary"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    match_id: int = Field(index=True)
+    member_id: int = Field(foreign_key="member.id", ondelete="CASCADE")
+    final_status_code: int = Field(sa_type=sa.SmallInteger)
+    change_count: int = Field(sa_type=sa.SmallInteger)
+    first_voted_at: datetime = Field(sa_type=sa.DateTime(timezone=True))
+    last_changed_at: datetime = Field(sa_type=sa.DateTime(timezone=True))
+
+# -----------------------------------------------------------------------------
+# 📊 MEMBER SEASON STATS (Incrementally maintained, one row per member/season)
+# -----------------------------------------------------------------------------
+class MemberSeasonStatsBase(SQLModel):
+    # Vote counters: moved on every vote (old bucket -1, new bucket +1)
+    attended: int = Field(default=0)
+    absent: int = Field(default=0)
+    pending: int = Field(default=0)
+    # Finalized when a match turns FINISHED
+    ghosted: int = Field(default=0)
+    last_attended_at: Optional[datetime] = Field(
+        default=None, sa_type=sa.DateTime(timezone=True)
+    )
+
+class MemberSeasonStats(MemberSeasonStatsBase, TimestampMixin, table=True):
+    __tablename__ = "member_season_stats"
+    __table_args__ = (
+        sa.UniqueConstraint("member_id", "season_id", name="uq_member_season_stats"),
+        sa.Index("ix_member_season_stats_leaderboard", "season_id", "attended"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    member_id: int = Field(foreign_key="member.id", ondelete="CASCADE")
+    season_id: int = Field(foreign_key="season.id", ondelete="CASCADE")
+
 # -----------------------------------------------------------------------------
 # 🔔 NOTIFICATION
 # -----------------------------------------------------------------------------
@@ -297,10 +498,112 @@ class NotificationBase(SQLModel):
     content: str = Field(sa_column=Column(Text)) # Snapshot of the message
     sent_at: Optional[datetime] = None 
     
-    match_id: int = Field(foreign_key="match.id")
+    match_id: int = Field(foreign_key="match.id", ondelete="CASCADE")
 
 class Notification(NotificationBase, TimestampMixin, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # Relationships
-    match: "Match" = Relationship(back_populates="notifications")
\ No newline at end of file
+    match: "Match" = Relationship(back_populates="notifications")
+# -----------------------------------------------------------------------------
+# 🗄️ ARCHIVE (Closed seasons: FINISHED matches + their rows, moved in bulk)
+# -----------------------------------------------------------------------------
+# Same columns as the hot tables (ids are kept), plus `archived_at`.
+# No foreign keys back to the hot `match` table: those rows are gone.
+
+class MatchArchive(MatchBase, TimestampMixin, table=True):
+    __tablename__ = "match_archive"
+    __table_args__ = (
+        sa.Index("ix_match_archive_club_start", "club_id", "start_time"),
+    )
+
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    club_id: int = Field(foreign_key="club.id", ondelete="CASCADE")
+    season_id: int = Field(foreign_key="season.id", ondelete="CASCADE", index=True)
+    template_id: Optional[int] = None
+    overridden_fields: List[str] = Field(default=[], sa_column=Column(JSON))
+    attending_count: int = Field(default=0)
+    stats_finalized: bool = Field(default=False)
+
+    archived_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=sa.DateTime(timezone=True),
+    )
+
+class ParticipationArchive(ParticipationBase, TimestampMixin, table=True):
+    __tablename__ = "participation_archive"
+    __table_args__ = (
+        sa.Index("ix_participation_archive_member_history", "member_id", "match_start_time", "id"),
+    )
+
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    match_id: int = Field(index=True)
+    member_id: int = Field(foreign_key="member.id", ondelete="CASCADE")
+    match_start_time: datetime = Field(
+        sa_type=sa.DateTime(timezone=True), nullable=False
+    )
+    waitlisted_at: Optional[datetime] = Field(
+        default=None, sa_type=sa.DateTime(timezone=True)
+    )
+
+    archived_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=sa.DateTime(timezone=True),
+    )
+
+class NotificationArchive(TimestampMixin, table=True):
+    __tablename__ = "notification_archive"
+
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    type: NotificationType
+    status: NotificationStatus
+    content: str = Field(sa_column=Column(Text))
+    sent_at: Optional[datetime] = None
+    match_id: int = Field(index=True)
+
+    archived_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=sa.DateTime(timezone=True),
+    )
+
+# -----------------------------------------------------------------------------
+# 🔑 ENCRYPTION KEY ROTATION (Resumable checkpoint, one row per primary key)
+# -----------------------------------------------------------------------------
+
+class EncryptionRotation(TimestampMixin, table=True):
+    __tablename__ = "encryption_rotation"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key_id: str = Field(unique=True)  # Fingerprint of the key rows are moved TO
+    last_member_id: int = Field(default=0)  # Keyset cursor: everything <= is done
+    rotated: int = Field(default=0)
+    failed: int = Field(default=0)  # Tokens no configured key could read
+    completed_at: Optional[datetime] = Field(
+        default=None, sa_type=sa.DateTime(timezone=True)
+    )
+
+# -----------------------------------------------------------------------------
+# 🔄 REFRESH TOKENS (One row per issued token; rotated on every use)
+# -----------------------------------------------------------------------------
+
+class RefreshToken(SQLModel, table=True):
+    __tablename__ = "refresh_token"
+    __table_args__ = (
+        # The revocation filter reloads recent revocations (see core/revocation.py)
+        sa.Index("ix_refresh_token_revoked_at", "revoked_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    member_id: int = Field(foreign_key="member.id", ondelete="CASCADE", index=True)
+    # All tokens of one login session share a family (the access tokens' `sid`)
+    family_id: str = Field(index=True)
+    token_hash: str = Field(unique=True)  # SHA-256 of the token: the token itself is never stored
+
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=sa.DateTime(timezone=True),
+        nullable=False,
+    )
+    expires_at: datetime = Field(sa_type=sa.DateTime(timezone=True), nullable=False)
+    used_at: Optional[datetime] = Field(default=None, sa_type=sa.DateTime(timezone=True))
+    revoked_at: Optional[datetime] = Field(default=None, sa_type=sa.DateTime(timezone=True))
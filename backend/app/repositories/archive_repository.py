@@ -0,0 +1,55 @@
+from datetime import datetime, UTC
+from typing import List
+import sqlalchemy as sa
+from sqlalchemy import delete, literal
+from sqlmodel import Session, select
+from app.models import (
+    Match,
+    MatchArchive,
+    MatchStatus,
+    Participation,
+    ParticipationArchive,
+    Notification,
+    NotificationArchive,
+)
+
+# (hot table, archive table, column holding the match id)
+ARCHIVED_TABLES = (
+    (Match, MatchArchive, "id"),
+    (Participation, ParticipationArchive, "match_id"),
+    (Notification, NotificationArchive, "match_id"),
+)
+
+
+class ArchiveRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_archivable_match_ids(self, season_id: int) -> List[int]:
+        statement = select(Match.id).where(
+            Match.season_id == season_id,
+            Match.status == MatchStatus.FINISHED,
+        )
+        return self.session.exec(statement).all()
+
+    def archive_matches(self, match_ids: List[int]) -> int:
+        """
+        Moves matches + their participations + notifications to the archive tables:
+        one INSERT ... SELECT per table, then the hot rows are deleted children-first.
+        No commit: the caller finishes the transaction (all or nothing).
+        """
+        if not match_ids:
+            return 0
+
+        now = literal(datetime.now(UTC), sa.DateTime(timezone=True))
+        for hot, cold, key in ARCHIVED_TABLES:
+            columns = [column.name for column in hot.__table__.c]
+            rows = sa.select(*hot.__table__.c, now).where(hot.__table__.c[key].in_(match_ids))
+            self.session.exec(
+                sa.insert(cold.__table__).from_select([*columns, "archived_at"], rows)
+            )
+
+        for hot, _, key in reversed(ARCHIVED_TABLES):
+            self.session.exec(delete(hot).where(hot.__table__.c[key].in_(match_ids)))
+
+        return len(match_ids)
@@ -1,6 +1,9 @@
 from sqlmodel import Session, select
+from sqlalchemy import delete, union_all
 from typing import List, Optional
-from app.models import Club
+from app.models import (
+    Club, Match, MatchArchive, NotificationArchive, ParticipationArchive, ParticipationEventSummary
+)
 
 class ClubRepository:
     def __init__(self, session: Session):
@@ -25,5 +28,18 @@ class ClubRepository:
         return club
 
     def delete(self, club: Club):
-        self.session.delete(club)
+        """
+        One DELETE: seasons, memberships, templates, matches (and everything under them)
+        go via ON DELETE CASCADE, members are detached via ON DELETE SET NULL.
+        Vote summaries and archived participations / notifications have no FK to a
+        match table, so the club's (hot + archived) go explicitly, before the archive
+        matches they point at cascade away.
+        """
+        match_ids = union_all(
+            select(Match.id).where(Match.club_id == club.id),
+            select(MatchArchive.id).where(MatchArchive.club_id == club.id),
+        )
+        for orphan in (ParticipationEventSummary, ParticipationArchive, NotificationArchive):
+            self.session.exec(delete(orphan).where(orphan.match_id.in_(match_ids)))
+        self.session.exec(delete(Club).where(Club.id == club.id))
         self.session.commit()
\ No newline at end of file
@@ -0,0 +1,20 @@
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+# Small portability helpers for statements the ORM can't express generically.
+# Production runs PostgreSQL, the test-suite runs SQLite; both speak ON CONFLICT.
+
+
+def insert_for(session: Session):
+    """The dialect-specific insert() that supports .on_conflict_do_update()."""
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def greatest_for(session: Session, a, b):
+    """GREATEST(a, b) on PostgreSQL, scalar 2-arg MAX(a, b) on SQLite."""
+    if session.get_bind().dialect.name == "postgresql":
+        return func.greatest(a, b)
+    return func.max(a, b)
@@ -0,0 +1,26 @@
+from typing import Optional
+from sqlmodel import Session, select
+from app.models import EncryptionRotation
+
+
+class EncryptionRotationRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_or_create(self, key_id: str) -> EncryptionRotation:
+        checkpoint = self.get(key_id)
+        if checkpoint:
+            return checkpoint
+        checkpoint = EncryptionRotation(key_id=key_id)
+        self.session.add(checkpoint)
+        self.session.commit()
+        self.session.refresh(checkpoint)
+        return checkpoint
+
+    def get(self, key_id: str) -> Optional[EncryptionRotation]:
+        statement = select(EncryptionRotation).where(EncryptionRotation.key_id == key_id)
+        return self.session.exec(statement).first()
+
+    def save(self, checkpoint: EncryptionRotation):
+        """Stages the checkpoint WITHOUT committing: it rides the batch's transaction."""
+        self.session.add(checkpoint)
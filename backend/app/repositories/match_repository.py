@@ -1,8 +1,12 @@
-from typing import List
+from typing import Iterator, List, Sequence, Tuple
 from datetime import datetime, timezone
 from sqlmodel import Session, select
-from app.models import Match, Participation
+from app.models import (
+    Match, MatchArchive, Member, Participation, ParticipationArchive, ParticipationEventSummary,
+    ParticipationStatus,
+)
 from typing import Optional
+from sqlalchemy import and_, case, delete, func, or_, union_all, update
 from sqlalchemy.orm import selectinload
 from app.models import MatchStatus
 
@@ -17,6 +21,23 @@ class MatchRepository:
         self.session.refresh(match)
         return match
 
+    def create_many(self, matches: List[Match]) -> int:
+        """Bulk insert (one batched INSERT), single commit."""
+        self.session.add_all(matches)
+        self.session.commit()
+        return len(matches)
+
+    def get_start_times(
+        self, club_id: int, name: str, start: datetime, end: datetime
+    ) -> List[datetime]:
+        statement = select(Match.start_time).where(
+            Match.club_id == club_id,
+            Match.name == name,
+            Match.start_time >= start,
+            Match.start_time <= end,
+        )
+        return self.session.exec(statement).all()
+
     def get_upcoming_matches(self, club_id: int) -> List[Match]:
         statement = (
             select(Match)
@@ -31,6 +52,181 @@ class MatchRepository:
         )
         return self.session.exec(statement).all()
 
+    def _calendar_statement(
+        self,
+        club_id: int,
+        start: datetime,
+        end: datetime,
+        statuses: Optional[List[MatchStatus]],
+        columns: List[str],
+    ):
+        """
+        Matches starting in [start, end), ordered. Ranges reaching into the past
+        also read the archive (closed seasons), so callers never see the split.
+        """
+        def branch(model):
+            statement = (
+                select(*(getattr(model, name) for name in columns))
+                .where(model.club_id == club_id)
+                .where(model.start_time >= start, model.start_time < end)
+            )
+            if statuses:
+                statement = statement.where(model.status.in_(statuses))
+            return statement
+
+        if start >= datetime.now(timezone.utc):
+            return branch(Match).order_by(Match.start_time, Match.id)
+
+        both = union_all(branch(Match), branch(MatchArchive)).subquery()
+        return select(*both.c).order_by(both.c.start_time, both.c.id)
+
+    def get_calendar(
+        self,
+        club_id: int,
+        start: datetime,
+        end: datetime,
+        statuses: Optional[List[MatchStatus]] = None,
+    ) -> Sequence[tuple]:
+        """Matches starting in [start, end): compact columns only, no relationships."""
+        statement = self._calendar_statement(
+            club_id, start, end, statuses,
+            ["id", "name", "location", "start_time", "end_time", "status"],
+        )
+        return self.session.exec(statement).all()
+
+    def iter_calendar(
+        self,
+        club_id: int,
+        start: datetime,
+        end: datetime,
+        statuses: Optional[List[MatchStatus]] = None,
+        batch_size: int = 200,
+    ) -> Iterator[tuple]:
+        """Same range as `get_calendar`, fetched in batches for streaming (.ics feed)."""
+        statement = self._calendar_statement(
+            club_id, start, end, statuses,
+            ["id", "name", "description", "location", "start_time", "end_time", "status", "updated_at"],
+        ).execution_options(yield_per=batch_size)
+        yield from self.session.exec(statement)
+
+    def get_intervals(
+        self, club_id: int, locations: List[str], start: datetime, end: datetime
+    ) -> Sequence[tuple]:
+        """
+        Non-cancelled matches overlapping [start, end) that belong to the club OR
+        use one of the (normalized) locations. Feeds the conflict interval trees.
+        """
+        location_key = func.lower(func.trim(Match.location))
+        statement = (
+            select(Match.id, Match.club_id, Match.name, Match.location, Match.start_time, Match.end_time)
+            .where(Match.start_time < end, Match.end_time > start)
+            .where(Match.status != MatchStatus.CANCELLED)
+            .where(or_(Match.club_id == club_id, location_key.in_(locations)))
+        )
+        return self.session.exec(statement).all()
+
+    def get_archived(self, match_id: int) -> Optional[MatchArchive]:
+        return self.session.get(MatchArchive, match_id)
+
+    def get_archived_roster(self, match_id: int) -> Sequence[tuple]:
+        """(ParticipationArchive, Member id, name, picture_url) rows of an archived match."""
+        statement = (
+            select(ParticipationArchive, Member.id, Member.name, Member.picture_url)
+            .join(Member, Member.id == ParticipationArchive.member_id)
+            .where(ParticipationArchive.match_id == match_id)
+            .order_by(ParticipationArchive.id)
+        )
+        return self.session.exec(statement).all()
+
+    def get_club_change_marker(self, club_id: int) -> Tuple:
+        """
+        Cheap "did anything change?" probe for conditional GETs. Aggregates only, and
+        over UPCOMING matches only (all the listings show), so the cost follows the
+        upcoming rosters, not the club's history: (upcoming count, newest match update,
+        participation count, newest participation update, newest member update).
+        Counts catch deletes and matches slipping into the past; the member update
+        catches renames / new pictures embedded in the rosters.
+        """
+        statement = (
+            select(
+                func.count(func.distinct(Match.id)),
+                func.max(Match.updated_at),
+                func.count(Participation.id),
+                func.max(Participation.updated_at),
+                func.max(Member.updated_at),
+            )
+            .select_from(Match)
+            .outerjoin(Participation, Participation.match_id == Match.id)
+            .outerjoin(Member, Member.id == Participation.member_id)
+            .where(Match.club_id == club_id, Match.start_time >= datetime.now(timezone.utc))
+        )
+        return tuple(self.session.exec(statement).one())
+
+    def get_upcoming_summaries(
+        self,
+        club_id: int,
+        member_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> Sequence[tuple]:
+        """
+        Upcoming matches WITHOUT rosters: one grouped query returns each match's
+        vote counts plus the caller's own vote. Keyset-paged on (start_time, id).
+        """
+        def tally(status: ParticipationStatus):
+            return func.sum(case((Participation.status == status, 1), else_=0)).label(
+                status.value.lower()
+            )
+
+        statement = (
+            select(
+                Match.id,
+                Match.name,
+                Match.location,
+                Match.start_time,
+                Match.end_time,
+                Match.status,
+                Match.min_participants,
+                Match.max_participants,
+                Match.polling_start_at,
+                Match.soft_deadline_at,
+                Match.hard_deadline_at,
+                tally(ParticipationStatus.ATTENDING),
+                tally(ParticipationStatus.ABSENT),
+                tally(ParticipationStatus.PENDING),
+                tally(ParticipationStatus.WAITLISTED),
+                func.max(
+                    case((Participation.member_id == member_id, Participation.status))
+                ).label("my_status"),
+            )
+            .outerjoin(Participation, Participation.match_id == Match.id)
+            .where(Match.club_id == club_id)
+            .where(Match.start_time >= datetime.now(timezone.utc))
+            .group_by(Match.id)
+            .order_by(Match.start_time, Match.id)
+            .limit(limit)
+        )
+        if after:
+            start_time, match_id = after
+            statement = statement.where(
+                or_(
+                    Match.start_time > start_time,
+                    and_(Match.start_time == start_time, Match.id > match_id),
+                )
+            )
+        return self.session.exec(statement).all()
+
+    def get_with_roster(self, match_id: int) -> Optional[Match]:
+        """One match with its full roster (participations + members)."""
+        statement = (
+            select(Match)
+            .where(Match.id == match_id)
+            .options(
+                selectinload(Match.participations).selectinload(Participation.member)
+            )
+        )
+        return self.session.exec(statement).first()
+
     def get_active_matches(self) -> List[Match]:
         statement = select(Match).where(Match.status == MatchStatus.RECRUITING)
         return self.session.exec(statement).all()
@@ -44,6 +240,124 @@ class MatchRepository:
         self.session.refresh(match)
         return match
 
+    def stage(self, matches: List[Match]):
+        """Adds + flushes WITHOUT committing (caller owns the transaction)."""
+        self.session.add_all(matches)
+        self.session.flush()
+
+    def update_many(self, matches: List[Match]) -> int:
+        """Persists a batch of edited matches in ONE commit (all or nothing)."""
+        self.session.add_all(matches)
+        self.session.commit()
+        return len(matches)
+
+    def get_future_by_template(
+        self, template_id: int, statuses: Optional[List[MatchStatus]] = None
+    ) -> List[Match]:
+        """Not-yet-played matches generated from a template (bulk edits, syncs)."""
+        statuses = statuses or [MatchStatus.RECRUITING, MatchStatus.CLOSED]
+        statement = (
+            select(Match)
+            .where(Match.template_id == template_id)
+            .where(Match.start_time >= datetime.now(timezone.utc))
+            .where(Match.status.in_(statuses))
+            .order_by(Match.start_time)
+        )
+        return self.session.exec(statement).all()
+
+    def bulk_update(self, rows: List[dict]) -> int:
+        """
+        ONE executemany `UPDATE match SET ... WHERE id = ?` for all rows (no commit).
+        Every row must carry the same keys, including "id".
+        """
+        if not rows:
+            return 0
+        now = datetime.now(timezone.utc)
+        self.session.exec(update(Match), params=[{**row, "updated_at": now} for row in rows])
+        return len(rows)
+
+    def sync_participation_start_times_for(self, match_ids: List[int]):
+        """Bulk version of `sync_participation_start_times`: one correlated UPDATE (no commit)."""
+        if not match_ids:
+            return
+        self.session.exec(
+            update(Participation)
+            .where(Participation.match_id.in_(match_ids))
+            .values(
+                match_start_time=select(Match.start_time)
+                .where(Match.id == Participation.match_id)
+                .scalar_subquery()
+            )
+        )
+
+    def commit(self):
+        self.session.commit()
+
+    def sync_participation_start_times(self, match_id: int, start_time: datetime):
+        """Re-copies a moved start_time onto Participation.match_start_time (no commit)."""
+        self.session.exec(
+            update(Participation)
+            .where(Participation.match_id == match_id)
+            .values(match_start_time=start_time)
+        )
+
+    def try_claim_seat(self, match_id: int) -> bool:
+        """
+        Atomically takes one seat if the match isn't full (no commit).
+        A single conditional UPDATE: concurrent voters serialize on the match ROW,
+        and the count can never exceed max_participants.
+        """
+        result = self.session.exec(
+            update(Match)
+            .where(Match.id == match_id, Match.attending_count < Match.max_participants)
+            .values(attending_count=Match.attending_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def force_claim_seat(self, match_id: int):
+        """Takes a seat even if full (Admin Override may overbook). No commit."""
+        self.session.exec(
+            update(Match)
+            .where(Match.id == match_id)
+            .values(attending_count=Match.attending_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def release_seat(self, match_id: int):
+        """Gives one seat back (no commit)."""
+        self.session.exec(
+            update(Match)
+            .where(Match.id == match_id, Match.attending_count > 0)
+            .values(attending_count=Match.attending_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def recount_attending(self) -> int:
+        """Resets every counter from the ATTENDING rows (repair / first deploy)."""
+        attending = (
+            select(func.count(Participation.id))
+            .where(
+                Participation.match_id == Match.id,
+                Participation.status == ParticipationStatus.ATTENDING,
+            )
+            .scalar_subquery()
+        )
+        result = self.session.exec(
+            update(Match)
+            .values(attending_count=attending)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount
+
     def delete(self, match: Match):
-        self.session.delete(match)
+        """
+        One DELETE: participations, notifications and vote events go via ON DELETE CASCADE.
+        Vote summaries have no FK to match (they outlive archival), so they go explicitly.
+        """
+        self.session.exec(
+            delete(ParticipationEventSummary).where(ParticipationEventSummary.match_id == match.id)
+        )
+        self.session.exec(delete(Match).where(Match.id == match.id))
         self.session.commit()
@@ -17,4 +17,10 @@ class MatchTemplateRepository:
 
     def get_by_club(self, club_id: int) -> List[MatchTemplate]:
         statement = select(MatchTemplate).where(MatchTemplate.club_id == club_id)
-        return self.session.exec(statement).all()
\ No newline at end of file
+        return self.session.exec(statement).all()
+
+    def update(self, template: MatchTemplate) -> MatchTemplate:
+        self.session.add(template)
+        self.session.commit()
+        self.session.refresh(template)
+        return template
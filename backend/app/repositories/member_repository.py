@@ -1,6 +1,18 @@
 from sqlmodel import Session, select
-from typing import Optional, List
-from app.models import Member
+from typing import Dict, Iterable, Optional, List, Set, Tuple
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, update
+from app.models import (
+    Match, Member, MemberStatus, Participation, ParticipationEventSummary, ParticipationStatus,
+    PlayerPosition, Role, POSITION_BITS, ROLE_BITS, to_mask,
+)
+
+def has_any_role(*roles: Role):
+    """SQL: role_mask & bits != 0."""
+    return Member.role_mask.bitwise_and(to_mask(roles, ROLE_BITS)) != 0
+
+def has_any_position(*positions: PlayerPosition):
+    """SQL: position_mask & bits != 0."""
+    return Member.position_mask.bitwise_and(to_mask(positions, POSITION_BITS)) != 0
 
 class MemberRepository:
     def __init__(self, session: Session):
@@ -19,6 +31,23 @@ class MemberRepository:
         statement = select(Member).where(Member.kakao_id == kakao_id)
         return self.session.exec(statement).first()
 
+    def get_existing_kakao_ids(self, kakao_ids: Iterable[str]) -> Set[str]:
+        """One IN query (unique index on kakao_id) for a whole chunk of candidates."""
+        statement = select(Member.kakao_id).where(Member.kakao_id.in_(list(kakao_ids)))
+        return set(self.session.exec(statement).all())
+
+    def insert_many(self, rows: List[dict]) -> Dict[str, int]:
+        """
+        Multi-row INSERT ... RETURNING (no commit). Core insert: no mapper events,
+        so rows must already carry name_search / role_mask / position_mask.
+        Returns {kakao_id: new id}.
+        """
+        if not rows:
+            return {}
+        table = Member.__table__
+        statement = insert(table).returning(table.c.kakao_id, table.c.id)
+        return dict(self.session.connection().execute(statement, rows).all())
+
     def get_all(self) -> List[Member]:
         return self.session.exec(select(Member)).all()
 
@@ -26,12 +55,184 @@ class MemberRepository:
         statement = select(Member).where(Member.club_id == club_id)
         return self.session.exec(statement).all()
 
+    def get_directory(
+        self,
+        club_id: int,
+        limit: int,
+        status: Optional[MemberStatus] = None,
+        role: Optional[Role] = None,
+        position: Optional[PlayerPosition] = None,
+        born_after: Optional[int] = None,
+        born_in_or_before: Optional[int] = None,
+        name_prefix: Optional[str] = None,
+        after: Optional[Tuple[str, int]] = None,
+    ) -> List[Member]:
+        """
+        One club's members ordered by (name_search, id), keyset paged.
+        (club_id, status) and (club_id, name_search, id) are indexed, so a page
+        costs the same however many members other clubs have.
+        """
+        statement = select(Member).where(Member.club_id == club_id)
+        if status:
+            statement = statement.where(Member.status == status)
+        if name_prefix:
+            statement = statement.where(Member.name_search.startswith(name_prefix.lower(), autoescape=True))
+        if role:
+            statement = statement.where(has_any_role(role))
+        if position:
+            statement = statement.where(has_any_position(position))
+        if born_after is not None:
+            statement = statement.where(Member.birth_year > born_after)
+        if born_in_or_before is not None:
+            statement = statement.where(Member.birth_year <= born_in_or_before)
+        if after:
+            name_search, member_id = after
+            statement = statement.where(
+                or_(
+                    Member.name_search > name_search,
+                    and_(Member.name_search == name_search, Member.id > member_id),
+                )
+            )
+
+        statement = statement.order_by(Member.name_search, Member.id).limit(limit)
+        return self.session.exec(statement).all()
+
+    def get_by_role(self, club_id: int, *roles: Role) -> List[Member]:
+        """Members of a club holding ANY of `roles` (e.g. every ANNOUNCER)."""
+        statement = (
+            select(Member)
+            .where(Member.club_id == club_id, has_any_role(*roles))
+            .order_by(Member.name_search, Member.id)
+        )
+        return self.session.exec(statement).all()
+
+    def get_by_position(self, club_id: int, *positions: PlayerPosition) -> List[Member]:
+        """Members of a club who play ANY of `positions`."""
+        statement = (
+            select(Member)
+            .where(Member.club_id == club_id, has_any_position(*positions))
+            .order_by(Member.name_search, Member.id)
+        )
+        return self.session.exec(statement).all()
+
+    def backfill_masks(self, batch_size: int = 1000) -> int:
+        """
+        Recomputes name_search / role_mask / position_mask from the JSON columns
+        (rows written before those columns existed). Keyset batches of executemany
+        UPDATEs, one commit each. Returns how many rows changed.
+        """
+        table = Member.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("member_id"))
+            .values(
+                name_search=bindparam("name_search"),
+                role_mask=bindparam("role_mask"),
+                position_mask=bindparam("position_mask"),
+            )
+        )
+        changed, after_id = 0, 0
+        while True:
+            rows = self.session.exec(
+                select(Member.id, Member.name, Member.roles, Member.positions,
+                       Member.name_search, Member.role_mask, Member.position_mask)
+                .where(Member.id > after_id)
+                .order_by(Member.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return changed
+
+            updates = []
+            for row in rows:
+                fresh = {
+                    "name_search": (row.name or "").lower(),
+                    "role_mask": to_mask(row.roles, ROLE_BITS),
+                    "position_mask": to_mask(row.positions, POSITION_BITS),
+                }
+                if fresh != {key: getattr(row, key) for key in fresh}:
+                    updates.append({"member_id": row.id, **fresh})
+            if updates:
+                self.session.connection().execute(statement, updates)
+            self.session.commit()
+
+            changed += len(updates)
+            after_id = rows[-1].id
+
+    def get_contacts_by_club_id(self, club_id: int) -> List[Tuple[int, str, Optional[int], Optional[str]]]:
+        """(id, name, back_number, encrypted_phone) only: no full rows for a phone book."""
+        statement = (
+            select(Member.id, Member.name, Member.back_number, Member.encrypted_phone)
+            .where(Member.club_id == club_id)
+            .order_by(Member.name, Member.id)
+        )
+        return self.session.exec(statement).all()
+
+    def count_with_phone(self, after_id: int = 0) -> int:
+        statement = select(func.count(Member.id)).where(
+            Member.id > after_id, Member.encrypted_phone.is_not(None)
+        )
+        return self.session.exec(statement).one()
+
+    def get_phone_batch(self, after_id: int, limit: int) -> List[Tuple[int, str]]:
+        """Keyset page of (id, encrypted_phone): a PK range scan, no OFFSET."""
+        statement = (
+            select(Member.id, Member.encrypted_phone)
+            .where(Member.id > after_id, Member.encrypted_phone.is_not(None))
+            .order_by(Member.id)
+            .limit(limit)
+        )
+        return self.session.exec(statement).all()
+
+    def replace_phones(self, rows: List[dict]) -> int:
+        """
+        Compare-and-swap of encrypted_phone (executemany, no commit).
+        rows: {"member_id", "old", "new"}. A row edited since it was read keeps
+        its newer value. Returns how many rows were swapped.
+        """
+        if not rows:
+            return 0
+        table = Member.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("member_id"), table.c.encrypted_phone == bindparam("old"))
+            .values(encrypted_phone=bindparam("new"))
+        )
+        return self.session.connection().execute(statement, rows).rowcount
+
     def update(self, member: Member) -> Member:
         self.session.add(member)
         self.session.commit()
         self.session.refresh(member)
         return member
 
-    def delete(self, member: Member):
-        self.session.delete(member)
+    def delete(self, member: Member) -> List[Tuple[int, int]]:
+        """
+        Memberships, votes, events and stats go via ON DELETE CASCADE; vote summaries
+        are removed explicitly. The seats the member held are released first so
+        Match.attending_count stays true. No commit: returns the (match_id, season_id)
+        of every freed seat so the caller can hand it to the waitlist first.
+        """
+        freed = self.session.exec(
+            select(Match.id, Match.season_id)
+            .join(Participation, Participation.match_id == Match.id)
+            .where(
+                Participation.member_id == member.id,
+                Participation.status == ParticipationStatus.ATTENDING,
+            )
+        ).all()
+        if freed:
+            self.session.exec(
+                update(Match)
+                .where(Match.id.in_([match_id for match_id, _ in freed]))
+                .values(attending_count=Match.attending_count - 1)
+                .execution_options(synchronize_session=False)
+            )
+        self.session.exec(
+            delete(ParticipationEventSummary).where(ParticipationEventSummary.member_id == member.id)
+        )
+        self.session.exec(delete(Member).where(Member.id == member.id))
+        return [tuple(row) for row in freed]
+
+    def commit(self):
         self.session.commit()
\ No newline at end of file
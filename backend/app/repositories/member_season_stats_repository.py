@@ -0,0 +1,258 @@
+from datetime import datetime, UTC
+from typing import Dict, List, Optional
+import sqlalchemy as sa
+from sqlalchemy import and_, case, delete, exists, func, literal, update
+from sqlmodel import Session, select
+from app.repositories.dialects import insert_for, greatest_for
+from app.models import (
+    MemberSeasonStats,
+    Participation,
+    ParticipationStatus,
+    Match,
+    MatchStatus,
+    Membership,
+    MembershipStatus,
+    Season,
+)
+
+# Which counter column a vote status is tallied in
+STATUS_COUNTERS = {
+    ParticipationStatus.ATTENDING: "attended",
+    ParticipationStatus.ABSENT: "absent",
+    ParticipationStatus.PENDING: "pending",
+}
+
+STATS_COLUMNS = [
+    "member_id", "season_id", "attended", "absent", "pending", "ghosted",
+    "last_attended_at", "created_at", "updated_at",
+]
+
+
+class MemberSeasonStatsRepository:
+    """
+    All writes here are single atomic statements (UPSERT / UPDATE ... SET x = x + 1)
+    and do NOT commit: they ride along in the caller's transaction (vote, match update).
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get(self, member_id: int, season_id: int) -> Optional[MemberSeasonStats]:
+        statement = select(MemberSeasonStats).where(
+            MemberSeasonStats.member_id == member_id,
+            MemberSeasonStats.season_id == season_id,
+        )
+        return self.session.exec(statement).first()
+
+    def get_leaderboard(self, season_id: int, limit: int) -> List[MemberSeasonStats]:
+        statement = (
+            select(MemberSeasonStats)
+            .where(MemberSeasonStats.season_id == season_id)
+            .order_by(MemberSeasonStats.attended.desc(), MemberSeasonStats.member_id)
+            .limit(limit)
+        )
+        return self.session.exec(statement).all()
+
+    def apply_vote(
+        self,
+        member_id: int,
+        season_id: int,
+        old_status: Optional[ParticipationStatus],
+        new_status: ParticipationStatus,
+    ):
+        """Moves one vote from the old bucket to the new one."""
+        if old_status == new_status:
+            return
+
+        deltas: Dict[str, int] = {}
+        if old_status in STATUS_COUNTERS:
+            deltas[STATUS_COUNTERS[old_status]] = -1
+        if new_status in STATUS_COUNTERS:
+            deltas[STATUS_COUNTERS[new_status]] = 1
+        if deltas:
+            self._increment(member_id, season_id, deltas)
+
+    def apply_match_finished(self, match_id: int, season_id: int, start_time: datetime):
+        """
+        Finalizes one FINISHED match in two bulk statements:
+        1. ghosted + 1 for every ACTIVE season member who never voted.
+        2. last_attended_at bumped for everyone who was ATTENDING.
+        """
+        now = datetime.now(UTC)
+        table = MemberSeasonStats.__table__
+
+        ghosts = (
+            sa.select(
+                Membership.member_id,
+                literal(season_id),
+                literal(0), literal(0), literal(0), literal(1),
+                sa.null(),
+                literal(now, sa.DateTime(timezone=True)),
+                literal(now, sa.DateTime(timezone=True)),
+            )
+            .where(
+                Membership.season_id == season_id,
+                Membership.status == MembershipStatus.ACTIVE,
+                ~exists().where(
+                    Participation.match_id == match_id,
+                    Participation.member_id == Membership.member_id,
+                ),
+            )
+            .distinct()
+        )
+        statement = insert_for(self.session)(table).from_select(STATS_COLUMNS, ghosts)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.member_id, table.c.season_id],
+            set_={"ghosted": table.c.ghosted + 1, "updated_at": now},
+        )
+        self.session.exec(statement)
+
+        attendees = select(Participation.member_id).where(
+            Participation.match_id == match_id,
+            Participation.status == ParticipationStatus.ATTENDING,
+        )
+        self.session.exec(
+            update(table)
+            .where(table.c.season_id == season_id, table.c.member_id.in_(attendees))
+            .values(
+                last_attended_at=greatest_for(
+                    self.session,
+                    func.coalesce(table.c.last_attended_at, start_time), start_time
+                ),
+                updated_at=now,
+            )
+        )
+
+    def rebuild(self, season_id: Optional[int] = None) -> int:
+        """
+        Recomputes stats from scratch (all seasons, or one) with bulk INSERT ... SELECT.
+        Use after data fixes or when the incremental counters are suspected to drift.
+        Archived seasons are frozen: their rows are final and never recomputed.
+        """
+        self.recompute(season_id)
+        self.session.commit()
+
+        count = select(func.count()).select_from(MemberSeasonStats)
+        if season_id is not None:
+            count = count.where(MemberSeasonStats.season_id == season_id)
+        return self.session.exec(count).one()
+
+    def recompute(self, season_id: Optional[int] = None):
+        """
+        The body of rebuild, without the commit: also used when a FINISHED match is
+        reopened, since what finishing it added can no longer be derived reliably
+        (votes and memberships may have changed since).
+        """
+        now = datetime.now(UTC)
+        table = MemberSeasonStats.__table__
+        timestamp = literal(now, sa.DateTime(timezone=True))
+        archived = select(Season.id).where(Season.archived_at.is_not(None))
+
+        deleted = delete(table).where(table.c.season_id.not_in(archived))
+        if season_id is not None:
+            deleted = deleted.where(table.c.season_id == season_id)
+        self.session.exec(deleted)
+
+        def tally(status: ParticipationStatus):
+            return func.sum(case((Participation.status == status, 1), else_=0))
+
+        # 1. Vote counters + last attended (only FINISHED matches count as "attended at")
+        votes = (
+            sa.select(
+                Participation.member_id,
+                Match.season_id,
+                tally(ParticipationStatus.ATTENDING),
+                tally(ParticipationStatus.ABSENT),
+                tally(ParticipationStatus.PENDING),
+                literal(0),
+                func.max(
+                    case(
+                        (
+                            and_(
+                                Participation.status == ParticipationStatus.ATTENDING,
+                                Match.status == MatchStatus.FINISHED,
+                            ),
+                            Match.start_time,
+                        )
+                    )
+                ),
+                timestamp,
+                timestamp,
+            )
+            .join(Match, Match.id == Participation.match_id)
+            .where(sa.true() if season_id is None else Match.season_id == season_id)
+            .where(Match.season_id.not_in(archived))
+            .group_by(Participation.member_id, Match.season_id)
+        )
+        self.session.exec(insert_for(self.session)(table).from_select(STATS_COLUMNS, votes))
+
+        # 2. Ghosts: FINISHED matches an ACTIVE member never voted on
+        ghosts = (
+            sa.select(
+                Membership.member_id,
+                Match.season_id,
+                literal(0), literal(0), literal(0),
+                func.count(func.distinct(Match.id)),
+                sa.null(),
+                timestamp,
+                timestamp,
+            )
+            .join(
+                Match,
+                and_(
+                    Match.season_id == Membership.season_id,
+                    Match.status == MatchStatus.FINISHED,
+                ),
+            )
+            .where(
+                Membership.status == MembershipStatus.ACTIVE,
+                sa.true() if season_id is None else Membership.season_id == season_id,
+                Membership.season_id.not_in(archived),
+                ~exists().where(
+                    Participation.match_id == Match.id,
+                    Participation.member_id == Membership.member_id,
+                ),
+            )
+            .group_by(Membership.member_id, Match.season_id)
+        )
+        statement = insert_for(self.session)(table).from_select(STATS_COLUMNS, ghosts)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.member_id, table.c.season_id],
+            set_={"ghosted": statement.excluded.ghosted},
+        )
+        self.session.exec(statement)
+
+        # 3. Every FINISHED match is now counted exactly once: mark it so
+        finalized = (
+            update(Match)
+            .where(Match.season_id.not_in(archived))
+            .values(stats_finalized=Match.status == MatchStatus.FINISHED)
+            .execution_options(synchronize_session=False)
+        )
+        if season_id is not None:
+            finalized = finalized.where(Match.season_id == season_id)
+        self.session.exec(finalized)
+
+    def _increment(self, member_id: int, season_id: int, deltas: Dict[str, int]):
+        """Atomic UPSERT: creates the row on first vote, otherwise `col = col + delta`."""
+        now = datetime.now(UTC)
+        table = MemberSeasonStats.__table__
+
+        initial = {col: 0 for col in ("attended", "absent", "pending", "ghosted")}
+        initial.update({col: max(delta, 0) for col, delta in deltas.items()})
+
+        statement = insert_for(self.session)(table).values(
+            member_id=member_id,
+            season_id=season_id,
+            created_at=now,
+            updated_at=now,
+            **initial,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.member_id, table.c.season_id],
+            set_={
+                **{col: table.c[col] + delta for col, delta in deltas.items()},
+                "updated_at": now,
+            },
+        )
+        self.session.exec(statement)
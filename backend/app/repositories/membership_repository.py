@@ -1,7 +1,10 @@
+from datetime import datetime, UTC
 from sqlmodel import Session, select
-from typing import List, Optional
-from app.models import Membership, MembershipStatus
-from sqlalchemy.orm import joinedload
+from typing import Dict, List, Optional
+import sqlalchemy as sa
+from sqlalchemy import case, exists, func, literal, or_, update
+from app.models import Membership, MembershipStatus, MembershipType
+from sqlalchemy.orm import aliased, joinedload
 
 class MembershipRepository:
     def __init__(self, session: Session):
@@ -16,13 +19,38 @@ class MembershipRepository:
     def get_by_id(self, membership_id: int) -> Optional[Membership]:
         return self.session.get(Membership, membership_id)
 
-    def has_active_membership(self, member_id: int, season_id: int) -> bool:
-        statement = select(Membership).where(
-            Membership.member_id == member_id,
-            Membership.season_id == season_id,
-            Membership.status == MembershipStatus.ACTIVE
+    def has_active_membership(
+        self, member_id: int, season_id: int, at: Optional[datetime] = None
+    ) -> bool:
+        """
+        ACTIVE and not past expires_at (NULL = open-ended). An EXISTS on columns of
+        ix_membership_gatekeeper only, so it is answered from the index.
+        """
+        at = at or datetime.now(UTC)
+        statement = select(
+            exists().where(
+                Membership.season_id == season_id,
+                Membership.member_id == member_id,
+                Membership.status == MembershipStatus.ACTIVE,
+                or_(Membership.expires_at.is_(None), Membership.expires_at > at),
+            )
         )
-        return self.session.exec(statement).first() is not None
+        return self.session.exec(statement).one()
+
+    def expire_overdue(self, at: Optional[datetime] = None) -> int:
+        """One bulk UPDATE: ACTIVE memberships past expires_at become EXPIRED."""
+        statement = (
+            update(Membership)
+            .where(
+                Membership.status == MembershipStatus.ACTIVE,
+                Membership.expires_at <= (at or datetime.now(UTC)),
+            )
+            .values(status=MembershipStatus.EXPIRED)
+            .execution_options(synchronize_session=False)
+        )
+        expired = self.session.exec(statement).rowcount
+        self.session.commit()
+        return expired
 
     def get_all(self) -> List[Membership]:
         return self.session.exec(select(Membership)).all()
@@ -36,6 +64,92 @@ class MembershipRepository:
         
         return self.session.exec(statement).all()
 
+    def _renewable(self, source_season_id: int, source_ended_at: datetime, types: List[MembershipType]):
+        """
+        Still ACTIVE, or EXPIRED only because its expires_at came (the sweeper flips
+        REGULAR rows at season end). Rows expired by hand have no such expiry.
+        """
+        return (
+            Membership.season_id == source_season_id,
+            Membership.type.in_(types),
+            or_(
+                Membership.status == MembershipStatus.ACTIVE,
+                sa.and_(
+                    Membership.status == MembershipStatus.EXPIRED,
+                    Membership.expires_at <= source_ended_at,
+                ),
+            ),
+        )
+
+    def renew_into_season(
+        self,
+        source_season_id: int,
+        source_ended_at: datetime,
+        target_season_id: int,
+        target_club_id: int,
+        expires_at: Dict[MembershipType, datetime],
+        types: List[MembershipType],
+        now: datetime,
+    ) -> int:
+        """
+        One INSERT ... SELECT: every renewable member of the source season gets an ACTIVE
+        membership of the same type in the target season. expires_at comes from a
+        CASE over the type. Members already in the target season are skipped.
+        No commit (the caller owns the transaction). Returns rows inserted.
+        """
+        table = Membership.__table__
+        existing = aliased(Membership)
+        # A member with several renewable rows in the source season is renewed once (latest row)
+        latest_ids = (
+            select(func.max(Membership.id))
+            .where(*self._renewable(source_season_id, source_ended_at, types))
+            .group_by(Membership.member_id)
+        )
+        at = literal(now, sa.DateTime(timezone=True))
+        rows = sa.select(
+            table.c.member_id,
+            literal(target_club_id),
+            literal(target_season_id),
+            table.c.type,
+            literal(MembershipStatus.ACTIVE, table.c.status.type),
+            at,
+            case(
+                *[(table.c.type == type, literal(value, sa.DateTime(timezone=True)))
+                  for type, value in expires_at.items()],
+                else_=None,
+            ),
+            at,
+            at,
+        ).where(
+            table.c.id.in_(latest_ids),
+            ~exists().where(
+                existing.member_id == table.c.member_id,
+                existing.season_id == target_season_id,
+            ),
+        )
+        result = self.session.exec(
+            sa.insert(table).from_select(
+                ["member_id", "club_id", "season_id", "type", "status",
+                 "joined_at", "expires_at", "created_at", "updated_at"],
+                rows,
+            )
+        )
+        return result.rowcount
+
+    def insert_many(self, rows: List[dict]) -> int:
+        """Multi-row INSERT (no commit)."""
+        if rows:
+            self.session.connection().execute(sa.insert(Membership.__table__), rows)
+        return len(rows)
+
+    def count_renewable_in_season(
+        self, season_id: int, ended_at: datetime, types: List[MembershipType]
+    ) -> int:
+        statement = select(func.count(func.distinct(Membership.member_id))).where(
+            *self._renewable(season_id, ended_at, types)
+        )
+        return self.session.exec(statement).one()
+
     def update(self, membership: Membership) -> Membership:
         self.session.add(membership)
         self.session.commit()
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from sqlalchemy import delete
 from sqlmodel import Session, select
 from app.models import Notification, NotificationStatus, NotificationType
 
@@ -28,4 +29,21 @@ class NotificationRepository:
         self.session.add(notification)
         self.session.commit()
         self.session.refresh(notification)
-        return notification
\ No newline at end of file
+        return notification
+
+    def retract_pending(self, match_ids: Iterable[int], notification_type: NotificationType) -> int:
+        """
+        Deletes not-yet-sent notifications of one type (no commit).
+        Sent / published ones are history and stay.
+        """
+        match_ids = list(match_ids)
+        if not match_ids:
+            return 0
+        result = self.session.exec(
+            delete(Notification).where(
+                Notification.match_id.in_(match_ids),
+                Notification.type == notification_type,
+                Notification.status == NotificationStatus.PENDING,
+            )
+        )
+        return result.rowcount
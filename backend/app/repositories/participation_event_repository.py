@@ -0,0 +1,126 @@
+from datetime import datetime
+from typing import List, Sequence
+import sqlalchemy as sa
+from sqlalchemy import delete, exists, func
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+from app.models import (
+    ParticipationEvent,
+    ParticipationEventSummary,
+    ParticipationStatus,
+    PARTICIPATION_STATUS_CODES,
+    Match,
+    MatchStatus,
+)
+from app.repositories.dialects import insert_for
+
+
+class ParticipationEventRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def append(
+        self, match_id: int, member_id: int, status: ParticipationStatus, at: datetime
+    ) -> ParticipationEvent:
+        """Adds one event to the log WITHOUT committing (it rides the vote's transaction)."""
+        event = ParticipationEvent(
+            match_id=match_id,
+            member_id=member_id,
+            status_code=PARTICIPATION_STATUS_CODES[status],
+            created_at=at,
+        )
+        self.session.add(event)
+        return event
+
+    def get_latest_events_as_of(self, match_id: int, as_of: datetime) -> Sequence[ParticipationEvent]:
+        """Each member's most recent event at or before `as_of` (ids grow with time)."""
+        latest_ids = (
+            select(func.max(ParticipationEvent.id))
+            .where(
+                ParticipationEvent.match_id == match_id,
+                ParticipationEvent.created_at <= as_of,
+            )
+            .group_by(ParticipationEvent.member_id)
+        )
+        statement = (
+            select(ParticipationEvent)
+            .where(ParticipationEvent.id.in_(latest_ids))
+            .order_by(ParticipationEvent.member_id)
+        )
+        return self.session.exec(statement).all()
+
+    def get_summaries_as_of(self, match_id: int, as_of: datetime) -> Sequence[ParticipationEventSummary]:
+        statement = (
+            select(ParticipationEventSummary)
+            .where(
+                ParticipationEventSummary.match_id == match_id,
+                ParticipationEventSummary.first_voted_at <= as_of,
+            )
+            .order_by(ParticipationEventSummary.member_id)
+        )
+        return self.session.exec(statement).all()
+
+    def compact_finished(self, finished_before: datetime) -> int:
+        """
+        Folds the raw events of FINISHED matches that ended before `finished_before`
+        into one summary row per (match, member), then deletes the raw events.
+        Returns the number of matches compacted.
+        """
+        match_ids: List[int] = self.session.exec(
+            select(Match.id).where(
+                Match.status == MatchStatus.FINISHED,
+                Match.end_time < finished_before,
+                exists().where(ParticipationEvent.match_id == Match.id),
+            )
+        ).all()
+        if not match_ids:
+            return 0
+
+        self.fold_matches(match_ids)
+        self.session.commit()
+        return len(match_ids)
+
+    def fold_matches(self, match_ids: List[int]):
+        """Summary UPSERT + raw delete for the given matches (no commit)."""
+        table = ParticipationEventSummary.__table__
+        last = aliased(ParticipationEvent)
+        final_status_code = (
+            select(last.status_code)
+            .where(
+                last.match_id == ParticipationEvent.match_id,
+                last.member_id == ParticipationEvent.member_id,
+            )
+            .order_by(last.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        folded = (
+            sa.select(
+                ParticipationEvent.match_id,
+                ParticipationEvent.member_id,
+                final_status_code,
+                func.count(ParticipationEvent.id),
+                func.min(ParticipationEvent.created_at),
+                func.max(ParticipationEvent.created_at),
+            )
+            .where(ParticipationEvent.match_id.in_(match_ids))
+            .group_by(ParticipationEvent.match_id, ParticipationEvent.member_id)
+        )
+        statement = insert_for(self.session)(table).from_select(
+            ["match_id", "member_id", "final_status_code", "change_count",
+             "first_voted_at", "last_changed_at"],
+            folded,
+        )
+        # Late events (e.g. an admin override after an earlier compaction) merge in
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.match_id, table.c.member_id],
+            set_={
+                "final_status_code": statement.excluded.final_status_code,
+                "change_count": table.c.change_count + statement.excluded.change_count,
+                "last_changed_at": statement.excluded.last_changed_at,
+            },
+        )
+        self.session.exec(statement)
+        self.session.exec(
+            delete(ParticipationEvent).where(ParticipationEvent.match_id.in_(match_ids))
+        )
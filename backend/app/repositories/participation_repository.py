@@ -1,7 +1,17 @@
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from sqlalchemy import and_, or_, text, union_all, update
 from sqlmodel import Session, select
-from app.models import Participation
-from typing import Sequence
+from app.models import (
+    Member,
+    PlayerPosition,
+    Participation,
+    ParticipationArchive,
+    ParticipationStatus,
+    Match,
+    MatchArchive,
+)
+from app.repositories.member_repository import has_any_position
 
 
 class ParticipationRepository:
@@ -16,6 +26,31 @@ class ParticipationRepository:
         )
         return self.session.exec(statement).first()
 
+    def get_participation_for_update(
+        self, match_id: int, member_id: int
+    ) -> Optional[Participation]:
+        """
+        The row a vote is about to change, locked until commit and re-read from
+        the database: a concurrent waitlist promotion is either seen or waits.
+        """
+        statement = (
+            select(Participation)
+            .where(Participation.match_id == match_id, Participation.member_id == member_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return self.session.exec(statement).first()
+
+    def release_connection(self):
+        """Ends the current (read-only) transaction so the pooled connection is returned."""
+        self.session.rollback()
+
+    def stage(self, participation: Participation) -> Participation:
+        """Adds + flushes WITHOUT committing (caller owns the transaction)."""
+        self.session.add(participation)
+        self.session.flush()
+        return participation
+
     def upsert_participation(self, participation: Participation) -> Participation:
         self.session.add(participation)
         self.session.commit()
@@ -26,6 +61,106 @@ class ParticipationRepository:
         statement = select(Participation).where(Participation.member_id == member_id)
         return self.session.exec(statement).all()
 
+    def get_history_page(
+        self,
+        member_id: int,
+        limit: int,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> Sequence[tuple]:
+        """
+        One page of a member's history, newest match first.
+        Keyset pagination: `before` is the (match_start_time, id) of the last row seen.
+        Rows carry the participation columns + a match summary (match_name,
+        start_time, location, match_status) from the same query, and span both
+        the hot tables and the archive of closed seasons.
+        """
+        def branch(participation, match):
+            statement = (
+                select(
+                    participation.id,
+                    participation.match_id,
+                    participation.status,
+                    participation.comment,
+                    participation.updated_at,
+                    participation.match_start_time,
+                    match.name.label("match_name"),
+                    match.start_time,
+                    match.location,
+                    match.status.label("match_status"),
+                )
+                .join(match, match.id == participation.match_id)
+                .where(participation.member_id == member_id)
+                .order_by(participation.match_start_time.desc(), participation.id.desc())
+                .limit(limit)
+            )
+            if before:
+                start_time, participation_id = before
+                statement = statement.where(
+                    or_(
+                        participation.match_start_time < start_time,
+                        and_(
+                            participation.match_start_time == start_time,
+                            participation.id < participation_id,
+                        ),
+                    )
+                )
+            # Each side walks its own history index and stops after `limit` rows
+            side = statement.subquery()
+            return select(*side.c)
+
+        both = union_all(
+            branch(Participation, Match), branch(ParticipationArchive, MatchArchive)
+        ).subquery()
+        statement = (
+            select(*both.c)
+            .order_by(both.c.match_start_time.desc(), both.c.id.desc())
+            .limit(limit)
+        )
+        return self.session.exec(statement).all()
+
+    def get_next_waitlisted(self, match_id: int) -> Optional[Participation]:
+        """Longest-waiting member. Rows locked by a concurrent promotion are skipped."""
+        statement = (
+            select(Participation)
+            .where(
+                Participation.match_id == match_id,
+                Participation.status == ParticipationStatus.WAITLISTED,
+            )
+            .order_by(Participation.waitlisted_at, Participation.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return self.session.exec(statement).first()
+
+    def promote_waitlisted(self, participation_id: int) -> bool:
+        """WAITLISTED -> ATTENDING, only if still waitlisted (no commit)."""
+        result = self.session.exec(
+            update(Participation)
+            .where(
+                Participation.id == participation_id,
+                Participation.status == ParticipationStatus.WAITLISTED,
+            )
+            .values(status=ParticipationStatus.ATTENDING, waitlisted_at=None)
+        )
+        return result.rowcount == 1
+
+    def get_attending_members(
+        self, match_id: int, positions: Sequence[PlayerPosition] = ()
+    ) -> Sequence[Member]:
+        """ATTENDING members of a match, optionally only those playing `positions` (bit test in SQL)."""
+        statement = (
+            select(Member)
+            .join(Participation, Participation.member_id == Member.id)
+            .where(
+                Participation.match_id == match_id,
+                Participation.status == ParticipationStatus.ATTENDING,
+            )
+            .order_by(Member.name_search, Member.id)
+        )
+        if positions:
+            statement = statement.where(has_any_position(*positions))
+        return self.session.exec(statement).all()
+
     def get_all_by_match_id(self, match_id: int) -> Sequence[Participation]:
         statement = select(Participation).where(Participation.match_id == match_id)
         return self.session.exec(statement).all()
@@ -42,4 +177,42 @@ class ParticipationRepository:
         self.session.add(participation)
         self.session.commit()
         self.session.refresh(participation)
-        return participation
\ No newline at end of file
+        return participation
+
+    def backfill_match_start_times(self, batch_size: int = 1000) -> int:
+        """
+        Copies Match.start_time onto rows written before match_start_time existed
+        (hot and archive tables), one correlated UPDATE + commit per batch, then
+        makes the column NOT NULL on PostgreSQL. Returns how many rows changed.
+        """
+        changed = 0
+        for participation, match in ((Participation, Match), (ParticipationArchive, MatchArchive)):
+            while True:
+                ids = self.session.exec(
+                    select(participation.id)
+                    .where(participation.match_start_time.is_(None))
+                    .limit(batch_size)
+                ).all()
+                if not ids:
+                    break
+                self.session.exec(
+                    update(participation)
+                    .where(participation.id.in_(ids))
+                    .values(
+                        match_start_time=select(match.start_time)
+                        .where(match.id == participation.match_id)
+                        .scalar_subquery()
+                    )
+                )
+                self.session.commit()
+                changed += len(ids)
+
+            # Tables created before the column was NOT NULL keep accepting NULLs otherwise
+            # (SQLite can't alter a column; fresh SQLite tables are created NOT NULL)
+            if self.session.get_bind().dialect.name == "postgresql":
+                table = participation.__table__.name
+                self.session.exec(
+                    text(f"ALTER TABLE {table} ALTER COLUMN match_start_time SET NOT NULL")
+                )
+                self.session.commit()
+        return changed
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import update
+from sqlmodel import Session, select
+from app.models import RefreshToken
+
+
+class RefreshTokenRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create(self, token: RefreshToken) -> RefreshToken:
+        self.session.add(token)
+        self.session.commit()
+        self.session.refresh(token)
+        return token
+
+    def get_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        statement = select(RefreshToken).where(RefreshToken.token_hash == token_hash)
+        return self.session.exec(statement).first()
+
+    def mark_used(self, token_id: int, at: datetime) -> bool:
+        """
+        Compare-and-swap (no commit): False if the token was already used or
+        revoked, e.g. by a concurrent refresh with the same token.
+        """
+        statement = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == token_id,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(used_at=at)
+        )
+        return self.session.exec(statement).rowcount == 1
+
+    def revoke_family(self, family_id: str, at: datetime) -> int:
+        statement = (
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=at)
+        )
+        revoked = self.session.exec(statement).rowcount
+        self.session.commit()
+        return revoked
+
+    def is_family_revoked(self, family_id: str) -> bool:
+        statement = (
+            select(RefreshToken.id)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_not(None))
+            .limit(1)
+        )
+        return self.session.exec(statement).first() is not None
+
+    def get_revoked_family_ids(self, since: datetime) -> List[str]:
+        """Families revoked after `since` (uses ix_refresh_token_revoked_at)."""
+        statement = (
+            select(RefreshToken.family_id).where(RefreshToken.revoked_at >= since).distinct()
+        )
+        return list(self.session.exec(statement).all())
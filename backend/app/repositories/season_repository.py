@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from datetime import datetime
 from sqlmodel import Session, select
 from app.models import Season
+from app.core.season_index import ClubSeasonIndex, SeasonSpan, season_index
 
 class SeasonRepository:
     def __init__(self, session: Session):
@@ -13,6 +14,12 @@ class SeasonRepository:
         self.session.refresh(season)
         return season
 
+    def update(self, season: Season) -> Season:
+        self.session.add(season)
+        self.session.commit()
+        self.session.refresh(season)
+        return season
+
     def get_by_id(self, season_id: int) -> Optional[Season]:
         return self.session.get(Season, season_id)
 
@@ -32,10 +39,21 @@ class SeasonRepository:
         """
         Finds the season that contains the given date.
         """
-        # Note: We use the date part for comparison to avoid timezone edge cases
-        statement = select(Season).where(
-            Season.club_id == club_id,
-            Season.started_at <= target_date,
-            Season.ended_at >= target_date
+        season_id = self.resolve_season_id(target_date, club_id)
+        return self.get_by_id(season_id) if season_id else None
+
+    def get_index(self, club_id: int) -> ClubSeasonIndex:
+        """The club's cached interval index (built with one query on a miss)."""
+        return season_index.get(club_id, lambda: self._load_spans(club_id))
+
+    def resolve_season_id(self, target_date: datetime, club_id: int) -> Optional[int]:
+        return self.get_index(club_id).find(target_date)
+
+    def resolve_season_ids(self, dates: Iterable[datetime], club_id: int) -> List[Optional[int]]:
+        return self.get_index(club_id).find_many(dates)
+
+    def _load_spans(self, club_id: int) -> List[SeasonSpan]:
+        statement = select(Season.id, Season.started_at, Season.ended_at).where(
+            Season.club_id == club_id
         )
-        return self.session.exec(statement).first()
\ No newline at end of file
+        return [SeasonSpan(*row) for row in self.session.exec(statement).all()]
\ No newline at end of file
@@ -7,11 +7,19 @@ from app.models import NotificationType
 
 # Repositories
 from app.repositories.match_repository import MatchRepository
+from app.repositories.match_template_repository import MatchTemplateRepository
+from app.repositories.member_season_stats_repository import MemberSeasonStatsRepository
+from app.repositories.membership_repository import MembershipRepository
 from app.repositories.notification_repository import NotificationRepository
+from app.repositories.participation_event_repository import ParticipationEventRepository
+from app.repositories.participation_repository import ParticipationRepository
+from app.repositories.season_repository import SeasonRepository
 
 # Services
 from app.services.match_service import MatchService
+from app.services.membership_service import MembershipService
 from app.services.notification_service import NotificationService
+from app.services.participation_service import ParticipationService
 
 def check_upcoming_notifications():
     """
@@ -24,10 +32,26 @@ def check_upcoming_notifications():
         # Repositories
         match_repo = MatchRepository(session)
         noti_repo = NotificationRepository(session)
+        stats_repo = MemberSeasonStatsRepository(session)
         
         # Services 
+        # MatchService gets its full set: all of them share this session
+        participation_service = ParticipationService(
+            ParticipationRepository(session),
+            match_repo,
+            MembershipRepository(session),
+            stats_repo,
+            ParticipationEventRepository(session),
+        )
+        match_service = MatchService(
+            match_repo,
+            MatchTemplateRepository(session),
+            SeasonRepository(session),
+            stats_repo,
+            noti_repo,
+            participation_service,
+        )
         # (Pass None for dependencies irrelevant to this specific task to keep it light)
-        match_service = MatchService(match_repo, None, None) 
         notification_service = NotificationService(noti_repo, None, None, None, None) 
 
         # 2. Get Matches via Service
@@ -46,13 +70,36 @@ def check_upcoming_notifications():
                 # Ask Service to handle the logic
                 notification_service.ensure_pending_task(match.id, notification_type, trigger_time)
 
-# Scheduler Setup (Unchanged)
+def compact_vote_events():
+    """
+    Folds the vote log of long-finished matches into summary rows (bounds table growth).
+    """
+    with Session(engine) as session:
+        # Only the event log is needed for compaction
+        participation_service = ParticipationService(
+            None, None, None, None, ParticipationEventRepository(session)
+        )
+        compacted = participation_service.compact_vote_events(older_than_days=30)
+        print(f"🗜️ [Scheduler] Compacted vote log of {compacted} finished matches.")
+
+def expire_memberships():
+    """
+    Flips ACTIVE memberships past expires_at (trials, guests) to EXPIRED in one UPDATE.
+    """
+    with Session(engine) as session:
+        membership_service = MembershipService(MembershipRepository(session), None)
+        expired = membership_service.expire_overdue_memberships()
+        print(f"⌛ [Scheduler] Expired {expired} memberships.")
+
+# Scheduler Setup
 scheduler = BackgroundScheduler()
 
 def start_scheduler():
     if not scheduler.get_jobs():
         # Check every 1 minute for responsiveness during testing
         scheduler.add_job(check_upcoming_notifications, 'interval', minutes=5)
+        scheduler.add_job(compact_vote_events, 'interval', hours=24)
+        scheduler.add_job(expire_memberships, 'interval', hours=1)
         scheduler.start()
         print("🚀 [Scheduler] Service-based Scheduler started.")
 
@@ -1,10 +1,13 @@
-from typing import List, Optional
-from datetime import datetime, date
-from sqlmodel import SQLModel
+import re
+from typing import Any, Dict, List, Optional
+from datetime import datetime, date, time
+from sqlmodel import Field, SQLModel
+from pydantic import computed_field, field_validator
 # Import Base Models and Enums
 from app.models import (
-    ClubBase, MemberBase, MatchTemplateBase, MatchBase, ParticipationBase,
-    MemberStatus, MembershipStatus, MatchStatus, ParticipationStatus, NotificationType
+    ClubBase, MemberBase, MatchTemplateBase, MatchBase, ParticipationBase, MemberSeasonStatsBase,
+    MemberStatus, MembershipStatus, MembershipType, MatchStatus, ParticipationStatus, NotificationType,
+    PlayerPosition,
 )
 
 # -----------------------------------------------------------------------------
@@ -22,10 +25,39 @@ class MembershipCreate(SQLModel):
 class MatchTemplateCreate(MatchTemplateBase):
     club_id: int
 
+class MatchTemplateUpdate(SQLModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    day_of_week: Optional[int] = None
+    start_time: Optional[time] = None
+    duration_minutes: Optional[int] = None
+    location: Optional[str] = None
+    min_participants: Optional[int] = None
+    max_participants: Optional[int] = None
+
+    polling_start_hours_before: Optional[int] = None
+    soft_deadline_hours_before: Optional[int] = None
+    hard_deadline_hours_before: Optional[int] = None
+
+    recurrence_interval_weeks: Optional[int] = None
+    recurrence_week_of_month: Optional[int] = None
+    recurrence_anchor_date: Optional[date] = None
+    excluded_dates: Optional[List[str]] = None
+
 class MatchCreateFromTemplate(SQLModel):
     template_id: int
     match_date: date
     season_id: Optional[int] = None
+    allow_conflicts: bool = False # Create even if it overlaps another booking
+
+class MatchGenerateSeason(SQLModel):
+    template_id: int
+    season_id: int
+
+class MatchGenerateResult(SQLModel):
+    created: int
+    skipped: int # Dates that already had a match from this template
+    conflicts: List[datetime] = [] # Dates left out: the club or venue is already booked
 
 class MatchCreateManual(SQLModel):
     club_id: int
@@ -42,6 +74,7 @@ class MatchCreateManual(SQLModel):
     
     min_participants: int = 10
     max_participants: int = 22
+    allow_conflicts: bool = False # Create even if it overlaps another booking
 
 # -----------------------------------------------------------------------------
 # 🟡 UPDATE SCHEMAS (Input - Partial)
@@ -65,6 +98,36 @@ class MemberUpdate(SQLModel):
     roles: Optional[List[str]] = None
     status: Optional[MemberStatus] = None
 
+class MemberImportRow(SQLModel):
+    # One spreadsheet row of a bulk import (headers are matched case-insensitively)
+    kakao_id: str = Field(min_length=1)
+    name: str = Field(min_length=1)
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    birth_year: Optional[int] = Field(default=None, ge=1900, le=2100)
+    back_number: Optional[int] = Field(default=None, ge=0, le=999)
+    positions: List[PlayerPosition] = [] # "ST;CB" or "ST, CB" in the sheet
+    membership_type: Optional[MembershipType] = None # Overrides the request default
+
+    @field_validator("positions", mode="before")
+    @classmethod
+    def split_positions(cls, value):
+        if isinstance(value, str):
+            return [p.strip().upper() for p in re.split(r"[;,/]", value) if p.strip()]
+        return value
+
+class MemberImportError(SQLModel):
+    row: int
+    kakao_id: Optional[str] = None
+    message: str
+
+class MemberImportResult(SQLModel):
+    created: int = 0
+    duplicates: int = 0 # kakao_id already registered (left untouched)
+    memberships: int = 0
+    error_count: int = 0
+    errors: List[MemberImportError] = [] # First MAX_IMPORT_ERRORS only
+
 class MatchUpdate(SQLModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -80,12 +143,38 @@ class MatchUpdate(SQLModel):
     min_participants: Optional[int] = None
     max_participants: Optional[int] = None
 
+class MatchBulkUpdate(SQLModel):
+    """Edits applied to every future match of one template (single transaction)."""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    location: Optional[str] = None
+    kickoff: Optional[time] = None # New UTC time of day; deadlines follow
+    shift_days: Optional[int] = None # Move every match by N days
+    min_participants: Optional[int] = None
+    max_participants: Optional[int] = None
+
+class MatchBulkUpdateResult(SQLModel):
+    updated: int
+    retracted_notifications: int
+
 class MembershipUpdate(SQLModel):
     status: Optional[MembershipStatus] = None
     year: Optional[int] = None
     started_at: Optional[datetime] = None
     ended_at: Optional[datetime] = None
 
+class MembershipRenew(SQLModel):
+    source_season_id: int
+    target_season_id: int
+    # Which membership types carry over (e.g. only REGULAR); default: all
+    types: List[MembershipType] = list(MembershipType)
+
+class MembershipRenewResult(SQLModel):
+    source_season_id: int
+    target_season_id: int
+    renewed: int
+    skipped: int # Already a member of the target season
+
 class ParticipationAdminUpdate(SQLModel):
     match_id: int
     member_id: int
@@ -102,6 +191,11 @@ class MemberSummary(SQLModel):
     name: str
     picture_url: Optional[str] = None
 
+# 1-1. Lineup Entry (attending members with their positions)
+class LineupEntry(MemberSummary):
+    back_number: Optional[int] = None
+    positions: List[str] = []
+
 # 2. Participation Read (Nested inside Match)
 class ParticipationRead(ParticipationBase):
     id: int
@@ -111,12 +205,114 @@ class ParticipationRead(ParticipationBase):
 # 3. Match Read (The big one)
 class MatchRead(MatchBase):
     id: int
+    attending_count: int = 0
     created_at: datetime
     updated_at: datetime
     
     # List of participations
     participations: List[ParticipationRead] = []
 
+# 3-1. Member History (Slim match summary instead of the whole Match)
+class MatchSummary(SQLModel):
+    id: int
+    name: str
+    start_time: datetime
+    location: str
+    status: MatchStatus
+
+class ParticipationHistoryItem(ParticipationBase):
+    id: int
+    match_id: int
+    updated_at: datetime
+    match: MatchSummary
+
+class ParticipationHistoryPage(SQLModel):
+    items: List[ParticipationHistoryItem] = []
+    next_cursor: Optional[str] = None # Pass back as ?cursor= to get the next page
+
+# 3-2. Roster Replay (Rebuilt from the vote log)
+class RosterEntry(SQLModel):
+    member_id: int
+    status: ParticipationStatus
+    changed_at: datetime
+    compacted: bool = False # True = only the final status survived compaction
+
+# 3-3. Match List (Counts instead of rosters; roster via GET /matches/{id})
+class MatchListItem(SQLModel):
+    id: int
+    name: str
+    location: str
+    start_time: datetime
+    end_time: datetime
+    status: MatchStatus
+    min_participants: int
+    max_participants: int
+    polling_start_at: datetime
+    soft_deadline_at: Optional[datetime] = None
+    hard_deadline_at: datetime
+
+    attending: int = 0
+    absent: int = 0
+    pending: int = 0
+    waitlisted: int = 0
+    my_status: Optional[ParticipationStatus] = None # The caller's own vote
+
+class MatchListPage(SQLModel):
+    items: List[MatchListItem] = []
+    next_cursor: Optional[str] = None
+
+# 3-4. Template Occurrences (Preview before generating a season)
+class MatchOccurrence(SQLModel):
+    start_time: datetime
+    end_time: datetime
+    polling_start_at: datetime
+    soft_deadline_at: Optional[datetime] = None
+    hard_deadline_at: datetime
+    exists: bool = False # A match from this template already starts at this time
+    conflict: bool = False # Another booking of the club / venue overlaps it
+
+# 3-5. Template Sync (Template edits -> future matches)
+class FieldChange(SQLModel):
+    old: Optional[Any] = None
+    new: Optional[Any] = None
+
+class MatchSyncDiff(SQLModel):
+    match_id: int
+    start_time: datetime
+    changes: Dict[str, FieldChange] = {}
+    skipped_overrides: List[str] = [] # Differ from the template, but edited by hand
+    over_capacity: bool = False # Template max_participants is below the seats taken: kept as is
+
+class TemplateSyncResult(SQLModel):
+    dry_run: bool
+    matches: List[MatchSyncDiff] = []
+    updated: int = 0
+    skipped_past: List[int] = [] # Match ids the new weekday would move into the past (untouched)
+
+# 3-6. Conflicts (Double-booked club or venue)
+class MatchConflict(SQLModel):
+    kind: str # "club" (same club, overlapping) or "location" (venue double-booked)
+    match_id: int
+    club_id: int
+    name: str
+    location: str
+    start_time: datetime
+    end_time: datetime
+
+class MatchConflictPair(SQLModel):
+    kind: str
+    first: MatchConflict
+    second: MatchConflict
+
+# 3-7. Calendar (Compact projection for month / range views)
+class MatchCalendarItem(SQLModel):
+    id: int
+    name: str
+    location: str
+    start_time: datetime
+    end_time: datetime
+    status: MatchStatus
+
 # 4. Standard Reads
 class ClubRead(ClubBase):
     id: int
@@ -136,6 +332,31 @@ class MemberMeRead(MemberRead):
     phone: Optional[str] = None
     birth_year: Optional[int] = None
 
+class MemberDirectoryPage(SQLModel):
+    items: List[MemberRead] = []
+    next_cursor: Optional[str] = None
+
+class MemberContactRead(SQLModel):
+    # Club phone book: the only list that carries phone numbers
+    id: int
+    name: str
+    back_number: Optional[int] = None
+    phone: Optional[str] = None
+
+# -----------------------------------------------------------------------------
+# 📊 STATS SCHEMAS
+# -----------------------------------------------------------------------------
+
+class MemberSeasonStatsRead(MemberSeasonStatsBase):
+    member_id: int
+    season_id: int
+
+    @computed_field
+    @property
+    def attendance_rate(self) -> float:
+        total = self.attended + self.absent + self.pending + self.ghosted
+        return round(self.attended / total, 3) if total else 0.0
+
 # -----------------------------------------------------------------------------
 # 🔔 NOTIFICATION SCHEMAS
 # -----------------------------------------------------------------------------
@@ -162,10 +383,18 @@ class KakaoLoginRequest(SQLModel):
     kakao_id: str
     name: str
     email: str
+    # When present, the server asks Kakao whose token it is (must match kakao_id)
+    kakao_access_token: Optional[str] = None
 
 class Token(SQLModel):
     access_token: str
     token_type: str
+    # Swap for a new pair at /auth/refresh before `expires_in` seconds run out
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+class RefreshTokenRequest(SQLModel):
+    refresh_token: str
 
 # -----------------------------------------------------------------------------
 # 🍂 SEASON SCHEMAS
@@ -177,6 +406,17 @@ class SeasonCreate(SQLModel):
     ended_at: datetime
     is_active: bool = True
 
+class SeasonCloseResult(SQLModel):
+    season_id: int
+    archived_matches: int
+
+class KeyRotationResult(SQLModel):
+    key_id: str # Fingerprint of the primary key (never the key itself)
+    rotated: int
+    failed: int
+    remaining: int
+    completed: bool
+
 class SeasonUpdate(SQLModel):
     name: Optional[str] = None
     started_at: Optional[datetime] = None
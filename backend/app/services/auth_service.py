@@ -1,20 +1,49 @@
+import hashlib
+import secrets
+import uuid
 from datetime import datetime, timedelta, UTC
+from fastapi import HTTPException
 from jose import jwt
 from app.core.config import settings
-from app.models import Member, Role, MemberStatus
+from app.models import Member, RefreshToken, Role, MemberStatus
 from app.repositories.member_repository import MemberRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.schemas import KakaoLoginRequest, Token
 from app.core.utils import ensure_utc
+from app.core.auth import member_claims, revoked_sessions
+from app.services.kakao_service import KakaoTokenVerifier
 
 class AuthService:
-    def __init__(self, member_repository: MemberRepository):
+    def __init__(
+        self,
+        member_repository: MemberRepository,
+        kakao_verifier: KakaoTokenVerifier,
+        refresh_token_repository: RefreshTokenRepository,
+    ):
         self.member_repository = member_repository
+        self.kakao_verifier = kakao_verifier
+        self.refresh_token_repository = refresh_token_repository
+
+    async def verify_kakao_identity(self, login_data: KakaoLoginRequest):
+        """
+        Checks the Kakao access token really belongs to `kakao_id`.
+        Cached, so repeated logins with the same token cost no outbound call.
+        Tokenless logins are only let through in DEV_MODE with the requirement off.
+        """
+        if not login_data.kakao_access_token:
+            if settings.KAKAO_REQUIRE_ACCESS_TOKEN or not settings.DEV_MODE:
+                raise HTTPException(status_code=401, detail="Kakao access token required")
+            return
+
+        info = await self.kakao_verifier.verify(login_data.kakao_access_token)
+        if info.kakao_id != login_data.kakao_id:
+            raise HTTPException(status_code=401, detail="Kakao token does not match kakao_id")
 
     def authenticate_kakao(self, login_data: KakaoLoginRequest) -> Token:
         """
         Orchestrates the login flow:
         1. Find Member or Create new one.
-        2. Generate JWT Access Token.
+        2. Generate JWT Access Token (+ the refresh token starting a new session).
         """
         # 1. Find or Create Member
         member = self.member_repository.get_by_kakao_id(login_data.kakao_id)
@@ -30,13 +59,61 @@ class AuthService:
             )
             member = self.member_repository.create(member)
 
-        # 2. Generate Token
+        # 2. Generate Tokens
+        return self._issue_tokens(member, family_id=uuid.uuid4().hex)
+
+    def refresh(self, refresh_token: str) -> Token:
+        """
+        Rotation: every refresh token works once and is swapped for a new one.
+        Presenting a used token again means it leaked (or the client replayed it):
+        the whole session is revoked, so the thief's copy dies with it.
+        """
+        now = datetime.now(UTC)
+        stored = self.refresh_token_repository.get_by_hash(_hash_token(refresh_token))
+        if not stored or stored.revoked_at or ensure_utc(stored.expires_at) <= now:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+        if not self.refresh_token_repository.mark_used(stored.id, now):
+            self._revoke_session(stored.family_id, now)
+            raise HTTPException(status_code=401, detail="Refresh token reuse detected")
+
+        member = self.member_repository.get_by_id(stored.member_id)
+        if not member:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+        return self._issue_tokens(member, stored.family_id)  # Commits the rotation
+
+    def logout(self, refresh_token: str):
+        """Ends the session: its refresh tokens AND its live access tokens stop working."""
+        stored = self.refresh_token_repository.get_by_hash(_hash_token(refresh_token))
+        if stored and not stored.revoked_at:
+            self._revoke_session(stored.family_id, datetime.now(UTC))
+
+    def _revoke_session(self, family_id: str, at: datetime):
+        self.refresh_token_repository.revoke_family(family_id, at)
+        revoked_sessions.add(family_id)  # Other processes catch up on their next filter reload
+
+    def _issue_tokens(self, member: Member, family_id: str) -> Token:
+        # Claims let most requests skip the member lookup; `sid` makes the token revocable
+        access_ttl = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = self._create_access_token(
-            data={"sub": str(member.id)},
-            expires_delta=timedelta(days=7) # 7 days expiry
+            data={**member_claims(member), "sid": family_id},
+            expires_delta=access_ttl,
         )
 
-        return Token(access_token=access_token, token_type="bearer")
+        refresh_token = secrets.token_urlsafe(32)
+        self.refresh_token_repository.create(RefreshToken(
+            member_id=member.id,
+            family_id=family_id,
+            token_hash=_hash_token(refresh_token),
+            expires_at=datetime.now(UTC) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        ))
+
+        return Token(
+            access_token=access_token,
+            token_type="bearer",
+            refresh_token=refresh_token,
+            expires_in=int(access_ttl.total_seconds()),
+        )
 
     def _create_access_token(self, data: dict, expires_delta: timedelta) -> str:
         """Internal helper to sign JWTs"""
@@ -48,4 +125,9 @@ class AuthService:
             to_encode, 
             settings.SECRET_KEY, 
             algorithm=settings.ALGORITHM
-        )
\ No newline at end of file
+        )
+
+
+def _hash_token(token: str) -> str:
+    # Refresh tokens are 256 random bits: a plain (unsalted) SHA-256 is enough
+    return hashlib.sha256(token.encode()).hexdigest()
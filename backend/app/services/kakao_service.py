@@ -1,14 +1,155 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
 import httpx
 from fastapi import HTTPException
 
+from app.core.config import settings
+
+KAKAO_TOKEN_INFO_URL = "https://kapi.kakao.com/v1/user/access_token_info"
+# Stop trusting a cached token a little before Kakao does
+EXPIRY_MARGIN_SECONDS = 5
+
+
+@dataclass(frozen=True)
+class KakaoTokenInfo:
+    kakao_id: str
+    app_id: Optional[int]
+    expires_in: int
+
+
+class KakaoTokenVerifier:
+    """
+    Server-side check of Kakao access tokens via the token-info endpoint. 🔎
+
+    - Valid tokens are cached until the expiry Kakao reports, invalid ones for
+      `negative_ttl` seconds, in one LRU bounded by `max_entries`.
+    - Concurrent checks of the same token share a single outbound call.
+    - Kakao being unreachable is NOT cached: the next request tries again.
+
+    Keys are SHA-256 digests, so raw tokens never sit in memory. State is
+    per process and meant for one event loop (the app's).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        negative_ttl: float = 60,
+        app_id: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.app_id = app_id
+        self.transport = transport
+        self.clock = clock
+        # digest -> (valid until, info or None for "invalid")
+        self._entries: "OrderedDict[str, Tuple[float, Optional[KakaoTokenInfo]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def verify(self, access_token: str) -> KakaoTokenInfo:
+        """Who the token belongs to. 401 if Kakao rejects it, 502 if Kakao is down."""
+        key = hashlib.sha256(access_token.encode()).hexdigest()
+
+        cached = self._entries.get(key)
+        if cached is not None:
+            if cached[0] > self.clock():
+                self._entries.move_to_end(key)
+                return _valid(cached[1])
+            del self._entries[key]
+
+        # A burst of logins with the same token: the first one asks Kakao, the rest wait
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._lookup(key, access_token))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._forget(key, pending))
+        # shield: one caller disconnecting must not cancel the others' lookup
+        return _valid(await asyncio.shield(pending))
+
+    def invalidate(self, access_token: Optional[str] = None):
+        if access_token is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(hashlib.sha256(access_token.encode()).hexdigest(), None)
+
+    async def _lookup(self, key: str, access_token: str) -> Optional[KakaoTokenInfo]:
+        try:
+            async with httpx.AsyncClient(transport=self.transport, timeout=5) as client:
+                response = await client.get(
+                    KAKAO_TOKEN_INFO_URL, headers={"Authorization": f"Bearer {access_token}"}
+                )
+        except httpx.HTTPError:
+            raise HTTPException(status_code=502, detail="Kakao token check failed")
+
+        if response.status_code in (400, 401):
+            # Expired, revoked or malformed: remember the "no" for a while
+            self._store(key, None, self.negative_ttl)
+            return None
+        if response.status_code != 200:
+            raise HTTPException(status_code=502, detail="Kakao token check failed")
+
+        body = response.json()
+        info = KakaoTokenInfo(
+            kakao_id=str(body["id"]),
+            app_id=body.get("app_id"),
+            expires_in=int(body.get("expires_in", 0)),
+        )
+        if self.app_id is not None and info.app_id != self.app_id:
+            # A genuine token, but minted for someone else's app
+            self._store(key, None, self.negative_ttl)
+            return None
+
+        self._store(key, info, info.expires_in - EXPIRY_MARGIN_SECONDS)
+        return info
+
+    def _store(self, key: str, info: Optional[KakaoTokenInfo], ttl: float):
+        if ttl <= 0:
+            return
+        self._entries[key] = (self.clock() + ttl, info)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)  # Least recently used
+
+    def _forget(self, key: str, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+
+def _valid(info: Optional[KakaoTokenInfo]) -> KakaoTokenInfo:
+    if info is None:
+        raise HTTPException(status_code=401, detail="Invalid Kakao access token")
+    return info
+
+
+# One cache per process, shared by logins and announcer sends
+kakao_token_verifier = KakaoTokenVerifier(
+    max_entries=settings.KAKAO_TOKEN_CACHE_SIZE,
+    negative_ttl=settings.KAKAO_TOKEN_NEGATIVE_TTL_SECONDS,
+    app_id=settings.KAKAO_APP_ID,
+)
+
+
 class KakaoService:
     BASE_URL = "https://kapi.kakao.com/v2/api/talk/memo/default/send"
 
+    def __init__(self, verifier: Optional[KakaoTokenVerifier] = None):
+        self.verifier = verifier or kakao_token_verifier
+
     async def send_text_to_me(self, access_token: str, message: str):
         """
         Sends a simple text message to the owner of the access_token (The Announcer).
         Uses the 'Text' template of KakaoTalk.
         """
+        # A dead token fails here from cache instead of at the memo API
+        await self.verifier.verify(access_token)
+
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/x-www-form-urlencoded"
@@ -16,7 +157,6 @@ class KakaoService:
 
         # Kakao 'Text' Template JSON
         # We wrap the message in a JSON object string as required by the 'template_object' param
-        import json
         template_object = json.dumps({
             "object_type": "text",
             "text": message,
@@ -27,20 +167,20 @@ class KakaoService:
             "button_title": "관리자 페이지 이동"
         })
 
-        data = {"template_object": template_object}        
+        data = {"template_object": template_object}
 
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=self.verifier.transport) as client:
             response = await client.post(self.BASE_URL, headers=headers, data=data)
-            
+
             # 👇 ADD THIS DEBUG PRINT
             if response.status_code != 200:
                 print(f"🔥 KAKAO ERROR: {response.status_code}")
                 print(f"🔥 BODY: {response.text}")  # This is the smoking gun!
-                
+
                 # Let's pass the real error back to the API response so you see it in Swagger
                 raise HTTPException(
-                    status_code=response.status_code, 
+                    status_code=response.status_code,
                     detail=f"Kakao Error: {response.text}"
                 )
-            
-            return response.json()
\ No newline at end of file
+
+            return response.json()
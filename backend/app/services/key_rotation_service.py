@@ -0,0 +1,79 @@
+import time
+from datetime import datetime, UTC
+from typing import Callable, Optional
+from cryptography.fernet import InvalidToken
+from app.core import security_fields
+from app.repositories.member_repository import MemberRepository
+from app.repositories.encryption_rotation_repository import EncryptionRotationRepository
+from app.schemas import KeyRotationResult
+
+ProgressCallback = Callable[[KeyRotationResult], None]
+
+
+class KeyRotationService:
+    """
+    Moves every encrypted phone onto the primary key of ENCRYPTION_KEYS.
+
+    Works in keyset batches (id > checkpoint), one short transaction each, so
+    no long lock is held and a crash resumes at the last committed batch.
+    The checkpoint is per primary key: adding yet another key starts over.
+    """
+
+    def __init__(
+        self,
+        member_repository: MemberRepository,
+        rotation_repository: EncryptionRotationRepository,
+    ):
+        self.member_repository = member_repository
+        self.rotation_repository = rotation_repository
+
+    def rotate_phones(
+        self,
+        batch_size: int = 500,
+        pause_seconds: float = 0.0,
+        max_batches: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> KeyRotationResult:
+        checkpoint = self.rotation_repository.get_or_create(security_fields.primary_key_id())
+        remaining = self.member_repository.count_with_phone(checkpoint.last_member_id)
+
+        batches = 0
+        while checkpoint.completed_at is None and (max_batches is None or batches < max_batches):
+            rows = self.member_repository.get_phone_batch(checkpoint.last_member_id, batch_size)
+            if not rows:
+                checkpoint.completed_at = datetime.now(UTC)
+                self.rotation_repository.save(checkpoint)
+                self.member_repository.session.commit()
+                break
+
+            # Decrypt + re-encrypt in Python, then one executemany UPDATE
+            swaps = []
+            for member_id, token in rows:
+                try:
+                    swaps.append({"member_id": member_id, "old": token, "new": security_fields.rotate_text(token)})
+                except InvalidToken:
+                    checkpoint.failed += 1
+            self.member_repository.replace_phones(swaps)
+
+            checkpoint.rotated += len(swaps)
+            checkpoint.last_member_id = rows[-1][0]
+            self.rotation_repository.save(checkpoint)
+            self.member_repository.session.commit()
+
+            batches += 1
+            remaining -= len(rows)
+            if on_progress:
+                on_progress(self._result(checkpoint, remaining))
+            if pause_seconds:
+                time.sleep(pause_seconds)  # Leave room for live traffic
+
+        return self._result(checkpoint, remaining)
+
+    def _result(self, checkpoint, remaining: int) -> KeyRotationResult:
+        return KeyRotationResult(
+            key_id=checkpoint.key_id,
+            rotated=checkpoint.rotated,
+            failed=checkpoint.failed,
+            remaining=max(remaining, 0),
+            completed=checkpoint.completed_at is not None,
+        )
@@ -1,12 +1,61 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, UTC
 from fastapi import HTTPException
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from app.models import Match, MatchStatus
-from app.schemas import MatchCreateFromTemplate, MatchCreateManual, MatchUpdate
+from app.models import Match, MatchStatus, NotificationType
+from app.schemas import (
+    MatchCreateFromTemplate,
+    MatchCreateManual,
+    MatchUpdate,
+    MatchListItem,
+    MatchListPage,
+    MatchCalendarItem,
+    MatchGenerateSeason,
+    MatchGenerateResult,
+    MatchOccurrence,
+    MatchBulkUpdate,
+    MatchBulkUpdateResult,
+    MatchRead,
+    MemberSummary,
+    ParticipationRead,
+    FieldChange,
+    MatchSyncDiff,
+    TemplateSyncResult,
+    MatchConflict,
+    MatchConflictPair,
+)
+from app.core.utils import encode_cursor, decode_cursor, ensure_utc
+from app.core.http_cache import make_etag
+from app.core import ical
+from app.core.interval_tree import IntervalTree
+from app.core.recurrence import Occurrence, RecurrenceRule, expand, occurrence_at, occurrence_on
 from app.repositories.match_template_repository import MatchTemplateRepository
 from app.repositories.match_repository import MatchRepository
 from app.repositories.season_repository import SeasonRepository
+from app.repositories.member_season_stats_repository import MemberSeasonStatsRepository
+from app.repositories.notification_repository import NotificationRepository
+from app.services.participation_service import ParticipationService
+
+# Upper bound for one calendar request (a full season view)
+MAX_CALENDAR_DAYS = 550
+
+# Notification milestone -> the Match column that triggers it
+MILESTONES = {
+    NotificationType.POLLING_START: "polling_start_at",
+    NotificationType.SOFT_DEADLINE: "soft_deadline_at",
+    NotificationType.HARD_DEADLINE: "hard_deadline_at",
+}
+
+# Match fields a template sync may rewrite (unless overridden on the match)
+TEMPLATE_SYNCED_FIELDS = (
+    "name", "description", "location", "min_participants", "max_participants",
+    "start_time", "end_time", *MILESTONES.values(),
+)
+
+
+def _location_key(location: str) -> str:
+    """Venues are compared case- and whitespace-insensitively."""
+    return location.strip().lower()
 
 
 class MatchService:
@@ -15,10 +64,16 @@ class MatchService:
         match_repository: MatchRepository,
         template_repository: MatchTemplateRepository,
         season_repository: SeasonRepository,
+        stats_repository: MemberSeasonStatsRepository,
+        notification_repository: NotificationRepository,
+        participation_service: ParticipationService,
     ):
         self.match_repository = match_repository
         self.template_repository = template_repository
         self.season_repository = season_repository
+        self.stats_repository = stats_repository
+        self.notification_repository = notification_repository
+        self.participation_service = participation_service
 
     def create_match_from_template(self, data: MatchCreateFromTemplate) -> Match:
         # 1. Fetch the Blueprint
@@ -26,52 +81,234 @@ class MatchService:
         if not template:
             raise HTTPException(status_code=404, detail="Template not found")
 
-        # 2. Combine Date + Template Time to get Match Start (UTC)
-        # Note: We assume the date provided matches the template's 'start_time' logic in UTC
-        match_start_datetime = datetime.combine(data.match_date, template.start_time)
+        # 2. Start, end and every deadline for that date (UTC wall time)
+        occurrence = occurrence_on(self._template_rule(template), data.match_date)
 
         # 3. Get Season (Validate it exists and is active)
         season_id = self._resolve_season_id(
             club_id=template.club_id,
-            match_date=match_start_datetime,
+            match_date=occurrence.start_time,
             preferred_season_id=data.season_id,
         )
 
-        # 4. Calculate End Time
-        match_end_datetime = match_start_datetime + timedelta(
-            minutes=template.duration_minutes
+        # 4. Refuse double bookings (same club, or same venue) unless forced
+        if not data.allow_conflicts:
+            self._ensure_no_conflicts(
+                template.club_id, template.location, occurrence.start_time, occurrence.end_time
+            )
+
+        # 5. Create the Match Object
+        new_match = self._match_from_occurrence(template, season_id, occurrence)
+        return self.match_repository.create(new_match)
+
+    def preview_template_occurrences(
+        self, template_id: int, season_id: int
+    ) -> List[MatchOccurrence]:
+        """Every date the template's rule produces inside the season (nothing is saved)."""
+        template, season = self._get_template_and_season(template_id, season_id)
+        occurrences = expand(self._recurring_rule(template), season.started_at, season.ended_at)
+        existing = self._existing_start_times(template, occurrences)
+        trees = self._load_conflict_trees(
+            template.club_id, [template.location], season.started_at, season.ended_at
         )
 
-        # 5. Calculate Deadlines (Subtracting hours)
-        polling_start_dt = match_start_datetime - timedelta(
-            hours=template.polling_start_hours_before
+        return [
+            MatchOccurrence(
+                **occurrence._asdict(),
+                exists=exists,
+                conflict=not exists and bool(self._find_conflicts(
+                    trees, template.location, occurrence.start_time, occurrence.end_time
+                )),
+            )
+            for occurrence in occurrences
+            for exists in [occurrence.start_time in existing]
+        ]
+
+    def generate_season_matches(self, data: MatchGenerateSeason) -> MatchGenerateResult:
+        """
+        Materializes a whole season from a template in one bulk insert.
+        Dates that already have a match from this template are skipped (safe to re-run);
+        dates where the club or venue is already booked are left out and reported.
+        """
+        template, season = self._get_template_and_season(data.template_id, data.season_id)
+        occurrences = expand(self._recurring_rule(template), season.started_at, season.ended_at)
+        existing = self._existing_start_times(template, occurrences)
+
+        # One query + one tree for the whole season, then O(log n) per date
+        trees = self._load_conflict_trees(
+            template.club_id, [template.location], season.started_at, season.ended_at
         )
-        soft_deadline_dt = match_start_datetime - timedelta(
-            hours=template.soft_deadline_hours_before
+
+        new_matches, conflicts = [], []
+        for occurrence in occurrences:
+            if occurrence.start_time in existing:
+                continue
+            if self._find_conflicts(trees, template.location, occurrence.start_time, occurrence.end_time):
+                conflicts.append(occurrence.start_time)
+                continue
+            new_matches.append(self._match_from_occurrence(template, season.id, occurrence))
+
+        self.match_repository.create_many(new_matches)
+        return MatchGenerateResult(
+            created=len(new_matches),
+            skipped=len(existing),
+            conflicts=conflicts,
         )
-        hard_deadline_dt = match_start_datetime - timedelta(
-            hours=template.hard_deadline_hours_before
+
+    def get_season_conflicts(self, club_id: int, season_id: int) -> List[MatchConflictPair]:
+        """
+        Every overlapping pair in a season: the club's own matches clashing with each
+        other, and the club's matches sharing a venue with another club's booking.
+        """
+        season = self.season_repository.get_by_id(season_id)
+        if not season or season.club_id != club_id:
+            raise HTTPException(status_code=404, detail="Season not found")
+
+        own = [
+            row
+            for row in self.match_repository.get_intervals(club_id, [], season.started_at, season.ended_at)
+            if row.club_id == club_id
+        ]
+        club_tree, venue_trees = self._load_conflict_trees(
+            club_id, [row.location for row in own], season.started_at, season.ended_at
         )
 
-        # 6. Create the Match Object
-        new_match = Match(
+        pairs: Dict[Tuple[int, int], MatchConflictPair] = {}
+        for row in own:
+            start, end = ensure_utc(row.start_time), ensure_utc(row.end_time)
+            for other in club_tree.overlapping(start, end):
+                if other.id > row.id:
+                    pairs[(row.id, other.id)] = self._conflict_pair("club", row, other)
+            for other in venue_trees[_location_key(row.location)].overlapping(start, end):
+                if other.club_id != club_id:
+                    pairs.setdefault((row.id, other.id), self._conflict_pair("location", row, other))
+
+        return sorted(pairs.values(), key=lambda pair: (pair.first.start_time, pair.first.match_id))
+
+    def _load_conflict_trees(
+        self, club_id: int, locations: Iterable[str], start: datetime, end: datetime
+    ) -> Tuple[IntervalTree, Dict[str, IntervalTree]]:
+        """One query for the window, then a club tree + one tree per venue."""
+        keys = sorted({_location_key(location) for location in locations})
+        rows = self.match_repository.get_intervals(club_id, keys, start, end)
+
+        def tree(selected):
+            return IntervalTree(
+                (ensure_utc(row.start_time), ensure_utc(row.end_time), row) for row in selected
+            )
+
+        club_tree = tree(row for row in rows if row.club_id == club_id)
+        venue_trees = {
+            key: tree(row for row in rows if _location_key(row.location) == key) for key in keys
+        }
+        return club_tree, venue_trees
+
+    def _find_conflicts(
+        self, trees, location: str, start: datetime, end: datetime, exclude_id: Optional[int] = None
+    ) -> List[MatchConflict]:
+        club_tree, venue_trees = trees
+        start, end = ensure_utc(start), ensure_utc(end)
+
+        conflicts: Dict[int, MatchConflict] = {}
+        for row in club_tree.overlapping(start, end):
+            if row.id != exclude_id:
+                conflicts[row.id] = self._conflict("club", row)
+        venue = venue_trees.get(_location_key(location))
+        for row in venue.overlapping(start, end) if venue else []:
+            if row.id != exclude_id and row.id not in conflicts:
+                conflicts[row.id] = self._conflict("location", row)
+        return list(conflicts.values())
+
+    def _ensure_no_conflicts(self, club_id: int, location: str, start: datetime, end: datetime):
+        trees = self._load_conflict_trees(club_id, [location], start, end)
+        conflicts = self._find_conflicts(trees, location, start, end)
+        if conflicts:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "message": "The club or the venue is already booked at that time.",
+                    "conflicts": [conflict.model_dump(mode="json") for conflict in conflicts],
+                },
+            )
+
+    def _conflict(self, kind: str, row) -> MatchConflict:
+        return MatchConflict(
+            kind=kind,
+            match_id=row.id,
+            club_id=row.club_id,
+            name=row.name,
+            location=row.location,
+            start_time=row.start_time,
+            end_time=row.end_time,
+        )
+
+    def _conflict_pair(self, kind: str, row, other) -> MatchConflictPair:
+        return MatchConflictPair(
+            kind=kind, first=self._conflict(kind, row), second=self._conflict(kind, other)
+        )
+
+    def _get_template_and_season(self, template_id: int, season_id: int):
+        template = self.template_repository.get_by_id(template_id)
+        if not template:
+            raise HTTPException(status_code=404, detail="Template not found")
+        season = self.season_repository.get_by_id(season_id)
+        if not season or season.club_id != template.club_id:
+            raise HTTPException(status_code=404, detail="Season not found")
+        return template, season
+
+    def _recurring_rule(self, template) -> RecurrenceRule:
+        """The rule to expand over a window: one-off templates have no series."""
+        try:
+            return RecurrenceRule.from_template(template)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid recurrence: {e}")
+
+    def _template_rule(self, template) -> RecurrenceRule:
+        """Offsets for ONE given date/instant; never expand() this (see _recurring_rule)."""
+        try:
+            if template.day_of_week is None:
+                # One-off templates: any requested date is valid
+                return RecurrenceRule(
+                    weekday=0,
+                    start_time=template.start_time,
+                    duration_minutes=template.duration_minutes,
+                    polling_start_hours_before=template.polling_start_hours_before,
+                    soft_deadline_hours_before=template.soft_deadline_hours_before,
+                    hard_deadline_hours_before=template.hard_deadline_hours_before,
+                )
+            return RecurrenceRule.from_template(template)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid recurrence: {e}")
+
+    def _existing_start_times(self, template, occurrences: List[Occurrence]) -> set:
+        if not occurrences:
+            return set()
+        starts = self.match_repository.get_start_times(
+            club_id=template.club_id,
+            name=template.name,
+            start=occurrences[0].start_time,
+            end=occurrences[-1].start_time,
+        )
+        return {ensure_utc(start) for start in starts}
+
+    def _match_from_occurrence(self, template, season_id: int, occurrence: Occurrence) -> Match:
+        return Match(
             club_id=template.club_id,
             season_id=season_id,
+            template_id=template.id,
             name=template.name,
             description=template.description,
             location=template.location,
-            start_time=match_start_datetime,
-            end_time=match_end_datetime,
-            polling_start_at=polling_start_dt,
-            soft_deadline_at=soft_deadline_dt,
-            hard_deadline_at=hard_deadline_dt,
+            start_time=occurrence.start_time,
+            end_time=occurrence.end_time,
+            polling_start_at=occurrence.polling_start_at,
+            soft_deadline_at=occurrence.soft_deadline_at,
+            hard_deadline_at=occurrence.hard_deadline_at,
             min_participants=template.min_participants,
             max_participants=template.max_participants,
             status=MatchStatus.RECRUITING,
         )
 
-        return self.match_repository.create(new_match)
-
     def create_manual_match(self, data: MatchCreateManual) -> Match:
         # 0. Resolve Season ID
         season_id = self._resolve_season_id(
@@ -87,7 +324,11 @@ class MatchService:
         soft_dead = data.soft_deadline_at or (data.start_time - timedelta(days=2))
         hard_dead = data.hard_deadline_at or (data.start_time - timedelta(days=1))
 
-        # 3. Create Match Object
+        # 3. Refuse double bookings (same club, or same venue) unless forced
+        if not data.allow_conflicts:
+            self._ensure_no_conflicts(data.club_id, data.location, data.start_time, end_time)
+
+        # 4. Create Match Object
         new_match = Match(
             club_id=data.club_id,
             season_id=season_id,
@@ -109,6 +350,129 @@ class MatchService:
     def get_upcoming_matches(self, club_id: int) -> List[Match]:
         return self.match_repository.get_upcoming_matches(club_id)
 
+    def get_club_listing_validators(self, club_id: int, *scope) -> Tuple[str, Optional[datetime]]:
+        """
+        (ETag, Last-Modified) for a club's match listings, without loading any match.
+        `scope` folds caller-specific inputs (member id, page cursor) into the ETag.
+        """
+        marker = self.match_repository.get_club_change_marker(club_id)
+        upcoming, match_updated, participation_count, participation_updated, member_updated = marker
+
+        updates = [
+            ensure_utc(dt) for dt in (match_updated, participation_updated, member_updated) if dt
+        ]
+        last_modified = max(updates) if updates else None
+
+        etag = make_etag(
+            club_id, upcoming, participation_count,
+            last_modified.isoformat() if last_modified else None, *scope,
+        )
+        return etag, last_modified
+
+    def list_upcoming_summaries(
+        self, club_id: int, member_id: int, limit: int, cursor: Optional[str] = None
+    ) -> MatchListPage:
+        """
+        Slim listing: per-match counts + the caller's vote, no nested rosters.
+        Payload grows with the number of matches only, not matches x members.
+        """
+        after = None
+        if cursor:
+            try:
+                start_time, match_id = decode_cursor(cursor)
+                after = (datetime.fromisoformat(start_time), int(match_id))
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Fetch one extra row to know whether another page exists
+        rows = self.match_repository.get_upcoming_summaries(club_id, member_id, limit + 1, after)
+        has_more = len(rows) > limit
+        items = [MatchListItem.model_validate(row._mapping) for row in rows[:limit]]
+
+        next_cursor = None
+        if has_more:
+            last = items[-1]
+            next_cursor = encode_cursor(last.start_time, last.id)
+
+        return MatchListPage(items=items, next_cursor=next_cursor)
+
+    def _calendar_range(
+        self, start: Optional[datetime], end: Optional[datetime]
+    ) -> Tuple[datetime, datetime]:
+        """Defaults to the next month; caps the span so one request stays small."""
+        start = ensure_utc(start) if start else datetime.now(UTC)
+        end = ensure_utc(end) if end else start + timedelta(days=31)
+        if end <= start:
+            raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+        if end - start > timedelta(days=MAX_CALENDAR_DAYS):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Calendar range cannot exceed {MAX_CALENDAR_DAYS} days",
+            )
+        return start, end
+
+    def get_calendar(
+        self,
+        club_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        statuses: Optional[List[MatchStatus]] = None,
+    ) -> List[MatchCalendarItem]:
+        start, end = self._calendar_range(start, end)
+        rows = self.match_repository.get_calendar(club_id, start, end, statuses)
+        return [MatchCalendarItem.model_validate(row._mapping) for row in rows]
+
+    def stream_calendar_ics(
+        self,
+        club_id: int,
+        calendar_name: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[str]:
+        """
+        iCalendar feed for calendar-app subscriptions.
+        Default window: 90 days back to 1 year ahead. Rows are rendered as they are fetched.
+        """
+        now = datetime.now(UTC)
+        start = start or now - timedelta(days=90)
+        end = end or now + timedelta(days=365)
+        start, end = self._calendar_range(start, end)
+        rows = self.match_repository.iter_calendar(club_id, start, end)
+
+        events = (
+            ical.event_lines(
+                uid=f"match-{row.id}@football-club",
+                summary=row.name,
+                start=row.start_time,
+                end=row.end_time,
+                stamp=row.updated_at,
+                location=row.location,
+                description=row.description,
+                cancelled=row.status == MatchStatus.CANCELLED,
+            )
+            for row in rows
+        )
+        return ical.calendar_lines(calendar_name, events)
+
+    def get_match_detail(self, match_id: int) -> Match | MatchRead:
+        match = self.match_repository.get_with_roster(match_id)
+        if match:
+            return match
+
+        # Closed seasons live in the archive tables
+        archived = self.match_repository.get_archived(match_id)
+        if not archived:
+            raise HTTPException(status_code=404, detail="Match not found")
+
+        participations = [
+            ParticipationRead(
+                **p.model_dump(include={"id", "member_id", "status", "comment"}),
+                member=MemberSummary(id=member_id, name=name, picture_url=picture_url),
+            )
+            for p, member_id, name, picture_url in self.match_repository.get_archived_roster(match_id)
+        ]
+        return MatchRead(**archived.model_dump(), participations=participations)
+
     def get_schedulable_matches(self) -> List[Match]:
         """
         Returns all matches that are potentially active for notifications.
@@ -121,13 +485,250 @@ class MatchService:
         if not match:
             raise HTTPException(status_code=404, detail="Match not found")
 
-        # Apply updates only for provided fields
+        # Apply updates only for provided fields (+ re-derive deadlines if it moved)
         match_data = update_data.model_dump(exclude_unset=True)
-        for key, value in match_data.items():
-            setattr(match, key, value)
+        if match_data.get("max_participants") is not None:
+            self._ensure_capacity_fits([match], match_data["max_participants"])
+        moved = self._apply_match_changes(match, match_data, self._template_for(match))
+        self._retract_moved_notifications([(match.id, moved)])
+
+        # Hand edits of template-driven fields survive later template syncs
+        overridden = set(match_data) & set(TEMPLATE_SYNCED_FIELDS)
+        if overridden - set(match.overridden_fields or []):
+            match.overridden_fields = sorted(set(match.overridden_fields or []) | overridden)
+
+        # Season stats: finalize ghosts / last attended once when the match ends.
+        # Reopening recomputes the season with the match open (so a re-finish never
+        # double-counts, whatever changed while it was FINISHED)
+        finished = match.status == MatchStatus.FINISHED
+        if finished and not match.stats_finalized:
+            self.stats_repository.apply_match_finished(match.id, match.season_id, match.start_time)
+            match.stats_finalized = True
+        elif not finished and match.stats_finalized:
+            match.stats_finalized = False
+            self.match_repository.stage([match])
+            self.stats_repository.recompute(match.season_id)
+
+        if "max_participants" in match_data:
+            self._fill_free_seats([match])
 
         return self.match_repository.update(match)
 
+    def update_template_matches(
+        self, template_id: int, update_data: MatchBulkUpdate
+    ) -> MatchBulkUpdateResult:
+        """
+        Applies one edit to every future match of a template in a SINGLE transaction:
+        either all matches (and their notifications) change, or none do.
+        """
+        template = self.template_repository.get_by_id(template_id)
+        if not template:
+            raise HTTPException(status_code=404, detail="Template not found")
+
+        changes = update_data.model_dump(exclude_unset=True)
+        kickoff = changes.pop("kickoff", None)
+        shift_days = changes.pop("shift_days", None)
+
+        matches = self.match_repository.get_future_by_template(template_id)
+        if changes.get("max_participants") is not None:
+            self._ensure_capacity_fits(matches, changes["max_participants"])
+        moved_by_match = []
+        for match in matches:
+            match_changes = dict(changes)
+            start = ensure_utc(match.start_time)
+            if kickoff:
+                start = datetime.combine(start.date(), kickoff, tzinfo=UTC)
+            if shift_days:
+                start += timedelta(days=shift_days)
+            if kickoff or shift_days:
+                match_changes["start_time"] = start
+            moved_by_match.append(
+                (match.id, self._apply_match_changes(match, match_changes, template))
+            )
+
+        retracted = self._retract_moved_notifications(moved_by_match)
+        if "max_participants" in changes:
+            self._fill_free_seats(matches)
+        self.match_repository.update_many(matches)
+        return MatchBulkUpdateResult(updated=len(matches), retracted_notifications=retracted)
+
+    def sync_template_matches(self, template_id: int, dry_run: bool = True) -> TemplateSyncResult:
+        """
+        Pushes the template's current values onto its future RECRUITING matches.
+        Each match keeps its week (re-dated to the template weekday) and any
+        field edited by hand; a match whose re-dated start is already past is left
+        untouched and reported. `dry_run` only reports the per-match diff; applying
+        writes every changed match with ONE executemany UPDATE, in one transaction
+        with participation start times and retracted notifications.
+        """
+        template = self.template_repository.get_by_id(template_id)
+        if not template:
+            raise HTTPException(status_code=404, detail="Template not found")
+
+        rule = self._template_rule(template)
+        now = datetime.now(UTC)
+        diffs, rows, moved_by_match, moved_starts, raised, skipped_past = [], [], [], [], [], []
+        for match in self.match_repository.get_future_by_template(
+            template_id, statuses=[MatchStatus.RECRUITING]
+        ):
+            overridden = set(match.overridden_fields or [])
+            current = {field: getattr(match, field) for field in TEMPLATE_SYNCED_FIELDS}
+
+            start = ensure_utc(match.start_time)
+            if "start_time" not in overridden:
+                day = start.date()
+                if template.day_of_week is not None:
+                    day += timedelta(days=template.day_of_week - day.weekday())
+                start = datetime.combine(day, template.start_time, tzinfo=UTC)
+                if start < now:
+                    # An earlier weekday can land before today: never re-date into the past
+                    skipped_past.append(match.id)
+                    continue
+            target = {
+                "name": template.name,
+                "description": template.description,
+                "location": template.location,
+                "min_participants": template.min_participants,
+                "max_participants": template.max_participants,
+                **occurrence_at(rule, start)._asdict(),
+            }
+            # Never shrink below the seats already taken: keep the match's capacity
+            over_capacity = (
+                "max_participants" not in overridden
+                and template.max_participants < match.attending_count
+            )
+            if over_capacity:
+                target["max_participants"] = current["max_participants"]
+
+            changes, skipped = {}, []
+            for field in TEMPLATE_SYNCED_FIELDS:
+                old, new = current[field], target[field]
+                if isinstance(old, datetime):
+                    old = ensure_utc(old)
+                if old == new:
+                    continue
+                if field in overridden:
+                    skipped.append(field)
+                else:
+                    changes[field] = FieldChange(old=old, new=new)
+
+            if changes or over_capacity:
+                diffs.append(
+                    MatchSyncDiff(
+                        match_id=match.id,
+                        start_time=start,
+                        changes=changes,
+                        skipped_overrides=skipped,
+                        over_capacity=over_capacity,
+                    )
+                )
+            if changes:
+                # Same keys for every row -> a single executemany statement
+                rows.append({
+                    "id": match.id,
+                    **{f: changes[f].new if f in changes else current[f] for f in TEMPLATE_SYNCED_FIELDS},
+                })
+                moved_by_match.append((
+                    match.id,
+                    {n_type: changes[field].new for n_type, field in MILESTONES.items() if field in changes},
+                ))
+                if "start_time" in changes:
+                    moved_starts.append(match.id)
+                if "max_participants" in changes and changes["max_participants"].new > changes["max_participants"].old:
+                    raised.append(match)
+
+        if dry_run or not rows:
+            return TemplateSyncResult(dry_run=dry_run, matches=diffs, skipped_past=skipped_past)
+
+        self.match_repository.bulk_update(rows)
+        self.match_repository.sync_participation_start_times_for(moved_starts)
+        self._retract_moved_notifications(moved_by_match)
+        self._fill_free_seats(raised)
+        self.match_repository.commit()
+        return TemplateSyncResult(
+            dry_run=False, matches=diffs, updated=len(rows), skipped_past=skipped_past
+        )
+
+    def _apply_match_changes(
+        self, match: Match, changes: dict, template=None
+    ) -> Dict[NotificationType, Optional[datetime]]:
+        """
+        Applies a partial edit WITHOUT committing and returns the milestones whose
+        trigger time changed (-> their new trigger). A moved start_time re-derives end time + deadlines
+        (template offsets if known, otherwise shifted by the same delta); values set
+        explicitly in the same edit win.
+        """
+        before = {n_type: ensure_utc(getattr(match, field)) for n_type, field in MILESTONES.items()}
+        old_start = ensure_utc(match.start_time)
+
+        for key, value in changes.items():
+            setattr(match, key, value)
+
+        new_start = ensure_utc(match.start_time)
+        if "start_time" in changes and new_start != old_start:
+            if template:
+                derived = occurrence_at(self._template_rule(template), new_start)._asdict()
+            else:
+                delta = new_start - old_start
+                derived = {
+                    field: ensure_utc(getattr(match, field)) + delta
+                    for field in ("end_time", *MILESTONES.values())
+                    if getattr(match, field) is not None
+                }
+            for field, value in derived.items():
+                if field != "start_time" and field not in changes:
+                    setattr(match, field, value)
+
+            # Keep the denormalized copy used by member history pages in sync
+            self.match_repository.sync_participation_start_times(match.id, match.start_time)
+
+        after = {n_type: ensure_utc(getattr(match, field)) for n_type, field in MILESTONES.items()}
+        return {n_type: after[n_type] for n_type in MILESTONES if after[n_type] != before[n_type]}
+
+    def _retract_moved_notifications(
+        self, moved_by_match: List[Tuple[int, Dict[NotificationType, Optional[datetime]]]]
+    ) -> int:
+        """
+        A PENDING notification whose milestone moved into the future (or vanished)
+        is deleted; the scheduler re-creates it when the new time comes.
+        Milestones that didn't move, and already-sent notifications, are untouched.
+        One DELETE per milestone type, no commit.
+        """
+        now = datetime.now(UTC)
+        to_retract = {n_type: [] for n_type in MILESTONES}
+        for match_id, moved in moved_by_match:
+            for n_type, trigger in moved.items():
+                if trigger is None or trigger > now:
+                    to_retract[n_type].append(match_id)
+
+        return sum(
+            self.notification_repository.retract_pending(match_ids, n_type)
+            for n_type, match_ids in to_retract.items()
+        )
+
+    def _ensure_capacity_fits(self, matches: List[Match], max_participants: int):
+        """A capacity below the seats already taken would leave matches overbooked."""
+        overbooked = [match.id for match in matches if match.attending_count > max_participants]
+        if overbooked:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "message": "max_participants is below the members already attending.",
+                    "match_ids": overbooked,
+                },
+            )
+
+    def _fill_free_seats(self, matches: List[Match]):
+        """New capacity goes to the waitlist (FIFO) in the same transaction, no commit."""
+        self.match_repository.stage(matches)
+        for match in matches:
+            self.participation_service.fill_free_seats(match.id, match.season_id)
+
+    def _template_for(self, match: Match):
+        if not match.template_id or not self.template_repository:
+            return None
+        return self.template_repository.get_by_id(match.template_id)
+
     def delete_match(self, match_id: int):
         match = self.match_repository.get_by_id(match_id)
         if not match:
@@ -157,10 +758,10 @@ class MatchService:
             # Optional: Warning if season dates don't match match_date, but we allow the override.
             return season.id
 
-        # 2. Priority: Auto-Detect based on Date
-        season = self.season_repository.get_by_date(match_date, club_id)
-        if season:
-            return season.id
+        # 2. Priority: Auto-Detect based on Date (in-memory interval index, no query)
+        season_id = self.season_repository.resolve_season_id(match_date, club_id)
+        if season_id:
+            return season_id
 
         # 3. Failure (Strict Mode)
         # We purposely do NOT fallback to "Active Season" here.
@@ -1,6 +1,8 @@
 from typing import List
+from fastapi import HTTPException
 from app.models import MatchTemplate
-from app.schemas import MatchTemplateCreate
+from app.core.recurrence import RecurrenceRule
+from app.schemas import MatchTemplateCreate, MatchTemplateUpdate
 from app.repositories.match_template_repository import MatchTemplateRepository
 
 class MatchTemplateService:
@@ -9,7 +11,31 @@ class MatchTemplateService:
 
     def create_template(self, template_data: MatchTemplateCreate) -> MatchTemplate:
         template = MatchTemplate.model_validate(template_data)
+        self._validate_recurrence(template)
         return self.repository.create(template)
 
+    def update_template(self, template_id: int, update_data: MatchTemplateUpdate) -> MatchTemplate:
+        """
+        Edits the blueprint only. Already generated matches change when the
+        admin runs the sync (POST /match-templates/{id}/sync).
+        """
+        template = self.repository.get_by_id(template_id)
+        if not template:
+            raise HTTPException(status_code=404, detail="Template not found")
+
+        for key, value in update_data.model_dump(exclude_unset=True).items():
+            setattr(template, key, value)
+        self._validate_recurrence(template)
+        return self.repository.update(template)
+
+    def _validate_recurrence(self, template: MatchTemplate):
+        """Rejects rules the recurrence engine can't expand (bad weekday, dates, ...)."""
+        if template.day_of_week is None:
+            return
+        try:
+            RecurrenceRule.from_template(template)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid recurrence: {e}")
+
     def get_templates_for_club(self, club_id: int) -> List[MatchTemplate]:
         return self.repository.get_by_club(club_id)
\ No newline at end of file
@@ -0,0 +1,159 @@
+from datetime import datetime, UTC
+from typing import Dict, Iterable, List, Optional
+from fastapi import HTTPException
+from pydantic import ValidationError
+from app.core.security_fields import encrypt_text
+from app.core.tabular import Row
+from app.models import (
+    MemberStatus,
+    MembershipStatus,
+    MembershipType,
+    Role,
+    Season,
+    POSITION_BITS,
+    ROLE_BITS,
+    to_mask,
+)
+from app.schemas import MemberImportError, MemberImportResult, MemberImportRow
+from app.repositories.member_repository import MemberRepository
+from app.repositories.membership_repository import MembershipRepository
+from app.repositories.season_repository import SeasonRepository
+from app.services.membership_service import membership_expires_at
+
+IMPORT_CHUNK_SIZE = 500
+# The report is capped so a garbage file can't blow up the response
+MAX_IMPORT_ERRORS = 200
+
+
+class MemberImportService:
+    """
+    Bulk onboarding from a spreadsheet. Rows arrive as a stream and are handled
+    in chunks: validate, one IN query for existing kakao_ids, one multi-row
+    INSERT for members (+ one for memberships), one commit. Memory is bounded
+    by the chunk size, not the file size.
+    """
+
+    def __init__(
+        self,
+        member_repository: MemberRepository,
+        season_repository: SeasonRepository,
+        membership_repository: MembershipRepository,
+    ):
+        self.member_repository = member_repository
+        self.season_repository = season_repository
+        self.membership_repository = membership_repository
+
+    def import_members(
+        self,
+        rows: Iterable[Row],
+        club_id: int,
+        season_id: Optional[int] = None,
+        membership_type: Optional[MembershipType] = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> MemberImportResult:
+        season = None
+        if season_id is not None:
+            season = self.season_repository.get_by_id(season_id)
+            if not season or season.club_id != club_id:
+                raise HTTPException(status_code=404, detail="Season not found")
+
+        result = MemberImportResult()
+        seen: set = set()  # kakao_ids earlier in this file (one str per row: small)
+        chunk: List[tuple] = []
+        for row_number, values in rows:
+            try:
+                row = MemberImportRow.model_validate({k: v for k, v in values.items() if v != ""})
+            except ValidationError as error:
+                self._report(result, row_number, values.get("kakao_id"), _describe(error))
+                continue
+            if row.kakao_id in seen:
+                self._report(result, row_number, row.kakao_id, "Duplicate kakao_id in this file")
+                continue
+            seen.add(row.kakao_id)
+
+            chunk.append((row_number, row))
+            if len(chunk) >= chunk_size:
+                self._flush(chunk, club_id, season, membership_type, result)
+                chunk = []
+
+        self._flush(chunk, club_id, season, membership_type, result)
+        return result
+
+    def _flush(
+        self,
+        chunk: List[tuple],
+        club_id: int,
+        season: Optional[Season],
+        default_type: Optional[MembershipType],
+        result: MemberImportResult,
+    ):
+        if not chunk:
+            return
+
+        existing = self.member_repository.get_existing_kakao_ids(row.kakao_id for _, row in chunk)
+        result.duplicates += len(existing)
+        new_rows = [row for _, row in chunk if row.kakao_id not in existing]
+
+        now = datetime.now(UTC)
+        member_ids = self.member_repository.insert_many(
+            [self._member_values(row, club_id, now) for row in new_rows]
+        )
+        result.created += len(member_ids)
+
+        if season is not None:
+            expiry: Dict[MembershipType, datetime] = {}
+            memberships = []
+            for row in new_rows:
+                type = row.membership_type or default_type
+                if type is None:
+                    continue
+                if type not in expiry:
+                    expiry[type] = membership_expires_at(type, season, now)
+                memberships.append({
+                    "member_id": member_ids[row.kakao_id],
+                    "club_id": season.club_id,
+                    "season_id": season.id,
+                    "type": type,
+                    "status": MembershipStatus.ACTIVE,
+                    "joined_at": now,
+                    "expires_at": expiry[type],
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            result.memberships += self.membership_repository.insert_many(memberships)
+
+        self.member_repository.session.commit()
+
+    def _member_values(self, row: MemberImportRow, club_id: int, now: datetime) -> dict:
+        # Core INSERT: fill what the ORM defaults and mapper events would have
+        roles = [Role.VIEWER.value]
+        positions = [position.value for position in row.positions]
+        return {
+            "kakao_id": row.kakao_id,
+            "name": row.name,
+            "email": row.email,
+            "club_id": club_id,
+            "status": MemberStatus.ACTIVE,
+            "birth_year": row.birth_year,
+            "back_number": row.back_number,
+            "positions": positions,
+            "roles": roles,
+            "encrypted_phone": encrypt_text(row.phone) if row.phone else None,
+            "name_search": row.name.lower(),
+            "role_mask": to_mask(roles, ROLE_BITS),
+            "position_mask": to_mask(positions, POSITION_BITS),
+            "picture_url": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def _report(self, result: MemberImportResult, row: int, kakao_id: Optional[str], message: str):
+        result.error_count += 1
+        if len(result.errors) < MAX_IMPORT_ERRORS:
+            result.errors.append(MemberImportError(row=row, kakao_id=kakao_id or None, message=message))
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+    )
@@ -1,12 +1,18 @@
+from datetime import datetime
+from typing import Optional
 from fastapi import HTTPException
-from app.models import Member, MemberStatus
-from app.schemas import MemberUpdate
+from app.models import AGE_GROUP_SPLIT_AGE, Member, MemberStatus, PlayerPosition, Role
+from app.schemas import MemberUpdate, MemberContactRead, MemberDirectoryPage, MemberRead
+from app.core.utils import decode_cursor, encode_cursor
+from app.core.auth import Principal, token_versions
 from app.repositories.member_repository import MemberRepository
-from app.core.security_fields import encrypt_text
+from app.services.participation_service import ParticipationService
+from app.core.security_fields import decrypt_many, encrypt_text
 
 class MemberService:
-    def __init__(self, repository: MemberRepository):
+    def __init__(self, repository: MemberRepository, participation_service: ParticipationService):
         self.repository = repository
+        self.participation_service = participation_service
 
     def register_member(self, member_data: Member) -> Member:
         # Business Logic: Check for duplicates
@@ -26,6 +32,72 @@ class MemberService:
     def list_members(self) -> list[Member]:
         return self.repository.get_all()
 
+    def list_directory(
+        self,
+        club_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        status: Optional[MemberStatus] = None,
+        role: Optional[Role] = None,
+        position: Optional[PlayerPosition] = None,
+        age_group: Optional[int] = None,
+        q: Optional[str] = None,
+    ) -> MemberDirectoryPage:
+        """Club member directory: filters + name prefix search, alphabetical, keyset paged."""
+        after = None
+        if cursor:
+            try:
+                name_search, member_id = decode_cursor(cursor)
+                after = (str(name_search), int(member_id))
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Age groups are birth-year ranges, so the filter stays a plain comparison
+        born_after = born_in_or_before = None
+        if age_group is not None:
+            split_year = datetime.now().year - AGE_GROUP_SPLIT_AGE
+            if age_group == 1:
+                born_after = split_year
+            else:
+                born_in_or_before = split_year
+
+        # Fetch one extra row to know whether another page exists
+        members = self.repository.get_directory(
+            club_id,
+            limit + 1,
+            status=status,
+            role=role,
+            position=position,
+            born_after=born_after,
+            born_in_or_before=born_in_or_before,
+            name_prefix=q.strip() if q else None,
+            after=after,
+        )
+        has_more = len(members) > limit
+        members = members[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = members[-1]
+            next_cursor = encode_cursor(last.name_search, last.id)
+
+        return MemberDirectoryPage(
+            items=[MemberRead.model_validate(member) for member in members],
+            next_cursor=next_cursor,
+        )
+
+    def list_member_contacts(self, club_id: int, viewer: Principal) -> list[MemberContactRead]:
+        """Club phone book for fellow club members. Phones are decrypted in one batch."""
+        if viewer.club_id != club_id:
+            raise HTTPException(status_code=403, detail="Only club members can see contacts")
+
+        rows = self.repository.get_contacts_by_club_id(club_id)
+        phones = decrypt_many(row.encrypted_phone for row in rows)
+        return [
+            MemberContactRead(id=row.id, name=row.name, back_number=row.back_number, phone=phone)
+            for row, phone in zip(rows, phones)
+        ]
+
     def update_member(self, member_id: int, update_data: MemberUpdate) -> Member:
         member = self.get_member(member_id) # Reuse 'get' logic to check existence
         
@@ -52,4 +124,9 @@ class MemberService:
 
     def remove_member(self, member_id: int):
         member = self.get_member(member_id)
-        self.repository.delete(member)
\ No newline at end of file
+        # Seats the member held go to the waitlist in the same transaction as the DELETE
+        for match_id, season_id in self.repository.delete(member):
+            self.participation_service.fill_free_seats(match_id, season_id)
+        self.repository.commit()
+        # Core DELETE bypasses the session hooks: revoke the member's tokens here
+        token_versions.invalidate(member_id)
\ No newline at end of file
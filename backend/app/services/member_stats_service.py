@@ -0,0 +1,22 @@
+from typing import List, Optional
+from app.models import MemberSeasonStats
+from app.repositories.member_season_stats_repository import MemberSeasonStatsRepository
+
+
+class MemberStatsService:
+    def __init__(self, repository: MemberSeasonStatsRepository):
+        self.repository = repository
+
+    def get_member_season_stats(self, member_id: int, season_id: int) -> MemberSeasonStats:
+        """One row read. Members who never voted get an all-zero row (not a 404)."""
+        stats = self.repository.get(member_id, season_id)
+        if not stats:
+            return MemberSeasonStats(member_id=member_id, season_id=season_id)
+        return stats
+
+    def get_leaderboard(self, season_id: int, limit: int) -> List[MemberSeasonStats]:
+        return self.repository.get_leaderboard(season_id, limit)
+
+    def rebuild(self, season_id: Optional[int] = None) -> int:
+        """Recomputes everything from Participation/Match/Membership. Returns row count."""
+        return self.repository.rebuild(season_id)
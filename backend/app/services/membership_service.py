@@ -1,10 +1,29 @@
 from fastapi import HTTPException
-from typing import List
-from app.models import Membership, MembershipType
+from typing import List, Optional
+from app.models import Membership, MembershipType, Season
 from datetime import datetime, timedelta, UTC
-from app.schemas import MembershipUpdate
+from app.schemas import MembershipUpdate, MembershipRenew, MembershipRenewResult
 from app.repositories.membership_repository import MembershipRepository
 from app.repositories.season_repository import SeasonRepository
+from app.core.utils import ensure_utc
+
+# Short memberships run this long from the day they start
+TRIAL_DAYS = 30
+GUEST_DAYS = 7
+
+
+def membership_expires_at(type: MembershipType, season: Season, now: Optional[datetime] = None) -> datetime:
+    """🧠 Smart Expiration Logic: when a membership of `type` starting `now` ends."""
+    now = now or datetime.now(UTC)
+    if type == MembershipType.REGULAR:
+        # Regular members expire when the season ends
+        return ensure_utc(season.ended_at)
+    if type == MembershipType.ON_TRIAL:
+        # Trials expire in 30 days, but never after the season
+        return min(now + timedelta(days=TRIAL_DAYS), ensure_utc(season.ended_at))
+    # GUEST
+    return now + timedelta(days=GUEST_DAYS)
+
 
 class MembershipService:
     def __init__(self, repository: MembershipRepository, season_repository: SeasonRepository):
@@ -16,19 +35,7 @@ class MembershipService:
         if not season:
             raise ValueError("Invalid Season")
 
-        # 🧠 Smart Expiration Logic
-        if type == MembershipType.REGULAR:
-            # Regular members expire when the season ends
-            expires_at = season.ended_at
-        elif type == MembershipType.ON_TRIAL:
-            # Trials expire in 30 days (example default)
-            expires_at = datetime.now(UTC) + timedelta(days=30)
-            # But cap it at season end
-            if expires_at > season.ended_at:
-                expires_at = season.ended_at
-        else: # GUEST
-            # Guests might expire in 7 days
-            expires_at = datetime.now(UTC) + timedelta(days=7)
+        expires_at = membership_expires_at(type, season)
 
         membership = Membership(
             member_id=member_id,
@@ -40,6 +47,43 @@ class MembershipService:
         )
         return self.repository.create(membership)
 
+    def renew_memberships(self, data: MembershipRenew) -> MembershipRenewResult:
+        """
+        Carries every ACTIVE (or expired-at-season-end) membership of the source season
+        into the target season in one INSERT ... SELECT (one transaction), instead of
+        one request per member.
+        """
+        source = self.season_repository.get_by_id(data.source_season_id)
+        target = self.season_repository.get_by_id(data.target_season_id)
+        if not source or not target:
+            raise HTTPException(status_code=404, detail="Season not found")
+        if source.id == target.id:
+            raise HTTPException(status_code=400, detail="Source and target season must differ")
+        if source.club_id != target.club_id:
+            raise HTTPException(status_code=400, detail="Seasons belong to different clubs")
+
+        types = list(dict.fromkeys(data.types))
+        now = datetime.now(UTC)
+        # Per-type expiry is a constant for this renewal: it becomes a CASE in the INSERT
+        expires_at = {type: membership_expires_at(type, target, now) for type in types}
+
+        eligible = self.repository.count_renewable_in_season(source.id, source.ended_at, types)
+        renewed = self.repository.renew_into_season(
+            source.id, source.ended_at, target.id, target.club_id, expires_at, types, now
+        )
+        self.repository.session.commit()
+
+        return MembershipRenewResult(
+            source_season_id=source.id,
+            target_season_id=target.id,
+            renewed=renewed,
+            skipped=eligible - renewed,
+        )
+
+    def expire_overdue_memberships(self) -> int:
+        """Sweeper: flips every ACTIVE membership past expires_at to EXPIRED."""
+        return self.repository.expire_overdue()
+
     def get_membership(self, membership_id: int) -> Membership:
         membership = self.repository.get_by_id(membership_id)
         if not membership:
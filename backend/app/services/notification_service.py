@@ -30,7 +30,7 @@ class NotificationService:
         self.match_repository = match_repository
         self.membership_repository = membership_repository
         self.participation_repository = participation_repository
-        self.kakao_service = KakaoService()
+        self.kakao_service = kakao_service or KakaoService()
 
     def ensure_pending_task(self, match_id: int, notification_type: NotificationType, trigger_time: datetime | None):
         """
@@ -151,6 +151,11 @@ class NotificationService:
         absent_members_str = ", ".join(stats['ABSENT'])
         ghosts_members_str = ", ".join(stats['GHOST'])
 
+        # Waitlist line only shows up once the match is actually full
+        waitlist_line = ""
+        if stats['WAITLISTED']:
+            waitlist_line = f"⏳ 대기 ({len(stats['WAITLISTED'])}명): {', '.join(stats['WAITLISTED'])}\n"
+
         # 2. Format Components
         app_tz = ZoneInfo(settings.TIMEZONE)
 
@@ -189,6 +194,7 @@ class NotificationService:
                 f"아직 체크하지 않거나 미정인 분들은 출석 여부를 확인 부탁드려요! 🙏\n"
                 f"------------------\n"
                 f"✅ 참석 ({len(stats['ATTENDING'])}명): {attending_members_str}\n"
+                f"{waitlist_line}"
                 f"🤔 미정 ({len(stats['PENDING'])}명): {pending_members_str}\n"
                 f"❌ 불참 ({len(stats['ABSENT'])}명): {absent_members_str}\n"                
                 f"------------------\n"
@@ -204,6 +210,7 @@ class NotificationService:
                 f"최종 참석 인원을 확인해주세요.\n"
                 f"------------------\n"
                 f"✅ 참석 ({len(stats['ATTENDING'])}명): {attending_members_str}\n"
+                f"{waitlist_line}"
                 f"❌ 불참 ({len(stats['ABSENT'])}명): {absent_members_str}\n"
                 f"------------------\n"
                 f"🤔 미정 ({len(stats['PENDING'])}명): {pending_members_str}\n"
@@ -236,6 +243,7 @@ class NotificationService:
             "ATTENDING": [],
             "ABSENT": [],
             "PENDING": [],
+            "WAITLISTED": [],  # Wanted in, but the match was full
             "GHOST": [],  # Non-voters
         }
 
@@ -255,6 +263,8 @@ class NotificationService:
                 stats["ABSENT"].append(name)
             elif p.status == ParticipationStatus.PENDING:
                 stats["PENDING"].append(name)
+            elif p.status == ParticipationStatus.WAITLISTED:
+                stats["WAITLISTED"].append(name)
 
         # 4. Find Ghosts (Eligible - Voted)
         ghost_ids = eligible_member_ids - voted_ids
@@ -1,12 +1,25 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException
-from app.models import Participation, ParticipationStatus
-from app.schemas import ParticipationAdminUpdate
+from app.models import Participation, ParticipationStatus, PlayerPosition, PARTICIPATION_STATUS_BY_CODE
+from app.schemas import (
+    LineupEntry,
+    ParticipationAdminUpdate,
+    ParticipationHistoryPage,
+    ParticipationHistoryItem,
+    MatchSummary,
+    RosterEntry,
+)
+from app.core.utils import encode_cursor, decode_cursor
 from app.repositories.participation_repository import ParticipationRepository
 from app.repositories.match_repository import MatchRepository
 from app.repositories.membership_repository import MembershipRepository
+from app.repositories.member_season_stats_repository import MemberSeasonStatsRepository
+from app.repositories.participation_event_repository import ParticipationEventRepository
+from app.core.group_commit import GroupCommitter
+from sqlmodel import Session
+from sqlalchemy.exc import IntegrityError
 
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
 
 
 class ParticipationService:
@@ -15,10 +28,16 @@ class ParticipationService:
         participation_repository: ParticipationRepository,
         match_repository: MatchRepository,
         membership_repository: MembershipRepository,
+        stats_repository: MemberSeasonStatsRepository,
+        event_repository: ParticipationEventRepository,
+        vote_committer: Optional[GroupCommitter] = None,
     ):
         self.participation_repository = participation_repository
         self.match_repository = match_repository
         self.membership_repository = membership_repository
+        self.stats_repository = stats_repository
+        self.event_repository = event_repository
+        self.vote_committer = vote_committer
 
     def vote(
         self,
@@ -79,7 +98,13 @@ class ParticipationService:
                     status_code=400, detail="Voting is closed (Deadline passed)"
                 )
 
-        # C. Check "PENDING" restriction (Soft Deadline)
+        # C. WAITLISTED is assigned by the system, never chosen
+        if status == ParticipationStatus.WAITLISTED:
+            raise HTTPException(
+                status_code=400, detail="WAITLISTED cannot be voted directly"
+            )
+
+        # D. Check "PENDING" restriction (Soft Deadline)
         if status == ParticipationStatus.PENDING:
             # If soft deadline exists and passed, forbid PENDING
             if match.soft_deadline_at:
@@ -91,18 +116,150 @@ class ParticipationService:
                     )
 
         # 4. Upsert with Comment
-        existing = self.participation_repository.get_participation(match_id, member_id)
-
-        if existing:
-            existing.status = status
-            existing.comment = comment
-            existing.updated_at = now
-            return self.participation_repository.upsert_participation(existing)
-        else:
-            new_vote = Participation(
-                match_id=match_id, member_id=member_id, status=status, comment=comment
+        # (Snapshot what the write needs: `match` belongs to THIS request's session)
+        match_start_time = match.start_time
+        season_id = match.season_id
+
+        def write(service: "ParticipationService") -> Participation:
+            return service._stage_vote(
+                match_id, season_id, match_start_time, member_id, status, comment, now
             )
-            return self.participation_repository.upsert_participation(new_vote)
+
+        if self.vote_committer:
+            # Group Commit: the write joins whatever batch is open right now.
+            # submit() only returns once OUR row is committed (or raises).
+            # Hand our connection back first: parked requests must not starve the pool.
+            self.participation_repository.release_connection()
+            return self.vote_committer.submit(
+                lambda session: write(self._with_session(session))
+            )
+
+        try:
+            participation = write(self)
+        except IntegrityError:
+            # Lost an insert race against our own concurrent vote (double tap):
+            # the row exists now, so a retry takes the update path.
+            self.participation_repository.release_connection()
+            participation = write(self)
+        return self.participation_repository.upsert_participation(participation)
+
+    def _stage_vote(
+        self,
+        match_id: int,
+        season_id: int,
+        match_start_time: datetime,
+        member_id: int,
+        status: ParticipationStatus,
+        comment: Optional[str],
+        now: datetime,
+        force_seat: bool = False,
+        keep_comment: bool = False,
+    ) -> Participation:
+        """
+        Internal Helper: The write half of a vote (validation already passed).
+        Stages the row in the current transaction WITHOUT committing.
+        Capacity: ATTENDING only sticks if a seat can be claimed, else WAITLISTED.
+        """
+        # Locked read: the seat accounting below must start from the committed status
+        existing = self.participation_repository.get_participation_for_update(match_id, member_id)
+        old_status = existing.status if existing else None
+        new_status = self._claim_or_release_seat(match_id, old_status, status, force_seat)
+
+        # Season stats + vote log move in the SAME transaction as the vote itself
+        self.stats_repository.apply_vote(member_id, season_id, old_status, new_status)
+        if old_status != new_status:
+            self.event_repository.append(match_id, member_id, new_status, now)
+
+        participation = existing or Participation(
+            match_id=match_id, member_id=member_id, status=new_status
+        )
+        participation.status = new_status
+        if not keep_comment or comment is not None:
+            participation.comment = comment
+        participation.updated_at = now
+        participation.match_start_time = match_start_time
+        if new_status != ParticipationStatus.WAITLISTED:
+            participation.waitlisted_at = None
+        elif old_status != ParticipationStatus.WAITLISTED:
+            participation.waitlisted_at = now  # Joins the back of the queue
+        participation = self.participation_repository.stage(participation)
+
+        # A seat was freed: hand it to whoever has waited longest
+        if old_status == ParticipationStatus.ATTENDING and new_status != ParticipationStatus.ATTENDING:
+            self._promote_from_waitlist(match_id, season_id, now)
+
+        return participation
+
+    def _claim_or_release_seat(
+        self,
+        match_id: int,
+        old_status: Optional[ParticipationStatus],
+        requested: ParticipationStatus,
+        force: bool,
+    ) -> ParticipationStatus:
+        """Moves the match's attending_count and returns the status that actually applies."""
+        was_attending = old_status == ParticipationStatus.ATTENDING
+
+        if requested != ParticipationStatus.ATTENDING:
+            if was_attending:
+                self.match_repository.release_seat(match_id)
+            return requested
+
+        if was_attending:
+            return ParticipationStatus.ATTENDING
+        if force:
+            self.match_repository.force_claim_seat(match_id)
+            return ParticipationStatus.ATTENDING
+        if self.match_repository.try_claim_seat(match_id):
+            return ParticipationStatus.ATTENDING
+        return ParticipationStatus.WAITLISTED
+
+    def fill_free_seats(self, match_id: int, season_id: int) -> int:
+        """
+        Promotes waitlisted members, oldest first, until the match is full or the
+        queue is empty (e.g. after max_participants was raised). No commit.
+        """
+        now = datetime.now(timezone.utc)
+        promoted = 0
+        while self._promote_from_waitlist(match_id, season_id, now):
+            promoted += 1
+        return promoted
+
+    def _promote_from_waitlist(self, match_id: int, season_id: int, now: datetime) -> bool:
+        """
+        FIFO promotion of the oldest WAITLISTED vote into a free seat.
+        Both steps are conditional UPDATEs, so two concurrent promoters can
+        never double-book a seat or promote the same member twice.
+        """
+        for _ in range(3):  # Only loops if a concurrent transaction took our candidate
+            candidate = self.participation_repository.get_next_waitlisted(match_id)
+            if not candidate:
+                return False
+            if not self.match_repository.try_claim_seat(match_id):
+                return False  # A concurrent vote grabbed the seat first
+            if self.participation_repository.promote_waitlisted(candidate.id):
+                self.stats_repository.apply_vote(
+                    candidate.member_id,
+                    season_id,
+                    ParticipationStatus.WAITLISTED,
+                    ParticipationStatus.ATTENDING,
+                )
+                self.event_repository.append(
+                    match_id, candidate.member_id, ParticipationStatus.ATTENDING, now
+                )
+                return True
+            self.match_repository.release_seat(match_id)
+        return False
+
+    def _with_session(self, session: Session) -> "ParticipationService":
+        """Same service, but with repositories bound to another Session (e.g. a batch)."""
+        return ParticipationService(
+            ParticipationRepository(session),
+            MatchRepository(session),
+            MembershipRepository(session),
+            MemberSeasonStatsRepository(session),
+            ParticipationEventRepository(session),
+        )
 
     def get_my_vote(self, match_id: int, member_id: int) -> Participation | None:
         return self.participation_repository.get_participation(match_id, member_id)
@@ -110,25 +267,112 @@ class ParticipationService:
     def list_member_participations(self, member_id: int) -> Sequence[Participation]:
         return self.participation_repository.get_by_member_id(member_id)
 
+    def list_member_history(
+        self, member_id: int, limit: int, cursor: Optional[str] = None
+    ) -> ParticipationHistoryPage:
+        """
+        Keyset-paginated history (newest match first) with a slim match summary.
+        Cost per page is constant no matter how long the member has been around.
+        """
+        before = None
+        if cursor:
+            try:
+                start_time, participation_id = decode_cursor(cursor)
+                before = (datetime.fromisoformat(start_time), int(participation_id))
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Fetch one extra row to know whether another page exists
+        rows = self.participation_repository.get_history_page(member_id, limit + 1, before)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [
+            ParticipationHistoryItem(
+                id=row.id,
+                match_id=row.match_id,
+                status=row.status,
+                comment=row.comment,
+                updated_at=row.updated_at,
+                match=MatchSummary(
+                    id=row.match_id,
+                    name=row.match_name,
+                    start_time=row.start_time,
+                    location=row.location,
+                    status=row.match_status,
+                ),
+            )
+            for row in rows
+        ]
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.match_start_time, last.id)
+
+        return ParticipationHistoryPage(items=items, next_cursor=next_cursor)
+
     def admin_override_vote(self, data: ParticipationAdminUpdate) -> Participation:
-        # 1. Try to find existing vote using Repo
-        participation = self.participation_repository.get_by_match_id_and_member_id(
-            data.match_id, data.member_id
+        match = self.match_repository.get_by_id(data.match_id)
+        if not match:
+            raise HTTPException(status_code=404, detail="Match not found")
+
+        # Admin may overbook: the seat is taken even if the match is full
+        participation = self._stage_vote(
+            data.match_id,
+            match.season_id,
+            match.start_time,
+            data.member_id,
+            data.status,
+            data.comment,
+            datetime.now(timezone.utc),
+            force_seat=True,
+            keep_comment=True,
         )
 
-        if participation:
-            # 2. Update existing
-            participation.status = data.status
-            if data.comment is not None:
-                participation.comment = data.comment
-        else:
-            # 3. Create new instance
-            participation = Participation(
-                match_id=data.match_id,
-                member_id=data.member_id,
-                status=data.status,
-                comment=data.comment
+        # Save using Repo (Handling session.add/commit/refresh internally)
+        return self.participation_repository.save(participation)
+
+    def get_lineup(self, match_id: int, positions: Sequence[PlayerPosition] = ()) -> List[LineupEntry]:
+        """Who is ATTENDING, filtered by position in SQL (e.g. "all GKs for Tuesday")."""
+        if not self.match_repository.get_by_id(match_id):
+            raise HTTPException(status_code=404, detail="Match not found")
+        members = self.participation_repository.get_attending_members(match_id, positions)
+        return [LineupEntry.model_validate(member) for member in members]
+
+    def replay_roster(self, match_id: int, as_of: datetime) -> List[RosterEntry]:
+        """
+        Rebuilds the roster of a match as it stood at `as_of`, from the vote log.
+        Compacted matches only keep each member's FINAL status, so for them the
+        replay is exact after the last change and approximate before it.
+        Archived matches (closed seasons) are always compacted, so they replay too.
+        """
+        if not (
+            self.match_repository.get_by_id(match_id)
+            or self.match_repository.get_archived(match_id)
+        ):
+            raise HTTPException(status_code=404, detail="Match not found")
+
+        roster = {
+            e.member_id: RosterEntry(
+                member_id=e.member_id,
+                status=PARTICIPATION_STATUS_BY_CODE[e.status_code],
+                changed_at=e.created_at,
+            )
+            for e in self.event_repository.get_latest_events_as_of(match_id, as_of)
+        }
+        for summary in self.event_repository.get_summaries_as_of(match_id, as_of):
+            if summary.member_id in roster:
+                continue  # A raw event newer than the compaction wins
+            roster[summary.member_id] = RosterEntry(
+                member_id=summary.member_id,
+                status=PARTICIPATION_STATUS_BY_CODE[summary.final_status_code],
+                changed_at=summary.last_changed_at,
+                compacted=True,
             )
+        return sorted(roster.values(), key=lambda entry: entry.member_id)
 
-        # 4. Save using Repo (Handling session.add/commit/refresh internally)
-        return self.participation_repository.save(participation)
\ No newline at end of file
+    def compact_vote_events(self, older_than_days: int = 30) -> int:
+        """Folds the vote log of matches FINISHED more than N days ago into summaries."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        return self.event_repository.compact_finished(cutoff)
@@ -1,16 +1,35 @@
+from datetime import datetime, UTC
+from typing import List, Tuple
 from fastapi import HTTPException
 from app.models import Season
 from app.repositories.season_repository import SeasonRepository
-from app.schemas import SeasonCreate
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.participation_event_repository import ParticipationEventRepository
+from app.schemas import SeasonCreate, SeasonCloseResult
 
 class SeasonService:
-    def __init__(self, season_repo: SeasonRepository):
+    def __init__(
+        self,
+        season_repo: SeasonRepository,
+        archive_repo: ArchiveRepository,
+        event_repo: ParticipationEventRepository,
+    ):
         self.season_repo = season_repo
+        self.archive_repo = archive_repo
+        self.event_repo = event_repo
 
     def create_season(self, club_id: int, data: SeasonCreate) -> Season:
         if data.started_at >= data.ended_at:
             raise HTTPException(status_code=400, detail="Start date must be before end date")
-        
+
+        # Overlaps would make date -> season resolution ambiguous
+        overlapping = self.season_repo.get_index(club_id).overlapping(data.started_at, data.ended_at)
+        if overlapping:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Season overlaps existing season(s): {overlapping}",
+            )
+
         season = Season(
             club_id=club_id,
             **data.model_dump()
@@ -30,4 +49,28 @@ class SeasonService:
         season = self.season_repo.get_by_id(season_id)
         if not season:
             raise HTTPException(status_code=404, detail="Season not found")
-        return season
\ No newline at end of file
+        return season
+
+    def get_overlapping_seasons(self, club_id: int) -> List[Tuple[int, int]]:
+        """Pairs of season ids whose date ranges overlap (legacy data check)."""
+        return self.season_repo.get_index(club_id).overlaps()
+
+    def close_season(self, season_id: int) -> SeasonCloseResult:
+        """
+        Closes a season and moves its FINISHED matches (+ participations and
+        notifications) to the archive tables in one transaction. Reads that reach
+        into the past (history, calendar, match detail) union the archive.
+        Unfinished matches stay in the hot tables. Safe to re-run.
+        """
+        season = self.get_season_by_id(season_id)
+
+        match_ids = self.archive_repo.get_archivable_match_ids(season_id)
+        if match_ids:
+            # Raw vote events reference the hot matches: fold them into summaries first
+            self.event_repo.fold_matches(match_ids)
+            self.archive_repo.archive_matches(match_ids)
+
+        season.is_active = False
+        season.archived_at = season.archived_at or datetime.now(UTC)
+        self.season_repo.update(season)
+        return SeasonCloseResult(season_id=season.id, archived_matches=len(match_ids))
@@ -0,0 +1,122 @@
+"""
+Member Listing Benchmark 📇
+
+Times `GET /members/` for a club of N members who all have a phone number:
+- before : every row decrypted while serializing (the old computed `phone`)
+- after  : the public list, no phone, no decryption
+- contacts (cold / warm) : the phone book, one batch decrypt + ciphertext cache
+
+Runs the real FastAPI app in-process against a local SQLite file.
+
+Usage (from backend/):
+    uv run python -m benchmarks.member_listing --members 300 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# The app reads these at import time, so set them BEFORE importing `app.*`
+_DB_PATH = Path(tempfile.gettempdir()) / "football_club_member_listing.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("SECRET_KEY", "member-listing-benchmark")
+
+from fastapi import Depends  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.db import get_session  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.dependencies import get_member_service  # noqa: E402
+from app.core.security_fields import _decrypt_cached  # noqa: E402
+from app.models import Club, Member, MemberStatus  # noqa: E402
+from app.schemas import MemberMeRead  # noqa: E402
+from app.services.member_service import MemberService  # noqa: E402
+
+
+def build_engine():
+    if _DB_PATH.exists():
+        _DB_PATH.unlink()
+    engine = create_engine(os.environ["DATABASE_URL"], connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def seed(engine, n_members: int):
+    with Session(engine) as session:
+        club = Club(name="Listing FC")
+        session.add(club)
+        session.flush()
+
+        members = []
+        for i in range(n_members):
+            member = Member(
+                kakao_id=f"listing-{i}", name=f"Player {i}", status=MemberStatus.ACTIVE, club_id=club.id
+            )
+            member.phone = f"010-{i // 10000:04d}-{i % 10000:04d}"
+            members.append(member)
+        session.add_all(members)
+        session.commit()
+        return club.id, members[0].id
+
+
+def legacy_list(service: MemberService = Depends(get_member_service)):
+    """What `GET /members/` cost when `phone` was a computed field on Member."""
+    return service.list_members()
+
+
+def time_get(client, url: str, repeat: int, headers=None, cold: bool = False) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        if cold:
+            _decrypt_cached.cache_clear()
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.text
+    return timings
+
+
+def run(n_members: int, repeat: int):
+    engine = build_engine()
+    club_id, viewer_id = seed(engine, n_members)
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    app.add_api_route("/_benchmark/members-with-phones", legacy_list, response_model=List[MemberMeRead])
+    client = TestClient(app)
+    token = jwt.encode({"sub": str(viewer_id)}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = {
+        "before (decrypt every row)": time_get(client, "/_benchmark/members-with-phones", repeat, cold=True),
+        "after  (public list)": time_get(client, "/members/", repeat),
+        "contacts, cold cache": time_get(client, f"/members/club/{club_id}/contacts", repeat, headers, cold=True),
+        "contacts, warm cache": time_get(client, f"/members/club/{club_id}/contacts", repeat, headers),
+    }
+    app.dependency_overrides.clear()
+
+    print(f"📇 Member listing: {n_members} members with phones, {repeat} requests each")
+    for label, timings in results.items():
+        print(f"   {label:28}: median {statistics.median(timings):8.2f} ms   best {min(timings):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark member list serialization with encrypted phones.")
+    parser.add_argument("--members", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.members, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Recurrence Expansion Benchmark 🔁
+
+Expands one year of occurrences for many templates (weekly, biweekly, monthly
+nth / last weekday, with exclusion dates) and reports how long it takes.
+Pure in-memory: no database, no app startup.
+
+Usage (from backend/):
+    uv run python -m benchmarks.recurrence_expansion --templates 100 --repeat 20
+"""
+import argparse
+import random
+import statistics
+import time as clock
+from datetime import date, datetime, time, timedelta, UTC
+
+from app.core.recurrence import RecurrenceRule, expand
+
+
+def build_rules(n_templates: int, seed: int = 7):
+    rng = random.Random(seed)
+    season_start = date(2025, 1, 1)
+    rules = []
+    for i in range(n_templates):
+        kind = i % 4
+        exclusions = frozenset(
+            season_start + timedelta(days=rng.randrange(365)) for _ in range(rng.randrange(6))
+        )
+        rules.append(
+            RecurrenceRule(
+                weekday=rng.randrange(7),
+                start_time=time(rng.randrange(6, 22), rng.choice((0, 30))),
+                interval_weeks=2 if kind == 1 else 1,
+                week_of_month={2: rng.choice((1, 2, 3, 4)), 3: -1}.get(kind),
+                anchor=season_start + timedelta(days=rng.randrange(14)),
+                exclusions=exclusions,
+                soft_deadline_hours_before=48,
+            )
+        )
+    return rules
+
+
+def run(n_templates: int, repeat: int):
+    rules = build_rules(n_templates)
+    window_start = datetime(2025, 1, 1, tzinfo=UTC)
+    window_end = datetime(2025, 12, 31, 23, 59, tzinfo=UTC)
+
+    timings, total = [], 0
+    for _ in range(repeat):
+        started = clock.perf_counter()
+        total = sum(len(expand(rule, window_start, window_end)) for rule in rules)
+        timings.append((clock.perf_counter() - started) * 1000)
+
+    print(f"🔁 Recurrence expansion: {n_templates} templates x 1 year ({total} occurrences)")
+    print(f"   median : {statistics.median(timings):8.2f} ms")
+    print(f"   best   : {min(timings):8.2f} ms")
+    print(f"   per occ: {statistics.median(timings) * 1000 / max(total, 1):8.2f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark template recurrence expansion.")
+    parser.add_argument("--templates", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.templates, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Vote-Burst Load Harness 🗳️
+
+Replays "the POLLING_START card just hit the group chat": N members vote on
+the same match at (almost) the same time. Runs the real FastAPI app against a
+local SQLite file and a stubbed Kakao service, then reports latency & throughput.
+
+Usage (from backend/):
+    uv run python -m benchmarks.vote_burst --members 300 --concurrency 32
+    uv run python -m benchmarks.vote_burst --members 300 --concurrency 32 --group-commit
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+# The app reads these at import time, so set them BEFORE importing `app.*`
+_DB_PATH = Path(tempfile.gettempdir()) / "football_club_vote_burst.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("SECRET_KEY", "vote-burst-benchmark")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.db import get_session  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.dependencies import get_kakao_service, get_vote_committer  # noqa: E402
+from app.core.group_commit import GroupCommitter  # noqa: E402
+from app.models import (  # noqa: E402
+    Club, Member, MemberStatus, Season, Membership, MembershipStatus, Match, MatchStatus,
+)
+
+
+class StubKakaoService:
+    """Never leaves the machine. Records what would have been sent."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_text_to_me(self, access_token: str, message: str):
+        self.sent.append(message)
+        return {"result_code": 0}
+
+
+def build_engine():
+    if _DB_PATH.exists():
+        _DB_PATH.unlink()
+
+    engine = create_engine(
+        os.environ["DATABASE_URL"],
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+
+    # WAL lets readers proceed while a vote is being written
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def seed(engine, n_members: int):
+    """One club, one season, one open match, N members with ACTIVE memberships."""
+    now = datetime.now(UTC)
+    with Session(engine) as session:
+        club = Club(name="Burst FC")
+        session.add(club)
+        session.flush()
+
+        season = Season(
+            name="Burst Season",
+            club_id=club.id,
+            started_at=now - timedelta(days=30),
+            ended_at=now + timedelta(days=30),
+        )
+        session.add(season)
+        session.flush()
+
+        match = Match(
+            club_id=club.id,
+            season_id=season.id,
+            name="Burst Match",
+            location="Stadium",
+            start_time=now + timedelta(days=2),
+            end_time=now + timedelta(days=2, hours=2),
+            polling_start_at=now - timedelta(hours=1),
+            hard_deadline_at=now + timedelta(days=1),
+            min_participants=10,
+            max_participants=n_members,
+            status=MatchStatus.RECRUITING,
+        )
+        session.add(match)
+
+        members = [
+            Member(kakao_id=f"burst-{i}", name=f"Player {i}", status=MemberStatus.ACTIVE)
+            for i in range(n_members)
+        ]
+        session.add_all(members)
+        session.flush()
+
+        session.add_all(
+            Membership(
+                member_id=m.id,
+                club_id=club.id,
+                season_id=season.id,
+                status=MembershipStatus.ACTIVE,
+                expires_at=season.ended_at,
+            )
+            for m in members
+        )
+        session.commit()
+        return match.id, [m.id for m in members]
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run(n_members: int, concurrency: int, group_commit: bool, window_ms: int):
+    engine = build_engine()
+    match_id, member_ids = seed(engine, n_members)
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    committer = GroupCommitter(engine, window_ms=window_ms) if group_commit else None
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_kakao_service] = StubKakaoService
+    app.dependency_overrides[get_vote_committer] = lambda: committer
+
+    # No `with` block: we don't want the lifespan (scheduler) to start
+    client = TestClient(app)
+
+    def cast(member_id: int):
+        token = jwt.encode({"sub": str(member_id)}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        started = time.perf_counter()
+        response = client.post(
+            f"/participations/matches/{match_id}/vote",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"status": "ATTENDING"},
+        )
+        return time.perf_counter() - started, response.status_code
+
+    wall_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(cast, member_ids))
+    wall = time.perf_counter() - wall_started
+
+    app.dependency_overrides.clear()
+
+    latencies = [elapsed * 1000 for elapsed, code in results if code == 200]
+    errors = sum(1 for _, code in results if code != 200)
+
+    mode = f"group-commit ({window_ms}ms window)" if group_commit else "per-request commit"
+    print(f"🗳️  Vote burst: {n_members} members, concurrency {concurrency}, {mode}")
+    if latencies:
+        print(f"   p50 latency : {statistics.median(latencies):8.2f} ms")
+        print(f"   p99 latency : {percentile(latencies, 99):8.2f} ms")
+    print(f"   throughput  : {len(latencies) / wall:8.1f} votes/s")
+    print(f"   errors      : {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a burst of votes on one match.")
+    parser.add_argument("--members", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--group-commit", action="store_true")
+    parser.add_argument("--window-ms", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.members, args.concurrency, args.group_commit, args.window_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
+import os
 import pytest
 from datetime import datetime, timezone, time
 from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel, create_engine
 from jose import jwt
 
+# Local escape hatches (tokenless Kakao logins) for the test run; set before app.* is imported
+os.environ.setdefault("DEV_MODE", "true")
+os.environ.setdefault("KAKAO_REQUIRE_ACCESS_TOKEN", "false")
+
 from app.main import app
 from app.db import get_session
 from app.models import Member, Club, MemberStatus, Role, Season, Membership, MembershipType, MatchTemplate
 from app.core.config import settings
+from app.core.season_index import season_index
+from app.core.auth import revoked_sessions, token_versions
 
 # -----------------------------------------------------------------------------
 # 1. DATABASE SETUP
@@ -31,6 +38,10 @@ def session_fixture():
     with Session(engine) as session:
         yield session
     SQLModel.metadata.drop_all(engine)
+    # Club ids restart at 1 in every test DB: never reuse another test's seasons
+    season_index.invalidate()
+    token_versions.invalidate()
+    revoked_sessions.invalidate()
 
 @pytest.fixture(name="client")
 def client_fixture(session: Session):
@@ -0,0 +1,144 @@
+import asyncio
+import httpx
+import pytest
+from sqlmodel import select
+from fastapi import HTTPException
+from app.main import app
+from app.core.config import settings
+from app.core.dependencies import get_kakao_token_verifier
+from app.services.kakao_service import KakaoTokenVerifier
+
+
+class StubKakao:
+    """Local stand-in for Kakao's token-info endpoint."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens  # access token -> (kakao user id, expires_in)
+        self.calls = 0
+        self.status = None  # Force a status (e.g. 503) for every call
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(0.01)  # Let concurrent callers pile up
+        if self.status:
+            return httpx.Response(self.status)
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        if token not in self.tokens:
+            return httpx.Response(401, json={"msg": "this access token does not exist", "code": -401})
+        kakao_id, expires_in = self.tokens[token]
+        return httpx.Response(200, json={"id": kakao_id, "expires_in": expires_in, "app_id": 42})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_verifier(stub, **kwargs):
+    return KakaoTokenVerifier(transport=httpx.MockTransport(stub.handler), **kwargs)
+
+
+def test_kakao_token_verifier_caches_coalesces_and_expires():
+    stub = StubKakao({"good": (777, 3600), "short": (888, 60)})
+    clock = FakeClock()
+    verifier = make_verifier(stub, max_entries=2, negative_ttl=30, clock=clock)
+
+    async def scenario():
+        # A burst of the same token: one call to Kakao
+        infos = await asyncio.gather(*(verifier.verify("good") for _ in range(20)))
+        assert {info.kakao_id for info in infos} == {"777"} and stub.calls == 1
+        await verifier.verify("good")
+        assert stub.calls == 1
+
+        # Invalid tokens are remembered too, for negative_ttl
+        for _ in range(2):
+            with pytest.raises(HTTPException) as error:
+                await verifier.verify("bad")
+            assert error.value.status_code == 401
+        assert stub.calls == 2
+        clock.now += 31
+        with pytest.raises(HTTPException):
+            await verifier.verify("bad")
+        assert stub.calls == 3
+
+        # Entries live until the expiry Kakao reported
+        await verifier.verify("short")
+        clock.now += 60
+        await verifier.verify("short")
+        assert stub.calls == 5
+
+        # Bounded: the least recently used entry ("good") was evicted
+        await verifier.verify("good")
+        assert stub.calls == 6
+
+        # Kakao outages are not cached
+        stub.status = 503
+        with pytest.raises(HTTPException) as error:
+            await verifier.verify("unseen")
+        assert error.value.status_code == 502
+        stub.status = None
+        assert (await verifier.verify("good")).kakao_id == "777"
+
+    asyncio.run(scenario())
+
+
+def test_kakao_login_checks_the_access_token(client, test_user, monkeypatch):
+    stub = StubKakao({"user-token": (int(test_user.kakao_id), 3600)})
+    app.dependency_overrides[get_kakao_token_verifier] = lambda: make_verifier(stub, app_id=42)
+
+    login = {"kakao_id": test_user.kakao_id, "name": "Test User", "email": "test@example.com"}
+    assert client.post("/auth/login/kakao", json={**login, "kakao_access_token": "user-token"}).status_code == 200
+    assert client.post("/auth/login/kakao", json={**login, "kakao_access_token": "stolen"}).status_code == 401
+
+    impostor = {**login, "kakao_id": "someone-else", "kakao_access_token": "user-token"}
+    assert client.post("/auth/login/kakao", json=impostor).status_code == 401
+
+    # Without a token: only the local escape hatch (DEV_MODE + requirement off) lets it through
+    assert client.post("/auth/login/kakao", json=login).status_code == 200
+    monkeypatch.setattr(settings, "KAKAO_REQUIRE_ACCESS_TOKEN", True)
+    assert client.post("/auth/login/kakao", json=login).status_code == 401
+    monkeypatch.setattr(settings, "KAKAO_REQUIRE_ACCESS_TOKEN", False)
+    monkeypatch.setattr(settings, "DEV_MODE", False)
+    assert client.post("/auth/login/kakao", json=login).status_code == 401
+
+
+def test_refresh_token_rotation_and_logout(client, session, test_user):
+    from app.core.revocation import BloomFilter
+    from app.models import RefreshToken
+
+    login = {"kakao_id": test_user.kakao_id, "name": "Test User", "email": "test@example.com"}
+    tokens = client.post("/auth/login/kakao", json=login).json()
+    assert tokens["expires_in"] == 30 * 60
+    stored = session.exec(select(RefreshToken)).one()
+    assert stored.token_hash != tokens["refresh_token"]  # Only the hash is kept
+
+    # Rotation: the new pair works, the old refresh token is spent
+    rotated = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    bearer = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert client.get("/participations/me", headers=bearer).status_code == 200
+
+    # Logout revokes the session: its access tokens die at once
+    assert client.post("/auth/logout", json={"refresh_token": rotated["refresh_token"]}).status_code == 204
+    assert client.get("/participations/me", headers=bearer).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 401
+
+    # Replaying a spent token kills the session it belongs to
+    second = client.post("/auth/login/kakao", json=login).json()
+    client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]})
+    reuse = client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]})
+    assert (reuse.status_code, reuse.json()["detail"]) == (401, "Refresh token reuse detected")
+    assert client.get("/participations/me", headers={"Authorization": f"Bearer {second['access_token']}"}).status_code == 401
+
+    # Other sessions are untouched
+    third = client.post("/auth/login/kakao", json=login).json()
+    assert client.get("/participations/me", headers={"Authorization": f"Bearer {third['access_token']}"}).status_code == 200
+
+    bloom = BloomFilter(capacity=1000)
+    for i in range(1000):
+        bloom.add(f"sid-{i}")
+    assert all(f"sid-{i}" in bloom for i in range(1000))
+    assert sum(f"other-{i}" in bloom for i in range(10_000)) < 50
@@ -1,5 +1,11 @@
-from app.models import Club
+from datetime import datetime, UTC
+from app.models import (
+    Club, Match, MatchArchive, Member, Membership, Notification, NotificationArchive, NotificationStatus,
+    NotificationType, Participation, ParticipationArchive, ParticipationStatus, Season
+)
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
 import pytest
 
 def test_create_club_success(session):
@@ -25,4 +31,56 @@ def test_club_name_unique(session, test_club):
         assert True # Constraint worked
     else:
         # If no constraint, strictly speaking this test passes, but maybe warn?
-        assert duplicate_club.id is not None
\ No newline at end of file
+        assert duplicate_club.id is not None
+
+def test_delete_club_cascades_in_the_database(client, session, test_club, test_user, current_season, active_membership):
+    """One DELETE for the club (+ its orphan-prone rows); the database removes the rest and detaches members."""
+    test_user.club_id = test_club.id
+    match = Match(
+        club_id=test_club.id, season_id=current_season.id, name="Old Game", location="Seoul",
+        start_time=datetime(2025, 3, 1, 10, tzinfo=UTC), end_time=datetime(2025, 3, 1, 12, tzinfo=UTC),
+        polling_start_at=datetime(2025, 2, 23, tzinfo=UTC), hard_deadline_at=datetime(2025, 2, 28, tzinfo=UTC),
+        min_participants=10, max_participants=22,
+    )
+    session.add_all([test_user, match])
+    session.commit()
+    session.add_all([
+        Participation(match_id=match.id, member_id=test_user.id, status=ParticipationStatus.ATTENDING,
+                      match_start_time=match.start_time),
+        Notification(match_id=match.id, type=NotificationType.POLLING_START, content="Vote!"),
+    ])
+    # A match of an already closed season, with its archived rows
+    archived = MatchArchive(
+        id=match.id + 1, club_id=test_club.id, season_id=current_season.id, name="Older Game", location="Seoul",
+        start_time=datetime(2025, 2, 1, 10, tzinfo=UTC), end_time=datetime(2025, 2, 1, 12, tzinfo=UTC),
+        polling_start_at=datetime(2025, 1, 26, tzinfo=UTC), hard_deadline_at=datetime(2025, 1, 31, tzinfo=UTC),
+        min_participants=10, max_participants=22,
+    )
+    session.add_all([
+        archived,
+        ParticipationArchive(id=1, match_id=archived.id, member_id=test_user.id, status=ParticipationStatus.ATTENDING,
+                             match_start_time=archived.start_time),
+        NotificationArchive(id=1, match_id=archived.id, type=NotificationType.POLLING_START,
+                            status=NotificationStatus.PUBLISHED, content="Vote!"),
+    ])
+    session.commit()
+
+    statements = []
+    listener = lambda conn, cursor, sql, *args: statements.append(sql)
+    event.listen(session.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert client.delete(f"/clubs/{test_club.id}").status_code == 200
+    finally:
+        event.remove(session.get_bind(), "before_cursor_execute", listener)
+
+    deletes = [sql for sql in statements if sql.startswith("DELETE")]
+    assert [sql.split(" WHERE")[0] for sql in deletes] == [
+        "DELETE FROM participation_event_summary",
+        "DELETE FROM participation_archive",
+        "DELETE FROM notification_archive",
+        "DELETE FROM club",
+    ]
+    session.expire_all()
+    for model in (Season, Membership, Match, Participation, Notification, MatchArchive, ParticipationArchive, NotificationArchive):
+        assert session.exec(select(model)).all() == []
+    assert session.get(Member, test_user.id).club_id is None
@@ -1,5 +1,10 @@
 import pytest
-from datetime import datetime
+from datetime import datetime, time, timedelta, UTC
+from sqlmodel import select
+from app.core.utils import ensure_utc
+from app.models import (
+    Club, Match, MatchStatus, Member, Notification, NotificationType, Participation, ParticipationStatus, Season
+)
 from app.schemas import MatchCreateManual
 from app.services.match_service import MatchService
 from app.repositories.match_repository import MatchRepository
@@ -12,7 +17,7 @@ def test_create_match_manual_season_auto_detect(session, test_club, current_seas
     match_repo = MatchRepository(session)
     template_repo = MatchTemplateRepository(session)
     season_repo = SeasonRepository(session)
-    service = MatchService(match_repo, template_repo, season_repo)
+    service = MatchService(match_repo, template_repo, season_repo, None, None, None)
 
     req = MatchCreateManual(
         club_id=test_club.id,
@@ -30,7 +35,7 @@ def test_create_match_fail_no_season(session, test_club, current_season):
     match_repo = MatchRepository(session)
     template_repo = MatchTemplateRepository(session)
     season_repo = SeasonRepository(session)
-    service = MatchService(match_repo, template_repo, season_repo)
+    service = MatchService(match_repo, template_repo, season_repo, None, None, None)
 
     # Date in 2026 (No season exists in fixture)
     req = MatchCreateManual(
@@ -44,4 +49,278 @@ def test_create_match_fail_no_season(session, test_club, current_season):
     with pytest.raises(HTTPException) as exc:
         service.create_manual_match(req)
     
-    assert "No season exists" in str(exc.value.detail)
\ No newline at end of file
+    assert "No season exists" in str(exc.value.detail)
+
+
+def test_upcoming_summary_counts_and_pages(client, session, test_club, current_season, test_user, normal_user_token_headers):
+    """Slim listing: per-match counts + my vote, keyset paged; roster only on detail."""
+
+    now = datetime.now(UTC)
+    other = Member(kakao_id="other", name="Other")
+    session.add(other)
+    session.commit()
+
+    matches = []
+    for day in (1, 2, 3):
+        match = Match(
+            club_id=test_club.id,
+            season_id=current_season.id,
+            name=f"Match {day}",
+            location="Seoul",
+            start_time=now + timedelta(days=day),
+            end_time=now + timedelta(days=day, hours=2),
+            polling_start_at=now - timedelta(days=1),
+            hard_deadline_at=now + timedelta(hours=day),
+            min_participants=10,
+            max_participants=22,
+        )
+        session.add(match)
+        matches.append(match)
+    session.add(Match(  # Past matches are not listed
+        club_id=test_club.id,
+        season_id=current_season.id,
+        name="Old Match",
+        location="Seoul",
+        start_time=now - timedelta(days=1),
+        end_time=now - timedelta(days=1) + timedelta(hours=2),
+        polling_start_at=now - timedelta(days=3),
+        hard_deadline_at=now - timedelta(days=2),
+        min_participants=10,
+        max_participants=22,
+    ))
+    session.commit()
+
+    first = matches[0]
+    session.add(Participation(match_id=first.id, member_id=test_user.id, status=ParticipationStatus.ATTENDING, match_start_time=first.start_time))
+    session.add(Participation(match_id=first.id, member_id=other.id, status=ParticipationStatus.ABSENT, match_start_time=first.start_time))
+    session.commit()
+
+    url = f"/matches/club/{test_club.id}/summary"
+    response = client.get(url, params={"limit": 2}, headers=normal_user_token_headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert [item["name"] for item in page["items"]] == ["Match 1", "Match 2"]
+    assert "participations" not in page["items"][0]
+
+    head = page["items"][0]
+    assert (head["attending"], head["absent"], head["pending"]) == (1, 1, 0)
+    assert head["my_status"] == "ATTENDING"
+    assert page["items"][1]["my_status"] is None
+
+    response = client.get(url, params={"limit": 2, "cursor": page["next_cursor"]}, headers=normal_user_token_headers)
+    page = response.json()
+    assert [item["name"] for item in page["items"]] == ["Match 3"]
+    assert page["next_cursor"] is None
+
+    bad = client.get(url, params={"cursor": "garbage"}, headers=normal_user_token_headers)
+    assert bad.status_code == 400
+
+    detail = client.get(f"/matches/{first.id}").json()
+    assert len(detail["participations"]) == 2
+
+def test_club_listing_conditional_get(client, session, test_club, current_season, test_user, normal_user_token_headers):
+    """Unchanged listings answer If-None-Match with an empty 304; any vote invalidates."""
+    now = datetime.now(UTC)
+    match = Match(
+        club_id=test_club.id,
+        season_id=current_season.id,
+        name="Cached Match",
+        location="Seoul",
+        start_time=now + timedelta(days=1),
+        end_time=now + timedelta(days=1, hours=2),
+        polling_start_at=now - timedelta(days=1),
+        hard_deadline_at=now + timedelta(hours=12),
+        min_participants=10,
+        max_participants=22,
+    )
+    session.add(match)
+    session.commit()
+
+    url = f"/matches/club/{test_club.id}"
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    session.add(Participation(match_id=match.id, member_id=test_user.id, status=ParticipationStatus.ATTENDING, match_start_time=match.start_time))
+    session.commit()
+
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()[0]["participations"]) == 1
+
+    # Rosters embed member names: a rename invalidates too
+    etag = changed.headers["ETag"]
+    test_user.name = "Renamed User"
+    test_user.updated_at = datetime.now(UTC) + timedelta(seconds=5)
+    session.add(test_user)
+    session.commit()
+    renamed = client.get(url, headers={"If-None-Match": etag})
+    assert renamed.status_code == 200
+    assert renamed.json()[0]["participations"][0]["member"]["name"] == "Renamed User"
+
+    # Per-caller listing: the member is part of the validator
+    summary_url = f"/matches/club/{test_club.id}/summary"
+    mine = client.get(summary_url, headers=normal_user_token_headers)
+    assert mine.headers["ETag"] != changed.headers["ETag"]
+    again = client.get(summary_url, headers={**normal_user_token_headers, "If-None-Match": mine.headers["ETag"]})
+    assert again.status_code == 304
+
+def test_calendar_range_and_ics_feed(client, session, test_club, current_season):
+    """Range query includes past fixtures; the .ics feed streams every match in range."""
+    def add(name, start, status=MatchStatus.RECRUITING):
+        session.add(Match(
+            club_id=test_club.id,
+            season_id=current_season.id,
+            name=name,
+            location="Seoul, Han River",
+            start_time=start,
+            end_time=start + timedelta(hours=2),
+            polling_start_at=start - timedelta(days=7),
+            hard_deadline_at=start - timedelta(days=1),
+            min_participants=10,
+            max_participants=22,
+            status=status,
+        ))
+
+    add("March Match", datetime(2025, 3, 8, 10, 0), MatchStatus.FINISHED)
+    add("March Rainout", datetime(2025, 3, 22, 10, 0), MatchStatus.CANCELLED)
+    add("April Match", datetime(2025, 4, 5, 10, 0))
+    session.commit()
+
+    url = f"/matches/club/{test_club.id}/calendar"
+    march = client.get(url, params={"from": "2025-03-01T00:00:00Z", "to": "2025-04-01T00:00:00Z"})
+    assert march.status_code == 200
+    assert [m["name"] for m in march.json()] == ["March Match", "March Rainout"]
+    assert set(march.json()[0]) == {"id", "name", "location", "start_time", "end_time", "status"}
+
+    finished = client.get(url, params={
+        "from": "2025-03-01T00:00:00Z", "to": "2025-04-01T00:00:00Z", "status": "FINISHED",
+    })
+    assert [m["name"] for m in finished.json()] == ["March Match"]
+
+    backwards = client.get(url, params={"from": "2025-04-01T00:00:00Z", "to": "2025-03-01T00:00:00Z"})
+    assert backwards.status_code == 400
+
+    feed = client.get(f"{url}.ics", params={"from": "2025-01-01T00:00:00Z", "to": "2025-12-31T00:00:00Z"})
+    assert feed.status_code == 200
+    assert feed.headers["content-type"].startswith("text/calendar")
+    body = feed.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert body.count("BEGIN:VEVENT") == 3
+    assert "DTSTART:20250308T100000Z" in body
+    assert "LOCATION:Seoul\\, Han River" in body
+    assert "STATUS:CANCELLED" in body
+
+def test_moving_a_match_recomputes_deadlines_and_retracts_notifications(client, session, test_club, current_season, test_match_template):
+    """Template offsets drive the new deadlines; only moved, unsent milestones are retracted."""
+    now = datetime.now(UTC).replace(microsecond=0)
+    start = now + timedelta(days=3)
+
+    def add_match(start_time, template_id=None):
+        match = Match(
+            club_id=test_club.id,
+            season_id=current_season.id,
+            template_id=template_id,
+            name="Friday Night Football",
+            location="Han River Park",
+            start_time=start_time,
+            end_time=start_time + timedelta(minutes=120),
+            polling_start_at=start_time - timedelta(hours=144),
+            soft_deadline_at=start_time - timedelta(hours=48),
+            hard_deadline_at=start_time - timedelta(hours=24),
+            min_participants=10,
+            max_participants=22,
+        )
+        session.add(match)
+        session.commit()
+        return match
+
+    match = add_match(start, test_match_template.id)
+    session.add(Notification(match_id=match.id, type=NotificationType.POLLING_START, content=""))
+    session.add(Notification(match_id=match.id, type=NotificationType.MANUAL, content="hi"))
+    session.commit()
+
+    new_start = now + timedelta(days=10)
+    response = client.patch(f"/matches/{match.id}", json={"start_time": new_start.isoformat()})
+    assert response.status_code == 200
+    session.refresh(match)
+    assert ensure_utc(match.end_time) == new_start + timedelta(minutes=120)
+    assert ensure_utc(match.polling_start_at) == new_start - timedelta(hours=144)
+    assert ensure_utc(match.hard_deadline_at) == new_start - timedelta(hours=24)
+    # Polling now opens in the future: the queued announcement is pulled back
+    remaining = session.exec(select(Notification.type).where(Notification.match_id == match.id)).all()
+    assert remaining == [NotificationType.MANUAL]
+
+    # Manual match (no template): deadlines keep their distance to kickoff
+    manual = add_match(start)
+    client.patch(f"/matches/{manual.id}", json={"start_time": (start + timedelta(days=1)).isoformat()})
+    session.refresh(manual)
+    assert ensure_utc(manual.soft_deadline_at) == start + timedelta(days=1) - timedelta(hours=48)
+
+    # Bulk: every future match of the template, one transaction
+    second = add_match(now + timedelta(days=17), test_match_template.id)
+    result = client.patch(
+        f"/matches/template/{test_match_template.id}/future",
+        json={"kickoff": "20:30:00", "location": "Jamsil"},
+    ).json()
+    assert result == {"updated": 2, "retracted_notifications": 0}
+    for moved in (match, second):
+        session.refresh(moved)
+        assert ensure_utc(moved.start_time).time() == time(20, 30)
+        assert moved.location == "Jamsil"
+        assert ensure_utc(moved.start_time) - ensure_utc(moved.hard_deadline_at) == timedelta(hours=24)
+
+
+def test_double_booking_detection(client, session, test_club, current_season):
+    """Same club or same venue at overlapping times is a 409; the season report lists the pairs."""
+    other_club = Club(name="Rival FC")
+    session.add(other_club)
+    session.commit()
+    other_season = Season(
+        club_id=other_club.id, name="2025", started_at=current_season.started_at, ended_at=current_season.ended_at
+    )
+    session.add(other_season)
+    session.commit()
+    session.add(Match(
+        club_id=other_club.id, season_id=other_season.id, name="Rival Kickoff", location="Han River Park",
+        start_time=datetime(2025, 9, 5, 19, 0, tzinfo=UTC), end_time=datetime(2025, 9, 5, 21, 0, tzinfo=UTC),
+        polling_start_at=datetime(2025, 8, 30, tzinfo=UTC), hard_deadline_at=datetime(2025, 9, 4, tzinfo=UTC),
+        min_participants=10, max_participants=22,
+    ))
+    session.commit()
+
+    def body(location, hour, **extra):
+        return {
+            "club_id": test_club.id, "name": "Friday Game", "location": location,
+            "start_time": f"2025-09-05T{hour:02d}:00:00Z", "duration_minutes": 120, **extra,
+        }
+
+    # Back-to-back is fine: intervals are half-open
+    first = client.post("/matches/", json=body("Seoul Arena", 17))
+    assert first.status_code == 200
+
+    # Own club overlaps
+    clash = client.post("/matches/", json=body("Seoul Arena", 18))
+    assert clash.status_code == 409
+    assert [c["kind"] for c in clash.json()["detail"]["conflicts"]] == ["club"]
+
+    # Another club holds the venue (case / whitespace don't matter)
+    venue = client.post("/matches/", json=body("  han river park ", 19))
+    assert venue.status_code == 409
+    assert venue.json()["detail"]["conflicts"][0]["match_id"] is not None
+    assert venue.json()["detail"]["conflicts"][0]["kind"] == "location"
+
+    forced = client.post("/matches/", json=body("Han River Park", 18, allow_conflicts=True))
+    assert forced.status_code == 200
+
+    report = client.get(
+        f"/matches/club/{test_club.id}/conflicts", params={"season_id": current_season.id}
+    ).json()
+    assert sorted(pair["first"]["kind"] for pair in report) == ["club", "location"]
@@ -1,4 +1,9 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta, UTC
+from freezegun import freeze_time
+from sqlmodel import select
+from app.core.recurrence import RecurrenceRule, expand
+from app.core.utils import ensure_utc
+from app.models import Match
 from app.repositories.match_repository import MatchRepository
 from app.repositories.season_repository import SeasonRepository
 from app.repositories.match_template_repository import MatchTemplateRepository
@@ -15,7 +20,7 @@ def test_create_match_from_template(session, test_club, current_season, test_mat
     template_repo = MatchTemplateRepository(session)
     
     # Note: We pass None for other repos not needed for this specific test
-    service = MatchService(match_repo, template_repo, season_repo)
+    service = MatchService(match_repo, template_repo, season_repo, None, None, None)
 
     # 1. Define Request (Date INSIDE current_season)
     match_date = datetime(2025, 5, 20, 19, 0) # May 20, 2025
@@ -34,4 +39,179 @@ def test_create_match_from_template(session, test_club, current_season, test_mat
     assert match.id is not None
     assert match.name == test_match_template.name
     assert match.season_id == current_season.id
-    assert match.start_time == match_date
\ No newline at end of file
+    assert match.start_time == match_date
+
+
+def test_recurrence_rules_expand_arithmetically():
+    """Weekly, biweekly, nth / last weekday of the month and exclusion dates."""
+    start = datetime(2025, 3, 1, tzinfo=UTC)
+    end = datetime(2025, 3, 31, 23, 59, tzinfo=UTC)
+
+    # Every Saturday 10:00, except March 15
+    weekly = RecurrenceRule(weekday=5, start_time=time(10, 0), exclusions=frozenset({date(2025, 3, 15)}))
+    assert [o.start_time.day for o in expand(weekly, start, end)] == [1, 8, 22, 29]
+
+    # Biweekly, cycle running through March 8
+    biweekly = RecurrenceRule(weekday=5, start_time=time(10, 0), interval_weeks=2, anchor=date(2025, 3, 8))
+    assert [o.start_time.day for o in expand(biweekly, start, end)] == [8, 22]
+
+    # 2nd and last Sunday of each month
+    second = RecurrenceRule(weekday=6, start_time=time(10, 0), week_of_month=2)
+    last = RecurrenceRule(weekday=6, start_time=time(10, 0), week_of_month=-1)
+    quarter_end = datetime(2025, 5, 31, 23, 59, tzinfo=UTC)
+    assert [o.start_time.date() for o in expand(second, start, quarter_end)] == [
+        date(2025, 3, 9), date(2025, 4, 13), date(2025, 5, 11)
+    ]
+    assert [o.start_time.date() for o in expand(last, start, quarter_end)] == [
+        date(2025, 3, 30), date(2025, 4, 27), date(2025, 5, 25)
+    ]
+
+    # Deadlines are precomputed offsets from the start
+    first = expand(weekly, start, end)[0]
+    assert first.end_time - first.start_time == timedelta(minutes=120)
+    assert first.start_time - first.polling_start_at == timedelta(hours=144)
+    assert first.soft_deadline_at is None
+    assert first.start_time - first.hard_deadline_at == timedelta(hours=24)
+
+
+def test_generate_season_matches_from_template(client, session, current_season, test_match_template):
+    """Preview, then bulk-create a whole season; re-running only fills gaps."""
+    test_match_template.excluded_dates = ["2025-08-15"]
+    session.add(test_match_template)
+    session.commit()
+
+    preview = client.get(
+        f"/match-templates/{test_match_template.id}/occurrences",
+        params={"season_id": current_season.id},
+    ).json()
+    # Fridays of 2025 = 52, minus the excluded one
+    assert len(preview) == 51
+    assert preview[0]["start_time"].startswith("2025-01-03T19:00:00")
+    assert not any(o["exists"] for o in preview)
+
+    body = {"template_id": test_match_template.id, "season_id": current_season.id}
+    assert client.post("/matches/generate/season", json=body).json() == {"created": 51, "skipped": 0, "conflicts": []}
+    assert client.post("/matches/generate/season", json=body).json() == {"created": 0, "skipped": 51, "conflicts": []}
+
+    preview = client.get(
+        f"/match-templates/{test_match_template.id}/occurrences",
+        params={"season_id": current_season.id},
+    ).json()
+    assert all(o["exists"] for o in preview)
+
+
+def test_one_off_template_cannot_be_expanded_over_a_season(client, session, current_season, test_match_template):
+    """A template without a weekday has no series: preview and bulk generation refuse it."""
+    test_match_template.day_of_week = None
+    session.add(test_match_template)
+    session.commit()
+
+    preview = client.get(
+        f"/match-templates/{test_match_template.id}/occurrences",
+        params={"season_id": current_season.id},
+    )
+    assert preview.status_code == 400
+
+    body = {"template_id": test_match_template.id, "season_id": current_season.id}
+    assert client.post("/matches/generate/season", json=body).status_code == 400
+    assert session.exec(select(Match)).all() == []
+
+    # A single match on a chosen date still works
+    created = client.post(
+        "/matches/generate",
+        json={"template_id": test_match_template.id, "match_date": "2025-05-20", "season_id": current_season.id},
+    )
+    assert created.status_code == 200
+
+
+def test_template_sync_previews_and_applies_without_touching_overrides(client, session, test_club, current_season, test_match_template):
+    """Dry run reports the diff; apply rewrites future matches except hand-edited fields."""
+    now = datetime.now(UTC)
+    friday = (now + timedelta(days=7 + (4 - now.weekday()) % 7)).date()
+
+    matches = []
+    for week in range(2):
+        match = Match(
+            club_id=test_club.id,
+            season_id=current_season.id,
+            template_id=test_match_template.id,
+            name=test_match_template.name,
+            location=test_match_template.location,
+            start_time=datetime.combine(friday + timedelta(weeks=week), time(19, 0), tzinfo=UTC),
+            end_time=datetime.combine(friday + timedelta(weeks=week), time(21, 0), tzinfo=UTC),
+            polling_start_at=datetime.combine(friday + timedelta(weeks=week), time(19, 0), tzinfo=UTC) - timedelta(hours=144),
+            hard_deadline_at=datetime.combine(friday + timedelta(weeks=week), time(19, 0), tzinfo=UTC) - timedelta(hours=24),
+            min_participants=10,
+            max_participants=22,
+        )
+        session.add(match)
+        matches.append(match)
+    session.commit()
+    first_id, second_id = matches[0].id, matches[1].id
+
+    # The second match got its location changed by hand
+    client.patch(f"/matches/{second_id}", json={"location": "Indoor Hall"})
+
+    patched = client.patch(
+        f"/match-templates/{test_match_template.id}",
+        json={"location": "Jamsil", "start_time": "20:00:00", "max_participants": 18},
+    )
+    assert patched.status_code == 200
+
+    preview = client.post(f"/match-templates/{test_match_template.id}/sync").json()
+    assert preview["dry_run"] is True and preview["updated"] == 0
+    by_id = {diff["match_id"]: diff for diff in preview["matches"]}
+    assert by_id[first_id]["changes"]["location"]["new"] == "Jamsil"
+    assert "location" not in by_id[second_id]["changes"]
+    assert by_id[second_id]["skipped_overrides"] == ["location"]
+    session.expire_all()
+    assert session.get(Match, first_id).location == "Han River Park"  # Nothing written yet
+
+    applied = client.post(
+        f"/match-templates/{test_match_template.id}/sync", params={"dry_run": "false"}
+    ).json()
+    assert applied["updated"] == 2
+
+    session.expire_all()
+    first, second = session.get(Match, first_id), session.get(Match, second_id)
+    assert first.location == "Jamsil"
+    assert second.location == "Indoor Hall"
+    for match in (first, second):
+        assert match.max_participants == 18
+        assert ensure_utc(match.start_time).time() == time(20, 0)
+        assert ensure_utc(match.start_time) - ensure_utc(match.soft_deadline_at) == timedelta(hours=48)
+
+    # Already in sync: nothing left to do
+    assert client.post(f"/match-templates/{test_match_template.id}/sync").json()["matches"] == []
+
+
+def test_template_sync_never_moves_a_match_into_the_past(client, session, test_club, current_season, test_match_template):
+    """Friday -> Monday: this week's Friday match would land on a past Monday, so it is skipped."""
+    ids = []
+    for friday in (date(2025, 5, 16), date(2025, 5, 23)):
+        start = datetime.combine(friday, time(19, 0), tzinfo=UTC)
+        match = Match(
+            club_id=test_club.id, season_id=current_season.id, template_id=test_match_template.id,
+            name=test_match_template.name, location=test_match_template.location,
+            start_time=start, end_time=start + timedelta(hours=2),
+            polling_start_at=start - timedelta(hours=144), hard_deadline_at=start - timedelta(hours=24),
+            min_participants=10, max_participants=22,
+        )
+        session.add(match)
+        session.commit()
+        ids.append(match.id)
+
+    test_match_template.day_of_week = 0
+    session.add(test_match_template)
+    session.commit()
+
+    with freeze_time("2025-05-15 12:00:00"):
+        applied = client.post(
+            f"/match-templates/{test_match_template.id}/sync", params={"dry_run": "false"}
+        ).json()
+    assert applied["skipped_past"] == [ids[0]]
+    assert [diff["match_id"] for diff in applied["matches"]] == [ids[1]]
+
+    session.expire_all()
+    assert ensure_utc(session.get(Match, ids[0]).start_time).date() == date(2025, 5, 16)
+    assert ensure_utc(session.get(Match, ids[1]).start_time).date() == date(2025, 5, 19)
@@ -1,4 +1,16 @@
-from app.models import Role
+import io
+import zipfile
+import pytest
+from cryptography.fernet import Fernet
+from sqlmodel import select
+from app.core import security_fields
+from app.core.config import settings
+from app.core.security_fields import decrypt_many, encrypt_text
+from datetime import datetime, UTC
+from app.models import Club, Member, MemberStatus, Membership, MembershipType, PlayerPosition, Role
+from app.repositories.member_repository import MemberRepository
+from app.repositories.encryption_rotation_repository import EncryptionRotationRepository
+from app.services.key_rotation_service import KeyRotationService
 
 def test_update_member_profile(session, test_user):
     """Test updating fields like phone, back_number."""
@@ -24,4 +36,220 @@ def test_change_member_role(session, test_user):
     session.commit()
     session.refresh(test_user)
     
-    assert Role.EDITOR in test_user.roles
\ No newline at end of file
+    assert Role.EDITOR in test_user.roles
+
+
+def test_phone_is_only_decrypted_for_private_views(client, session, test_club, test_user, normal_user_token_headers):
+    """Lists never carry phones (nor ciphertext); /me and the club phone book do."""
+    test_user.phone = "010-1234-5678"
+    test_user.club_id = test_club.id
+    session.add(test_user)
+    session.commit()
+
+    listed = client.get("/members/").json()[0]
+    assert "phone" not in listed and "encrypted_phone" not in listed
+    assert "phone" not in client.get(f"/members/{test_user.id}").json()
+
+    assert client.get("/members/me", headers=normal_user_token_headers).json()["phone"] == "010-1234-5678"
+
+    contacts = client.get(f"/members/club/{test_club.id}/contacts", headers=normal_user_token_headers)
+    assert contacts.json() == [{"id": test_user.id, "name": "Test User", "back_number": None, "phone": "010-1234-5678"}]
+    assert client.get(f"/members/club/{test_club.id + 1}/contacts", headers=normal_user_token_headers).status_code == 403
+
+
+def test_decrypt_many_dedupes_tokens():
+    token = encrypt_text("010-0000-0000")
+    assert decrypt_many([token, None, token, "garbage"]) == ["010-0000-0000", None, "010-0000-0000", "Decryption Failed"]
+
+
+def test_missing_encryption_key_fails_fast_outside_dev_mode(monkeypatch):
+    monkeypatch.setattr(settings, "ENCRYPTION_KEYS", None)
+    monkeypatch.setattr(settings, "ENCRYPTION_KEY", None)
+
+    monkeypatch.setattr(settings, "DEV_MODE", False)
+    with pytest.raises(RuntimeError):
+        security_fields.load_keys()
+
+    monkeypatch.setattr(settings, "DEV_MODE", True)
+    with pytest.warns(RuntimeWarning):
+        assert len(security_fields.load_keys()) == 1
+
+    # Keys are read through settings, so .env values work too
+    monkeypatch.setattr(settings, "ENCRYPTION_KEYS", "new, old")
+    assert security_fields.load_keys() == ["new", "old"]
+
+
+def test_key_rotation_is_batched_and_resumable(session):
+    """Phones move to the new primary key batch by batch; a second run resumes at the checkpoint."""
+    old_keys = list(security_fields.KEYS)
+    new_key = Fernet.generate_key().decode()
+    try:
+        members = [Member(kakao_id=f"rot-{i}", name=f"P{i}") for i in range(5)]
+        for i, member in enumerate(members):
+            member.phone = f"010-0000-000{i}"
+        session.add_all(members)
+        session.commit()
+
+        security_fields.use_keys([new_key, *old_keys])
+        service = KeyRotationService(MemberRepository(session), EncryptionRotationRepository(session))
+
+        first = service.rotate_phones(batch_size=2, max_batches=1)
+        assert (first.rotated, first.remaining, first.completed) == (2, 3, False)
+
+        progress = []
+        done = service.rotate_phones(batch_size=2, on_progress=progress.append)
+        assert (done.rotated, done.remaining, done.completed) == (5, 0, True)
+        assert [p.rotated for p in progress] == [4, 5]
+
+        # The old key can be dropped now
+        security_fields.use_keys([new_key])
+        for i, member in enumerate(members):
+            session.refresh(member)
+            assert member.phone == f"010-0000-000{i}"
+    finally:
+        security_fields.use_keys(old_keys)
+
+
+def test_club_directory_filters_and_pages(client, session, test_club, test_user, normal_user_token_headers):
+    """Scoped to one club, alphabetical, keyset paged; prefix search ignores case."""
+    other_club = Club(name="Other FC")
+    session.add(other_club)
+    session.commit()
+    session.add_all([
+        Member(kakao_id="d1", name="Kim Minjun", club_id=test_club.id, status=MemberStatus.ACTIVE,
+               positions=["ST"], roles=["VIEWER", "EDITOR"], birth_year=1990),
+        Member(kakao_id="d2", name="kim seo_yeon", club_id=test_club.id, status=MemberStatus.ACTIVE,
+               positions=["GK"], birth_year=1965),
+        Member(kakao_id="d3", name="Lee Jiho", club_id=test_club.id, status=MemberStatus.PENDING,
+               positions=["ST"]),
+        Member(kakao_id="d4", name="Kim Outsider", club_id=other_club.id, status=MemberStatus.ACTIVE),
+    ])
+    session.commit()
+
+    def names(**params):
+        page = client.get(
+            f"/members/club/{test_club.id}/directory", params=params, headers=normal_user_token_headers
+        ).json()
+        return [m["name"] for m in page["items"]], page["next_cursor"]
+
+    assert names(q="KIM") == (["Kim Minjun", "kim seo_yeon"], None)
+    assert names(q="kim_") == ([], None)  # wildcards are literal
+    assert names(status="ACTIVE", position="ST") == (["Kim Minjun"], None)
+    assert names(role="EDITOR") == (["Kim Minjun"], None)
+    assert names(age_group=2) == (["kim seo_yeon"], None)
+
+    first, cursor = names(limit=2)
+    assert first == ["Kim Minjun", "kim seo_yeon"] and cursor
+    assert names(limit=2, cursor=cursor) == (["Lee Jiho"], None)
+
+    # Renames keep the search column in sync
+    test_user.name, test_user.club_id = "Aaron", test_club.id
+    session.add(test_user)
+    session.commit()
+    assert names(q="aa") == (["Aaron"], None)
+
+
+def test_backfill_member_masks_from_json(session, test_club):
+    """Rows written around the ORM (no mapper events) get their search columns in bulk."""
+    session.exec(Member.__table__.insert().values(
+        kakao_id="legacy", name="Old Timer", club_id=test_club.id, status="ACTIVE",
+        positions=["GK"], roles=["VIEWER", "ANNOUNCER"], name_search="", role_mask=0, position_mask=0,
+        created_at=datetime.now(UTC), updated_at=datetime.now(UTC),
+    ))
+    session.commit()
+    repository = MemberRepository(session)
+    assert repository.get_by_role(test_club.id, Role.ANNOUNCER) == []
+
+    assert repository.backfill_masks(batch_size=1) == 1
+    assert [m.name for m in repository.get_by_role(test_club.id, Role.ANNOUNCER)] == ["Old Timer"]
+    assert [m.name for m in repository.get_by_position(test_club.id, PlayerPosition.GK)] == ["Old Timer"]
+    assert repository.backfill_masks() == 0
+
+
+def _xlsx(rows):
+    """Minimal workbook: header + rows, strings via the shared-strings table."""
+    shared, sheet_rows = [], []
+    for r, values in enumerate(rows, start=1):
+        cells = []
+        for c, value in enumerate(values):
+            ref = f"{chr(ord('A') + c)}{r}"
+            if isinstance(value, (int, float)):
+                cells.append(f'<c r="{ref}"><v>{float(value)}</v></c>')
+            elif value:
+                shared.append(value)
+                cells.append(f'<c r="{ref}" t="s"><v>{len(shared) - 1}</v></c>')
+        sheet_rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as workbook:
+        workbook.writestr("xl/worksheets/sheet1.xml", f'<worksheet {ns}><sheetData>{"".join(sheet_rows)}</sheetData></worksheet>')
+        workbook.writestr("xl/sharedStrings.xml", f'<sst {ns}>{"".join(f"<si><t>{s}</t></si>" for s in shared)}</sst>')
+    return buffer.getvalue()
+
+
+def test_bulk_member_import_csv_and_xlsx(client, session, test_club, test_user, current_season, normal_user_token_headers):
+    """Chunked import: duplicates skipped, bad rows reported by number, memberships created."""
+    test_user.roles = [Role.ADMIN]
+    session.add(test_user)
+    session.commit()
+    url = f"/members/import?club_id={test_club.id}&season_id={current_season.id}&membership_type=REGULAR"
+
+    csv_body = (
+        "Kakao_ID,Name,Phone,Birth_Year,Positions,Membership_Type\n"
+        "k1,Kim Minjun,010-1111-2222,1990,ST;CB,\n"
+        "k2,Lee Jiho,,not-a-year,,\n"
+        "123456789,Test User Again,,,,\n"
+        "k1,Kim Again,,,,\n"
+        "k3,Park Guest,,,GK,GUEST\n"
+    )
+    response = client.post(url, content=csv_body.encode(), headers={**normal_user_token_headers, "Content-Type": "text/csv"})
+    report = response.json()
+    assert (report["created"], report["duplicates"], report["memberships"], report["error_count"]) == (2, 1, 2, 2)
+    assert [(e["row"], e["kakao_id"]) for e in report["errors"]] == [(3, "k2"), (5, "k1")]
+
+    kim = session.exec(select(Member).where(Member.kakao_id == "k1")).one()
+    assert (kim.phone, kim.club_id, kim.name_search) == ("010-1111-2222", test_club.id, "kim minjun")
+    assert MemberRepository(session).get_by_position(test_club.id, PlayerPosition.CB) == [kim]
+    types = {m.type for m in session.exec(select(Membership).where(Membership.season_id == current_season.id)).all()}
+    assert types == {MembershipType.REGULAR, MembershipType.GUEST}
+
+    xlsx_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    body = _xlsx([["kakao_id", "name", "back_number"], ["x1", "Choi Xlsx", 7], ["", "No Id", None]])
+    report = client.post(
+        f"/members/import?club_id={test_club.id}", content=body,
+        headers={**normal_user_token_headers, "Content-Type": xlsx_type},
+    ).json()
+    assert (report["created"], report["error_count"], report["errors"][0]["row"]) == (1, 1, 3)
+    assert session.exec(select(Member).where(Member.kakao_id == "x1")).one().back_number == 7
+
+    assert client.post(url, content=b"x", headers={**normal_user_token_headers, "Content-Type": "application/json"}).status_code == 415
+
+
+def test_versioned_token_skips_member_lookup_and_is_revoked_by_role_change(client, session, test_user, normal_user_token_headers):
+    """Claims ride in the token; a role change bumps token_version and kills older tokens."""
+    from jose import jwt
+    from sqlalchemy import event
+    from app.core.auth import member_claims
+    from app.core.config import settings
+    token = jwt.encode(member_claims(test_user), settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/participations/me", headers=headers).status_code == 200  # Warms the version cache
+
+    engine = session.get_bind()
+    statements = []
+    listener = lambda _conn, _cursor, statement, *_: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert client.get("/participations/me", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert statements and not [s for s in statements if "FROM member " in s or "FROM member\n" in s]
+
+    test_user.roles = [Role.ADMIN]
+    session.add(test_user)
+    session.commit()
+    assert test_user.token_version == 2
+    assert client.get("/participations/me", headers=headers).status_code == 401
+
+    # Legacy sub-only tokens still resolve through the DB
+    assert client.get("/participations/me", headers=normal_user_token_headers).status_code == 200
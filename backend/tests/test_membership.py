@@ -1,10 +1,12 @@
 import pytest
+from freezegun import freeze_time
 from datetime import datetime, timedelta, UTC
 from app.models import Membership, MembershipType
 from app.services.membership_service import MembershipService
 from app.repositories.membership_repository import MembershipRepository
 from app.repositories.season_repository import SeasonRepository
 from app.core.utils import ensure_utc
+from sqlmodel import select
 
 def test_membership_expiration_logic(session, test_club, test_user, current_season):
     """
@@ -36,9 +38,11 @@ def test_membership_expiration_logic(session, test_club, test_user, current_seas
     diff = abs((ensure_utc(mem_guest.expires_at) - guest_expires_expected).total_seconds())
     assert diff < 300  # Should be within 5 minutes
 
+@freeze_time("2025-06-01 12:00:00")
 def test_gatekeeper_has_active_membership(session, test_club, test_user, current_season):
     """
     Verify the repository method used by MatchService to validate players.
+    (Frozen inside the season: memberships past expires_at no longer count.)
     """
     repository = MembershipRepository(session)
 
@@ -67,4 +71,86 @@ def test_gatekeeper_has_active_membership(session, test_club, test_user, current
     session.commit()
 
     # 5. Check: Should be False
-    assert repository.has_active_membership(test_user.id, current_season.id) is False
\ No newline at end of file
+    assert repository.has_active_membership(test_user.id, current_season.id) is False
+
+
+def test_bulk_renewal_into_next_season(client, session, test_club, test_user, current_season, active_membership):
+    """One request carries ACTIVE members over, with per-type expiry; re-running skips them."""
+    from app.models import Member, MembershipStatus, Season
+
+    guest = Member(kakao_id="guest", name="Guest")
+    leaver = Member(kakao_id="leaver", name="Leaver")
+    next_season = Season(
+        name="2026 Season", club_id=test_club.id,
+        started_at=datetime(2026, 1, 1, tzinfo=UTC), ended_at=datetime(2026, 12, 31, tzinfo=UTC),
+    )
+    session.add_all([guest, leaver, next_season])
+    session.commit()
+    session.add_all([
+        Membership(member_id=guest.id, club_id=test_club.id, season_id=current_season.id,
+                   type=MembershipType.GUEST, status=MembershipStatus.ACTIVE),
+        Membership(member_id=leaver.id, club_id=test_club.id, season_id=current_season.id,
+                   type=MembershipType.REGULAR, status=MembershipStatus.EXPIRED),
+    ])
+    session.commit()
+
+    body = {"source_season_id": current_season.id, "target_season_id": next_season.id}
+    assert client.post("/memberships/renew", json=body).json() == {**body, "renewed": 2, "skipped": 0}
+    assert client.post("/memberships/renew", json=body).json() == {**body, "renewed": 0, "skipped": 2}
+
+    renewed = {
+        m.member_id: m
+        for m in session.exec(select(Membership).where(Membership.season_id == next_season.id)).all()
+    }
+    assert set(renewed) == {test_user.id, guest.id}
+    assert renewed[test_user.id].status == MembershipStatus.ACTIVE
+    assert ensure_utc(renewed[test_user.id].expires_at) == ensure_utc(next_season.ended_at)
+    assert ensure_utc(renewed[guest.id].expires_at) - datetime.now(UTC) < timedelta(days=7, minutes=1)
+
+
+def test_renewal_after_the_sweeper_expired_the_season(client, session, test_club, test_user, current_season, active_membership):
+    """REGULAR rows expire at season end; renewing a finished season still carries them over."""
+    from app.models import Season, MembershipStatus
+
+    next_season = Season(
+        name="2026 Season", club_id=test_club.id,
+        started_at=datetime(2026, 1, 1, tzinfo=UTC), ended_at=datetime(2026, 12, 31, tzinfo=UTC),
+    )
+    session.add(next_season)
+    session.commit()
+    service = MembershipService(MembershipRepository(session), SeasonRepository(session))
+
+    with freeze_time("2026-01-02 12:00:00"):
+        assert service.expire_overdue_memberships() == 1
+        body = {"source_season_id": current_season.id, "target_season_id": next_season.id}
+        assert client.post("/memberships/renew", json=body).json() == {**body, "renewed": 1, "skipped": 0}
+
+    renewed = session.exec(select(Membership).where(Membership.season_id == next_season.id)).one()
+    assert renewed.member_id == test_user.id
+    assert renewed.status == MembershipStatus.ACTIVE
+
+
+def test_expired_guest_is_swept_and_cannot_vote(session, test_club, test_user, current_season):
+    """The gatekeeper honours expires_at even before the sweeper runs; the sweeper flips the status."""
+    from app.models import MembershipStatus
+
+    guest = Membership(
+        member_id=test_user.id, club_id=test_club.id, season_id=current_season.id,
+        type=MembershipType.GUEST, status=MembershipStatus.ACTIVE,
+        expires_at=datetime(2025, 3, 8, tzinfo=UTC),
+    )
+    session.add(guest)
+    session.commit()
+    repository = MembershipRepository(session)
+    service = MembershipService(repository, SeasonRepository(session))
+
+    with freeze_time("2025-03-07 12:00:00"):
+        assert repository.has_active_membership(test_user.id, current_season.id) is True
+        assert service.expire_overdue_memberships() == 0
+
+    with freeze_time("2025-03-09 12:00:00"):
+        assert repository.has_active_membership(test_user.id, current_season.id) is False
+        assert service.expire_overdue_memberships() == 1
+
+    session.refresh(guest)
+    assert guest.status == MembershipStatus.EXPIRED
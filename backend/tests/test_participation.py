@@ -1,7 +1,7 @@
 import pytest
 from freezegun import freeze_time
 from datetime import datetime, timedelta, timezone
-from app.models import Match, MatchStatus, Member, Role
+from app.models import Match, MatchStatus, Member, Participation, ParticipationStatus, Role
 
 @pytest.fixture(name="setup_match")
 def setup_match_fixture(session, active_membership, current_season, test_club):
@@ -111,4 +111,327 @@ def test_vote_no_membership(client, session, setup_match):
 
     # 4. Expect Gatekeeper Rejection
     assert response.status_code == 403
-    assert "시즌권" in response.json()["detail"]
\ No newline at end of file
+    assert "시즌권" in response.json()["detail"]
+
+def test_group_commit_isolates_failed_votes(tmp_path):
+    """
+    Scenario: Votes are coalesced into one transaction, but one of them fails.
+    Every OTHER vote must still be committed, and only the bad one reports an error.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from sqlmodel import Session, SQLModel, create_engine, select
+    from app.core.group_commit import GroupCommitter
+    from app.models import Club
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'group_commit.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    SQLModel.metadata.create_all(engine)
+    committer = GroupCommitter(engine, window_ms=50)
+
+    def good(name):
+        def work(session):
+            club = Club(name=name)
+            session.add(club)
+            session.flush()
+            return club.id
+        return work
+
+    def bad(session):
+        session.add(Club(name="Doomed FC"))
+        session.flush()
+        raise ValueError("boom")
+
+    units = [good("A"), good("B"), bad, good("C")]
+    with ThreadPoolExecutor(max_workers=len(units)) as pool:
+        futures = [pool.submit(committer.submit, unit) for unit in units]
+
+    assert [f.exception() is None for f in futures] == [True, True, False, True]
+    assert isinstance(futures[2].exception(), ValueError)
+
+    with Session(engine) as session:
+        names = sorted(c.name for c in session.exec(select(Club)).all())
+    assert names == ["A", "B", "C"]
+
+
+def test_history_is_keyset_paginated(client, session, normal_user_token_headers, test_user, current_season, test_club):
+    """History comes newest-first, with a match summary, one page at a time."""
+    from app.models import Participation, ParticipationStatus
+
+    base_time = datetime(2025, 3, 1, 19, 0, tzinfo=timezone.utc)
+    for week in range(3):
+        start = base_time + timedelta(weeks=week)
+        match = Match(
+            club_id=test_club.id,
+            season_id=current_season.id,
+            name=f"Week {week}",
+            location="Stadium",
+            start_time=start,
+            end_time=start + timedelta(hours=2),
+            polling_start_at=start - timedelta(days=6),
+            hard_deadline_at=start - timedelta(days=1),
+            min_participants=10,
+            max_participants=22,
+        )
+        session.add(match)
+        session.flush()
+        session.add(Participation(
+            match_id=match.id,
+            member_id=test_user.id,
+            status=ParticipationStatus.ATTENDING,
+            match_start_time=start,
+        ))
+    session.commit()
+
+    first = client.get("/participations/me/history?limit=2", headers=normal_user_token_headers)
+    assert first.status_code == 200
+    page = first.json()
+    assert [i["match"]["name"] for i in page["items"]] == ["Week 2", "Week 1"]
+    assert page["next_cursor"]
+
+    second = client.get(
+        f"/participations/me/history?limit=2&cursor={page['next_cursor']}",
+        headers=normal_user_token_headers,
+    )
+    page = second.json()
+    assert [i["match"]["name"] for i in page["items"]] == ["Week 0"]
+    assert page["next_cursor"] is None
+
+
+def test_vote_log_replay_and_compaction(client, session, normal_user_token_headers, setup_match, test_user):
+    """The roster can be replayed at any instant, before and after compaction."""
+    from app.repositories.participation_event_repository import ParticipationEventRepository
+
+    match = setup_match
+    for at, status in [("2025-01-10 12:00:00", "ATTENDING"), ("2025-01-10 12:30:00", "ABSENT")]:
+        with freeze_time(at):
+            client.post(
+                f"/participations/matches/{match.id}/vote",
+                headers=normal_user_token_headers,
+                json={"status": status},
+            )
+
+    def roster_at(as_of):
+        response = client.get(f"/participations/matches/{match.id}/roster", params={"as_of": as_of})
+        assert response.status_code == 200
+        return [(r["member_id"], r["status"], r["compacted"]) for r in response.json()]
+
+    assert roster_at("2025-01-10T11:00:00Z") == []
+    assert roster_at("2025-01-10T12:15:00Z") == [(test_user.id, "ATTENDING", False)]
+    assert roster_at("2025-01-10T12:45:00Z") == [(test_user.id, "ABSENT", False)]
+
+    # Finish the match, then fold its log into summary rows
+    match.status = MatchStatus.FINISHED
+    session.add(match)
+    session.commit()
+    compacted = ParticipationEventRepository(session).compact_finished(datetime(2026, 1, 1, tzinfo=timezone.utc))
+    assert compacted == 1
+
+    assert roster_at("2025-01-10T12:45:00Z") == [(test_user.id, "ABSENT", True)]
+
+
+def test_full_match_waitlists_and_promotes_fifo(client, session, normal_user_token_headers, setup_match, test_user, test_club, current_season):
+    """
+    Capacity 1: test_user takes the seat, two more members are waitlisted in order.
+    When test_user drops out, the FIRST waitlisted member gets the seat.
+    """
+    from jose import jwt
+    from app.core.config import settings
+    from app.models import Membership, MembershipType
+
+    match = setup_match
+    match.max_participants = 1
+    session.add(match)
+    session.commit()
+
+    headers = {}
+    for name in ["First", "Second"]:
+        member = Member(kakao_id=name, name=name, roles=[Role.VIEWER])
+        session.add(member)
+        session.commit()
+        session.add(Membership(
+            member_id=member.id, club_id=test_club.id, season_id=current_season.id,
+            type=MembershipType.REGULAR, status="ACTIVE", expires_at=current_season.ended_at,
+        ))
+        session.commit()
+        token = jwt.encode({"sub": str(member.id)}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        headers[name] = {"Authorization": f"Bearer {token}"}
+
+    def vote(h, status, at):
+        with freeze_time(at):
+            return client.post(
+                f"/participations/matches/{match.id}/vote", headers=h, json={"status": status}
+            ).json()
+
+    assert vote(normal_user_token_headers, "ATTENDING", "2025-01-10 12:00:00")["status"] == "ATTENDING"
+    assert vote(headers["First"], "ATTENDING", "2025-01-10 12:01:00")["status"] == "WAITLISTED"
+    assert vote(headers["Second"], "ATTENDING", "2025-01-10 12:02:00")["status"] == "WAITLISTED"
+
+    vote(normal_user_token_headers, "ABSENT", "2025-01-10 12:03:00")
+
+    session.expire_all()
+    roster = {p.member.name: p.status for p in session.get(Match, match.id).participations}
+    assert roster == {"Test User": "ABSENT", "First": "ATTENDING", "Second": "WAITLISTED"}
+    assert session.get(Match, match.id).attending_count == 1
+
+
+def test_capacity_changes_promote_the_waitlist(client, session, normal_user_token_headers, setup_match, test_user, test_club, current_season):
+    """Raising max_participants seats the waitlist (FIFO); lowering it below the attendees is refused."""
+    from jose import jwt
+    from app.core.config import settings
+    from app.models import Membership, MembershipType
+
+    match = setup_match
+    match.max_participants = 1
+    session.add(match)
+    session.commit()
+
+    headers = {}
+    for name in ["First", "Second"]:
+        member = Member(kakao_id=name, name=name, roles=[Role.VIEWER])
+        session.add(member)
+        session.commit()
+        session.add(Membership(
+            member_id=member.id, club_id=test_club.id, season_id=current_season.id,
+            type=MembershipType.REGULAR, status="ACTIVE", expires_at=current_season.ended_at,
+        ))
+        session.commit()
+        token = jwt.encode({"sub": str(member.id)}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        headers[name] = {"Authorization": f"Bearer {token}"}
+
+    url = f"/participations/matches/{match.id}/vote"
+    with freeze_time("2025-01-10 12:00:00"):
+        client.post(url, headers=normal_user_token_headers, json={"status": "ATTENDING"})
+    with freeze_time("2025-01-10 12:01:00"):
+        client.post(url, headers=headers["First"], json={"status": "ATTENDING"})
+    with freeze_time("2025-01-10 12:02:00"):
+        client.post(url, headers=headers["Second"], json={"status": "ATTENDING"})
+
+    assert client.patch(f"/matches/{match.id}", json={"max_participants": 0}).status_code == 409
+
+    assert client.patch(f"/matches/{match.id}", json={"max_participants": 2}).status_code == 200
+    session.expire_all()
+    roster = {p.member.name: p.status for p in session.get(Match, match.id).participations}
+    assert roster == {"Test User": "ATTENDING", "First": "ATTENDING", "Second": "WAITLISTED"}
+    assert session.get(Match, match.id).attending_count == 2
+
+
+def test_deleting_an_attendee_seats_the_waitlist(client, session, normal_user_token_headers, setup_match, test_user, test_club, current_season):
+    """The deleted member's seat goes to the next waitlisted member, and their vote summaries go too."""
+    from jose import jwt
+    from app.core.config import settings
+    from sqlmodel import select
+    from app.models import Membership, MembershipType, ParticipationEventSummary
+
+    match = setup_match
+    match.max_participants = 1
+    session.add(match)
+    waiting = Member(kakao_id="waiting", name="Waiting", roles=[Role.VIEWER])
+    session.add(waiting)
+    session.commit()
+    session.add(Membership(
+        member_id=waiting.id, club_id=test_club.id, season_id=current_season.id,
+        type=MembershipType.REGULAR, status="ACTIVE", expires_at=current_season.ended_at,
+    ))
+    session.add(ParticipationEventSummary(
+        match_id=match.id, member_id=test_user.id, final_status_code=1, change_count=1,
+        first_voted_at=datetime(2025, 1, 10, tzinfo=timezone.utc),
+        last_changed_at=datetime(2025, 1, 10, tzinfo=timezone.utc),
+    ))
+    session.commit()
+    token = jwt.encode({"sub": str(waiting.id)}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    url = f"/participations/matches/{match.id}/vote"
+    with freeze_time("2025-01-10 12:00:00"):
+        client.post(url, headers=normal_user_token_headers, json={"status": "ATTENDING"})
+    with freeze_time("2025-01-10 12:01:00"):
+        client.post(url, headers={"Authorization": f"Bearer {token}"}, json={"status": "ATTENDING"})
+
+    assert client.delete(f"/members/{test_user.id}").status_code == 200
+
+    session.expire_all()
+    roster = {p.member.name: p.status for p in session.get(Match, match.id).participations}
+    assert roster == {"Waiting": "ATTENDING"}
+    assert session.get(Match, match.id).attending_count == 1
+    assert session.exec(select(ParticipationEventSummary)).all() == []
+
+
+def test_vote_reads_a_concurrent_promotion_before_releasing_the_seat(session, setup_match, test_user, test_club, current_season):
+    """A waitlisted member promoted behind our back still gives their seat back when voting ABSENT."""
+    from sqlalchemy import update
+    from app.models import Membership, MembershipType
+    from app.repositories.match_repository import MatchRepository
+    from app.repositories.member_season_stats_repository import MemberSeasonStatsRepository
+    from app.repositories.membership_repository import MembershipRepository
+    from app.repositories.participation_event_repository import ParticipationEventRepository
+    from app.repositories.participation_repository import ParticipationRepository
+    from app.services.participation_service import ParticipationService
+
+    match = setup_match
+    match.max_participants = 1
+    waiting = Member(kakao_id="waiting", name="Waiting", roles=[Role.VIEWER])
+    session.add_all([match, waiting])
+    session.commit()
+    session.add(Membership(
+        member_id=waiting.id, club_id=test_club.id, season_id=current_season.id,
+        type=MembershipType.REGULAR, status="ACTIVE", expires_at=current_season.ended_at,
+    ))
+    session.commit()
+    match_id, test_user_id, waiting_id = match.id, test_user.id, waiting.id
+
+    service = ParticipationService(
+        ParticipationRepository(session), MatchRepository(session), MembershipRepository(session),
+        MemberSeasonStatsRepository(session), ParticipationEventRepository(session),
+    )
+    with freeze_time("2025-01-10 12:00:00"):
+        service.vote(match_id, test_user_id, ParticipationStatus.ATTENDING)
+        assert service.vote(match_id, waiting_id, ParticipationStatus.ATTENDING).status == ParticipationStatus.WAITLISTED
+
+    # We already hold the WAITLISTED row when another transaction hands it test_user's seat
+    held = service.get_my_vote(match_id, waiting_id)
+    assert held.status == ParticipationStatus.WAITLISTED
+    for member_id, status in [(test_user_id, ParticipationStatus.ABSENT), (waiting_id, ParticipationStatus.ATTENDING)]:
+        session.connection().execute(
+            update(Participation.__table__)
+            .where(Participation.__table__.c.match_id == match_id, Participation.__table__.c.member_id == member_id)
+            .values(status=status, waitlisted_at=None)
+        )
+
+    with freeze_time("2025-01-10 12:05:00"):
+        service.vote(match_id, waiting_id, ParticipationStatus.ABSENT)
+
+    session.expire_all()
+    assert session.get(Match, match_id).attending_count == 0
+
+
+def test_lineup_filters_attending_members_by_position(client, session, setup_match, test_user, normal_user_token_headers):
+    """Position filter is a bitmask test in SQL; role checks use the role mask."""
+    keeper = Member(kakao_id="gk", name="Keeper", positions=["GK"], roles=[Role.VIEWER, Role.MANAGER])
+    back = Member(kakao_id="cb", name="Back", positions=["CB", "LB"])
+    session.add_all([keeper, back])
+    session.commit()
+    test_user.positions = ["ST"]
+    session.add(test_user)
+    session.add_all([
+        Participation(match_id=setup_match.id, member_id=m.id, status=ParticipationStatus.ATTENDING,
+                      match_start_time=setup_match.start_time)
+        for m in (keeper, back, test_user)
+    ])
+    session.commit()
+
+    def lineup(query=""):
+        response = client.get(f"/participations/matches/{setup_match.id}/lineup{query}")
+        return [entry["name"] for entry in response.json()]
+
+    assert lineup() == ["Back", "Keeper", "Test User"]
+    assert lineup("?position=GK") == ["Keeper"]
+    assert lineup("?position=LB&position=ST") == ["Back", "Test User"]
+
+    assert keeper.has_any_role(Role.ADMIN, Role.MANAGER)
+    assert not test_user.has_any_role(Role.ADMIN, Role.MANAGER)
+    denied = client.put(
+        "/participations/admin/override", headers=normal_user_token_headers,
+        json={"match_id": setup_match.id, "member_id": keeper.id, "status": "ABSENT"},
+    )
+    assert denied.status_code == 403
@@ -1,6 +1,16 @@
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from sqlmodel import select
+from app.models import (
+    Season, Match, MatchStatus, Participation, ParticipationStatus, ParticipationEvent,
+    ParticipationArchive, Notification, NotificationArchive, NotificationType,
+)
+from app.schemas import SeasonCreate
 from app.repositories.season_repository import SeasonRepository
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.participation_event_repository import ParticipationEventRepository
+from app.services.season_service import SeasonService
 
 def test_find_season_by_date(session, test_club, current_season):
     """
@@ -28,4 +38,131 @@ def test_create_season_validation():
     
     with pytest.raises(Exception):
         if start >= end:
-            raise ValueError("Start date must be before end date")
\ No newline at end of file
+            raise ValueError("Start date must be before end date")
+
+
+def test_season_index_resolves_batches_and_flags_overlaps(session, test_club, current_season):
+    """Index lookups need no query, follow new seasons, and surface overlaps."""
+    repo = SeasonRepository(session)
+    dates = [datetime(2025, 3, 1), datetime(2026, 3, 1)]
+    assert repo.resolve_season_ids(dates, test_club.id) == [current_season.id, None]
+
+    # Creating a season invalidates the cached index
+    service = SeasonService(repo, None, None)
+    next_season = service.create_season(test_club.id, SeasonCreate(
+        name="2026 Season",
+        started_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        ended_at=datetime(2026, 12, 31, tzinfo=timezone.utc),
+    ))
+    assert repo.resolve_season_ids(dates, test_club.id) == [current_season.id, next_season.id]
+
+    # New overlapping seasons are rejected...
+    with pytest.raises(HTTPException) as exc:
+        service.create_season(test_club.id, SeasonCreate(
+            name="Overlap",
+            started_at=datetime(2025, 12, 1, tzinfo=timezone.utc),
+            ended_at=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        ))
+    assert exc.value.status_code == 409
+
+    # ...legacy ones are reported, and the later-starting season wins lookups
+    legacy = Season(
+        name="Summer Cup",
+        club_id=test_club.id,
+        started_at=datetime(2025, 7, 1, tzinfo=timezone.utc),
+        ended_at=datetime(2025, 8, 31, tzinfo=timezone.utc),
+    )
+    session.add(legacy)
+    session.commit()
+    assert service.get_overlapping_seasons(test_club.id) == [(current_season.id, legacy.id)]
+    assert repo.resolve_season_id(datetime(2025, 7, 15), test_club.id) == legacy.id
+    assert repo.resolve_season_id(datetime(2025, 9, 1), test_club.id) == current_season.id
+
+def test_close_season_archives_finished_matches(client, session, test_club, current_season, test_user, normal_user_token_headers):
+    """Finished matches move to the archive in bulk; history / detail / calendar still find them."""
+    start = datetime(2025, 5, 10, 10, 0, tzinfo=timezone.utc)
+
+    def add_match(name, status):
+        match = Match(
+            club_id=test_club.id,
+            season_id=current_season.id,
+            name=name,
+            location="Seoul",
+            start_time=start,
+            end_time=start + timedelta(hours=2),
+            polling_start_at=start - timedelta(days=6),
+            hard_deadline_at=start - timedelta(days=1),
+            min_participants=10,
+            max_participants=22,
+            status=status,
+        )
+        session.add(match)
+        session.commit()
+        return match
+
+    played = add_match("Played", MatchStatus.FINISHED)
+    pending = add_match("Never Closed", MatchStatus.RECRUITING)
+    session.add(Participation(
+        match_id=played.id, member_id=test_user.id, status=ParticipationStatus.ATTENDING,
+        match_start_time=start,
+    ))
+    session.add(ParticipationEvent(match_id=played.id, member_id=test_user.id, status_code=1, created_at=start))
+    session.add(Notification(match_id=played.id, type=NotificationType.HARD_DEADLINE, content="done"))
+    session.commit()
+    played_id, pending_id = played.id, pending.id
+
+    service = SeasonService(SeasonRepository(session), ArchiveRepository(session), ParticipationEventRepository(session))
+    result = service.close_season(current_season.id)
+    assert result.archived_matches == 1
+
+    # Hot tables only keep what is still open
+    assert session.exec(select(Match.id)).all() == [pending_id]
+    assert session.exec(select(Participation)).all() == []
+    assert session.exec(select(ParticipationEvent)).all() == []
+    assert len(session.exec(select(ParticipationArchive)).all()) == 1
+    assert len(session.exec(select(NotificationArchive)).all()) == 1
+    session.refresh(current_season)
+    assert current_season.archived_at is not None and not current_season.is_active
+
+    # Reads reach into the archive transparently
+    history = client.get("/participations/me/history", headers=normal_user_token_headers).json()
+    assert [item["match"]["name"] for item in history["items"]] == ["Played"]
+
+    detail = client.get(f"/matches/{played_id}").json()
+    assert detail["name"] == "Played"
+    assert [p["member"]["name"] for p in detail["participations"]] == [test_user.name]
+
+    calendar = client.get(f"/matches/club/{test_club.id}/calendar", params={
+        "from": "2025-05-01T00:00:00Z", "to": "2025-06-01T00:00:00Z",
+    }).json()
+    assert sorted(m["name"] for m in calendar) == ["Never Closed", "Played"]
+
+    # Re-running is a no-op
+    assert service.close_season(current_season.id).archived_matches == 0
+
+
+def test_archived_match_vote_log_still_replays(client, session, test_club, current_season, test_user):
+    """Closing a season compacts the vote log; the roster of an archived match stays reachable."""
+    start = datetime(2025, 5, 10, 10, 0, tzinfo=timezone.utc)
+    match = Match(
+        club_id=test_club.id, season_id=current_season.id, name="Played", location="Seoul",
+        start_time=start, end_time=start + timedelta(hours=2),
+        polling_start_at=start - timedelta(days=6), hard_deadline_at=start - timedelta(days=1),
+        min_participants=10, max_participants=22, status=MatchStatus.FINISHED,
+    )
+    session.add(match)
+    session.commit()
+    match_id = match.id
+    session.add(ParticipationEvent(
+        match_id=match_id, member_id=test_user.id, status_code=1, created_at=start - timedelta(days=2),
+    ))
+    session.commit()
+
+    service = SeasonService(SeasonRepository(session), ArchiveRepository(session), ParticipationEventRepository(session))
+    assert service.close_season(current_season.id).archived_matches == 1
+
+    response = client.get(f"/participations/matches/{match_id}/roster", params={"as_of": "2025-05-10T00:00:00Z"})
+    assert response.status_code == 200
+    assert [(r["member_id"], r["status"], r["compacted"]) for r in response.json()] == [(test_user.id, "ATTENDING", True)]
+
+    assert client.get("/participations/matches/999999/roster", params={"as_of": "2025-05-10T00:00:00Z"}).status_code == 404
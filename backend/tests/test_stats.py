@@ -0,0 +1,173 @@
+from freezegun import freeze_time
+from datetime import datetime, timedelta, timezone
+from app.models import Match, MatchStatus, Member, Membership, MembershipType, Participation, ParticipationStatus
+from app.repositories.member_season_stats_repository import MemberSeasonStatsRepository
+from app.repositories.match_repository import MatchRepository
+from app.repositories.match_template_repository import MatchTemplateRepository
+from app.repositories.season_repository import SeasonRepository
+from app.repositories.notification_repository import NotificationRepository
+from app.services.match_service import MatchService
+from app.schemas import MatchUpdate
+
+
+def _open_match(session, club, season):
+    base_time = datetime(2025, 1, 10, 12, 0, 0, tzinfo=timezone.utc)
+    match = Match(
+        club_id=club.id,
+        season_id=season.id,
+        name="Stats Match",
+        location="Stadium",
+        start_time=base_time + timedelta(days=2),
+        end_time=base_time + timedelta(days=2, hours=2),
+        polling_start_at=base_time - timedelta(hours=1),
+        hard_deadline_at=base_time + timedelta(hours=24),
+        min_participants=10,
+        max_participants=22,
+        status=MatchStatus.RECRUITING,
+    )
+    session.add(match)
+    session.commit()
+    session.refresh(match)
+    return match
+
+
+def test_vote_moves_stats_buckets(client, session, normal_user_token_headers, active_membership, test_user, test_club, current_season):
+    match = _open_match(session, test_club, current_season)
+
+    with freeze_time("2025-01-10 12:00:00"):
+        for status in ["ATTENDING", "ABSENT"]:
+            client.post(
+                f"/participations/matches/{match.id}/vote",
+                headers=normal_user_token_headers,
+                json={"status": status},
+            )
+
+    response = client.get(f"/stats/seasons/{current_season.id}/members/{test_user.id}")
+    assert response.status_code == 200
+    stats = response.json()
+    assert (stats["attended"], stats["absent"], stats["pending"]) == (0, 1, 0)
+
+
+def test_finished_match_counts_ghosts_and_matches_rebuild(client, session, normal_user_token_headers, active_membership, test_user, test_club, current_season):
+    """
+    test_user votes ATTENDING, a second member ghosts. Finishing the match
+    must record both, and a full rebuild must agree with the incremental rows.
+    """
+    ghost = Member(kakao_id="ghost", name="Ghost")
+    session.add(ghost)
+    session.commit()
+    session.add(Membership(
+        member_id=ghost.id, club_id=test_club.id, season_id=current_season.id,
+        type=MembershipType.REGULAR, status="ACTIVE", expires_at=current_season.ended_at,
+    ))
+    session.commit()
+
+    match = _open_match(session, test_club, current_season)
+    with freeze_time("2025-01-10 12:00:00"):
+        client.post(
+            f"/participations/matches/{match.id}/vote",
+            headers=normal_user_token_headers,
+            json={"status": "ATTENDING"},
+        )
+
+    service = MatchService(
+        MatchRepository(session), MatchTemplateRepository(session), SeasonRepository(session),
+        MemberSeasonStatsRepository(session), NotificationRepository(session), None,
+    )
+    service.update_match(match.id, MatchUpdate(status=MatchStatus.FINISHED))
+
+    repo = MemberSeasonStatsRepository(session)
+    incremental = {
+        m: (s.attended, s.ghosted, s.last_attended_at is not None)
+        for m, s in [(test_user.id, repo.get(test_user.id, current_season.id)), (ghost.id, repo.get(ghost.id, current_season.id))]
+    }
+    assert incremental == {test_user.id: (1, 0, True), ghost.id: (0, 1, False)}
+
+    assert repo.rebuild(current_season.id) == 2
+    session.expire_all()
+    rebuilt = {
+        m: (s.attended, s.ghosted, s.last_attended_at is not None)
+        for m, s in [(test_user.id, repo.get(test_user.id, current_season.id)), (ghost.id, repo.get(ghost.id, current_season.id))]
+    }
+    assert rebuilt == incremental
+
+
+def test_reopening_a_finished_match_never_double_counts(client, session, normal_user_token_headers, active_membership, test_user, test_club, current_season):
+    """FINISHED -> RECRUITING undoes the finalization; finishing again counts it once."""
+    ghost = Member(kakao_id="ghost", name="Ghost")
+    session.add(ghost)
+    session.commit()
+    session.add(Membership(
+        member_id=ghost.id, club_id=test_club.id, season_id=current_season.id,
+        type=MembershipType.REGULAR, status="ACTIVE", expires_at=current_season.ended_at,
+    ))
+    session.commit()
+
+    match = _open_match(session, test_club, current_season)
+    with freeze_time("2025-01-10 12:00:00"):
+        client.post(
+            f"/participations/matches/{match.id}/vote",
+            headers=normal_user_token_headers,
+            json={"status": "ATTENDING"},
+        )
+
+    service = MatchService(
+        MatchRepository(session), MatchTemplateRepository(session), SeasonRepository(session),
+        MemberSeasonStatsRepository(session), NotificationRepository(session), None,
+    )
+    repo = MemberSeasonStatsRepository(session)
+
+    def snapshot():
+        session.expire_all()
+        rows = {m: repo.get(m, current_season.id) for m in (test_user.id, ghost.id)}
+        # No row yet reads as all zeros (like the stats endpoint)
+        return {m: (s.attended, s.ghosted, s.last_attended_at is not None) if s else (0, 0, False) for m, s in rows.items()}
+
+    service.update_match(match.id, MatchUpdate(status=MatchStatus.FINISHED))
+    assert snapshot() == {test_user.id: (1, 0, True), ghost.id: (0, 1, False)}
+
+    service.update_match(match.id, MatchUpdate(status=MatchStatus.RECRUITING))
+    assert snapshot() == {test_user.id: (1, 0, False), ghost.id: (0, 0, False)}
+
+    service.update_match(match.id, MatchUpdate(status=MatchStatus.FINISHED))
+    service.update_match(match.id, MatchUpdate(name="Renamed"))  # Still FINISHED: nothing moves
+    assert snapshot() == {test_user.id: (1, 0, True), ghost.id: (0, 1, False)}
+
+
+def test_reopening_after_a_late_correction_matches_a_rebuild(client, session, normal_user_token_headers, active_membership, test_user, test_club, current_season):
+    """A vote recorded while the match was FINISHED must not leave its ghost count behind on reopen."""
+    ghost = Member(kakao_id="ghost", name="Ghost")
+    session.add(ghost)
+    session.commit()
+    session.add(Membership(
+        member_id=ghost.id, club_id=test_club.id, season_id=current_season.id,
+        type=MembershipType.REGULAR, status="ACTIVE", expires_at=current_season.ended_at,
+    ))
+    session.commit()
+    ghost_id = ghost.id
+
+    match = _open_match(session, test_club, current_season)
+    service = MatchService(
+        MatchRepository(session), MatchTemplateRepository(session), SeasonRepository(session),
+        MemberSeasonStatsRepository(session), NotificationRepository(session), None,
+    )
+    repo = MemberSeasonStatsRepository(session)
+    service.update_match(match.id, MatchUpdate(status=MatchStatus.FINISHED))
+    assert repo.get(ghost_id, current_season.id).ghosted == 1
+
+    # The manager records the ghost's (late) absence after the match ended
+    session.add(Participation(
+        match_id=match.id, member_id=ghost_id, status=ParticipationStatus.ABSENT, match_start_time=match.start_time,
+    ))
+    session.commit()
+
+    service.update_match(match.id, MatchUpdate(status=MatchStatus.RECRUITING))
+    service.update_match(match.id, MatchUpdate(status=MatchStatus.FINISHED))
+    session.expire_all()
+    incremental = repo.get(ghost_id, current_season.id)
+    assert (incremental.absent, incremental.ghosted) == (1, 0)
+
+    repo.rebuild(current_season.id)
+    session.expire_all()
+    rebuilt = repo.get(ghost_id, current_season.id)
+    assert (rebuilt.absent, rebuilt.ghosted) == (1, 0)